@@ -20,12 +20,15 @@ __status__ = "Production"
 __version__ = "0.0.1"
 
 from enum import Enum
-from random import randint
+from random import Random
 
 from adhoccomputing.Experimentation.Topology import Topology
-from adhoccomputing.GenericModel import GenericModel, GenericMessageHeader, GenericMessagePayload, GenericMessage
 from adhoccomputing.Generics import *
 
+from ringelec.ElectionTrace import TraceEventKind, trace
+from ringelec.RingElectionNode import RingElectionNode
+from ringelec.RingMessages import RingMessageHeader, RingMessagePayload
+
 class State(Enum):
     """
     State of the nodes, one from {active, passive, leader}
@@ -41,7 +44,9 @@ class State(Enum):
     leader = 3
 
 
-class ItaiRodehMessageHeader(GenericMessageHeader):
+class ItaiRodehMessageHeader(RingMessageHeader):
+    __slots__ = ()
+
     def __init__(
         self,
         messagefrom,
@@ -56,7 +61,7 @@ class ItaiRodehMessageHeader(GenericMessageHeader):
         )
 
 
-class ItaiRodehMessagePayload(GenericMessagePayload):
+class ItaiRodehMessagePayload(RingMessagePayload):
     """
     Itai-Rodeh Algorithm uses messages with 4 fields (using textbook's
     terminology here):
@@ -71,6 +76,8 @@ class ItaiRodehMessagePayload(GenericMessagePayload):
       will still be active next round
     """
 
+    __slots__ = ("election_round", "id_p", "hop_count", "dirty_bit")
+
     def __init__(self, election_round, id_p, messagepayload=None):
         super().__init__(messagepayload)
         self.election_round = election_round
@@ -81,24 +88,79 @@ class ItaiRodehMessagePayload(GenericMessagePayload):
         self.dirty_bit = False
 
 
-class ItaiRodehNode(GenericModel):
+class IdSpace:
+    """
+    Size of the space the anonymous ids are drawn from in each round.
+
+    Round 1 draws from 1..size (the ring size when size is None), and every
+    dirty round multiplies the size by `growth`. A larger space makes a tie
+    for the largest id, and so another round, less likely, at the cost of
+    larger ids in the messages.
+    """
+
+    def __init__(self, size=None, growth=1, max_size=2**62):
+        """
+        Parameters
+        -----------
+        size: int
+            Size of the id space of round 1, defaults to the ring size.
+        growth: float
+            Factor the size grows by after each dirty round, 1 keeps it fixed.
+        max_size: int
+            Upper bound of the size, keeps the ids within 64-bit integers.
+        """
+        if size is not None and size < 1:
+            raise ValueError(f"id space size must be at least 1, got {size}")
+        if growth < 1:
+            raise ValueError(f"id space growth must be at least 1, got {growth}")
+        self.size = size
+        self.growth = growth
+        self.max_size = max_size
+
+    def size_for(self, ring_size, election_round):
+        """
+        Returns the size of the id space in the round, every round before it was dirty.
+        """
+        size = ring_size if self.size is None else self.size
+        return min(int(size * self.growth ** (election_round - 1)), self.max_size)
+
+    def __str__(self) -> str:
+        size = "N" if self.size is None else str(self.size)
+        return size if self.growth == 1 else f"{size} x{self.growth:g}"
+
+
+def node_random(seed, position):
+    """
+    Returns the random generator of a ring position, seeded with `seed` and the
+    position when a seed is given, from system entropy otherwise.
+    """
+    if seed is None:
+        return Random()
+    return Random(f"{seed}-{position}")
+
+
+class ItaiRodehNode(RingElectionNode):
     """
     Node in a system that uses Itai-Rodeh algorithm
     Each process has three parameters:
-    - id_p: 1 <= i <= N where N is the ring size
+    - id_p: 1 <= i <= K where K is the size of the run's `id_space` for the
+      round, the ring size N by default
     - state: from the State enum, active nodes participate in the election,
       passive nodes pass messages around, leader is selected at the end of the
       election cycle
     - round: current election round, starts at 1
-    """
 
-    ring_size = 0
-    callback = None
-    draw_delay = None
-    global_round = 1
+    With the run's `seed` set, every node draws its ids from its own
+    generator seeded with the seed and its ring position, so a run is
+    reproducible whatever the order the worker threads run in.
+    """
+    header_type = ItaiRodehMessageHeader
+    seed = None
+    id_space = IdSpace()
+    context_attributes = RingElectionNode.context_attributes + ("seed", "id_space")
 
-    def __init__(self, componentname, componentinstancenumber, context=None, configurationparameters=None, num_worker_threads=1, topology=None):
-        super().__init__(componentname, componentinstancenumber, context, configurationparameters, num_worker_threads, topology)
+    def __init__(self, componentname, componentinstancenumber, context=None, configurationparameters=None, num_worker_threads=1, topology=None, child_conn=None, node_queues=None, channel_queues=None):
+        super().__init__(componentname, componentinstancenumber, context, configurationparameters, num_worker_threads, topology, child_conn, node_queues, channel_queues)
     
         """ The anonymous id the node will select for the round """
         self.id_p = 0
@@ -109,19 +171,16 @@ class ItaiRodehNode(GenericModel):
         """ Initialized at round 0 """
         self.election_round = 1
 
-    def send_election_packet(self):
+        """ Source of the random ids, see `node_random` """
+        self.random = node_random(self.election_context.seed, componentinstancenumber)
 
-        header = ItaiRodehMessageHeader(
-            messagefrom=self.componentinstancenumber,
-            messageto=self.next_hop,
-            nexthop=self.next_hop,
-            messagetype="ItaiRodeh Message",
-            interfaceid=self.next_hop_interface_id
-        )
-        payload = ItaiRodehMessagePayload(self.election_round, self.id_p)
+    def draw_id(self):
+        """Picks the anonymous id for the current round"""
+        context = self.election_context
+        return self.random.randint(1, context.id_space.size_for(context.ring_size, self.election_round))
 
-        message = GenericMessage(header, payload)
-        self.send_down(Event(self, EventTypes.MFRT, message))
+    def send_election_packet(self):
+        self.send_cw(ItaiRodehMessagePayload(self.election_round, self.id_p))
 
     def pass_packet_along(self, message):
         """For passive processes
@@ -134,19 +193,11 @@ class ItaiRodehNode(GenericModel):
 
     def on_init(self, eventobj: Event):
         # Select an id for round 1
-        self.id_p = randint(1, self.ring_size)
-        logger.debug(
-            f"🤖 {self.componentinstancenumber} selected {self.id_p} as their  ID for round {self.election_round}"
-        )
+        self.id_p = self.draw_id()
+        trace(self, TraceEventKind.new_round, self.id_p, round=self.election_round)
 
-        # Calculate the neighbour, we're on a directed ring
-        self.neighbour_id = (int(self.componentinstancenumber) + 1) % self.ring_size
-
-        self.next_hop = self.topology.get_next_hop(
-            self.componentinstancenumber, self.neighbour_id
-        )
-
-        self.next_hop_interface_id = f"{self.componentinstancenumber}-{self.next_hop}"
+        # we're on a directed ring, messages only travel clockwise
+        self.setup_ring()
 
         self.send_election_packet()
 
@@ -155,6 +206,9 @@ class ItaiRodehNode(GenericModel):
         payload: ItaiRodehMessagePayload = eventobj.eventcontent.payload
         header: ItaiRodehMessageHeader = eventobj.eventcontent.header
 
+        if not self.accept(eventobj):
+            return
+
         message_election_round = payload.election_round
         message_assumed_id = payload.id_p
 
@@ -165,12 +219,7 @@ class ItaiRodehNode(GenericModel):
             # passive node, pass the message on to the next hop, increase the
             # 'hop_count' of packet by one, no other responsibility
             payload.hop_count += 1
-            header.messageto = self.next_hop
-            header.next_hop = self.next_hop
-            header.interfaceid = self.next_hop_interface_id
-
-            message = GenericMessage(header, payload)
-            self.send_down(Event(self, EventTypes.MFRT, message))
+            self.forward_cw(eventobj)
         elif self.state == State.active:
 
             if message_election_round > self.election_round or (
@@ -181,22 +230,15 @@ class ItaiRodehNode(GenericModel):
                 # current round or this node has received a message from a
                 # future round, going passive
 
-                logger.debug(
-                    f"🤖 {self.componentinstancenumber} is PASSIVE:  {message_assumed_id} for round {message_election_round}  encountered, this node is at {self.election_round} with  {self.id_p}"
-                )
+                trace(self, TraceEventKind.passive, self.id_p, message_assumed_id, self.election_round)
 
+                self.statistics.transition(self.state, State.passive)
                 self.state = State.passive
                 # we clear the id_p here to have them *not* show up in the
                 # animation
                 self.id_p = " "
                 payload.hop_count += 1
-
-                header.messageto = self.next_hop
-                header.next_hop = self.next_hop
-                header.interfaceid = self.next_hop_interface_id
-
-                message = GenericMessage(header, payload)
-                self.send_down(Event(self, EventTypes.MFRT, message))
+                self.forward_cw(eventobj)
 
             elif message_election_round < self.election_round or (
                 message_election_round == self.election_round
@@ -205,55 +247,37 @@ class ItaiRodehNode(GenericModel):
                 # This node has received a message from a previous round or
                 # from the current round but with a lower assumed id, so this
                 # node can dismiss the election attempt of the sender node
-                logger.debug(
-                    f"🤖 {self.componentinstancenumber} is dismissing  {message_assumed_id} for round {message_election_round}  logger.debugthis node is at {self.election_round} with {self.id_p}"
-                )
+                trace(self, TraceEventKind.dismissed, self.id_p, message_assumed_id, self.election_round)
+                self.statistics.messages_dismissed += 1
 
             elif (
                 message_election_round == self.election_round
                 and message_assumed_id == self.id_p
             ):
 
-                if payload.hop_count < self.ring_size:
+                if payload.hop_count < self.election_context.ring_size:
                     # receiver node is not the initial sender node
                     # another node has picked our id, dirty their bit and pass it along
                     payload.dirty_bit = True
                     payload.hop_count += 1
 
-                    header.messageto = self.next_hop
-                    header.next_hop = self.next_hop
-                    header.interfaceid = self.next_hop_interface_id
-
-                    logger.debug(
-                        f"🤖 {self.componentinstancenumber} dirtied the bit  for {message_assumed_id}, passing it along"
-                    )
-                    message = GenericMessage(header, payload)
-                    self.send_down(Event(self, EventTypes.MFRT, message))
+                    trace(self, TraceEventKind.dirtied, self.id_p, message_assumed_id, self.election_round)
+                    self.forward_cw(eventobj)
 
-                elif payload.hop_count == self.ring_size:
+                elif payload.hop_count == self.election_context.ring_size:
                     # the message that this node has sent traversed all the way
                     # around the ring
-                    logger.debug(
-                        f"🤖 {self.componentinstancenumber}'s message  traversed all the way around"
-                    )
                     if payload.dirty_bit:
                         # Bit has been dirtied, next round
-                        self.id_p = randint(1, self.ring_size)
                         self.election_round += 1
-                        ItaiRodehNode.global_round = self.election_round
-                        logger.debug(
-                            f"🤖 {self.componentinstancenumber} is moving  onto round {self.election_round}"
-                        )
-                        logger.debug(
-                            f"🤖 {self.componentinstancenumber} selected  {self.id_p} as their ID for round  {self.election_round}"
-                        )
+                        self.id_p = self.draw_id()
+                        self.statistics.rounds = self.election_round
+                        trace(self, TraceEventKind.new_round, self.id_p, round=self.election_round)
                         self.send_election_packet()
                     else:
                         # The bit is still false, this node is the leader
+                        self.statistics.transition(self.state, State.leader)
                         self.state = State.leader
-                        logger.debug(
-                            f"🤖 {self.componentinstancenumber}: I'M THE ELECTED LEADER"
-                        )
-        self.callback.set()
-        self.draw_delay.wait()
-        self.draw_delay.clear()
+                        trace(self, TraceEventKind.leader, self.id_p, round=self.election_round)
+                        self.election_context.observer.on_leader(self)
+        self.election_context.observer.on_message_handled(self)
@@ -0,0 +1,273 @@
+"""
+Round model of the Itai-Rodeh election and a seeded Monte Carlo runner.
+
+Every round the active processes draw an id, each message travels clockwise to
+the next active process with a strictly larger id and is purged there. The
+messages of the processes holding the largest id go all the way around, so
+exactly these processes survive into the next round, and a single survivor is
+the leader. Channels are FIFO and a message of a later round can not overtake
+one of an earlier round, so a round reduces to a "next greater element" search
+over the active ids, see `ringelec.ChangRobertsSimulator.next_greater_distance`.
+
+`monte_carlo` runs thousands of seeded elections across a process pool, with
+the model for large rings or with real ItaiRodehNode topologies to validate it,
+and collects the distributions of rounds, messages and time to leader.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+
+import numpy as np
+
+from AnonymousNetworks.ItaiRodeh import IdSpace, ItaiRodehNode, node_random
+from ringelec.ChangRobertsSimulator import next_greater_distance
+
+
+class ItaiRodehSimulation:
+    """
+    Outcome of a simulated election on a ring of `ring_size` processes:
+    - rounds: number of rounds until a single process held the largest id
+    - messages_per_round: messages sent in each round, initial ones included
+    - messages: messages sent in the whole run
+    - leader: the position of the elected leader
+    - leader_id: the id the leader won its last round with
+    - time_to_leader: in hop delays, every round ends ring_size hops after the
+    surviving processes started it
+    """
+
+    def __init__(self, ring_size, messages_per_round, leader, leader_id):
+        self.ring_size = ring_size
+        self.rounds = len(messages_per_round)
+        self.messages_per_round = messages_per_round
+        self.messages = sum(messages_per_round)
+        self.leader = leader
+        self.leader_id = leader_id
+        self.time_to_leader = self.rounds * ring_size
+
+
+def round_hops(positions, ids, ring_size):
+    """
+    Hops travelled by the messages of one round.
+
+    Parameters
+    -----------
+    positions: numpy.ndarray
+        Ring positions of the active processes, in increasing order.
+    ids: numpy.ndarray
+        The ids the active processes drew for the round.
+    ring_size: int
+        Number of processes on the ring, passive ones included.
+
+    Returns
+    --------
+    numpy.ndarray
+        Hops of the message of each active process, ring_size for the holders of the largest id.
+    """
+    hops = np.full(ids.size, ring_size, dtype=np.int64)
+    smaller = ids < ids.max()
+    if smaller.any():
+        # distances are counted in active processes; next_greater_distance
+        # expects distinct ids, which only matters for the tied largest ones
+        steps = next_greater_distance(ids)
+        targets = positions[(np.arange(ids.size) + steps) % ids.size]
+        hops[smaller] = ((targets - positions) % ring_size)[smaller]
+    return hops
+
+
+def simulate(ring_size, rng=None, draw=None, id_space=None, max_rounds=10_000):
+    """
+    Runs the Itai-Rodeh election on a directed anonymous ring.
+
+    Parameters
+    -----------
+    ring_size: int
+        Number of processes on the ring.
+    rng: numpy.random.Generator or seed
+        Generator of the ids, each drawn from 1..K, K the size of the id space.
+    draw: callable
+        Takes the positions of the active processes and K, and returns their
+        ids for the round, replaces `rng`, see `node_draws`.
+    id_space: IdSpace
+        Size of the id space in each round, 1..ring_size in every round by default.
+    max_rounds: int
+        Rounds after which the run is abandoned with a RuntimeError.
+
+    Returns
+    --------
+    ItaiRodehSimulation
+        Rounds, messages and the elected leader.
+    """
+    if draw is None:
+        rng = np.random.default_rng(rng)
+
+        def draw(positions, size):
+            return rng.integers(1, size + 1, positions.size)
+
+    if id_space is None:
+        id_space = IdSpace()
+    positions = np.arange(ring_size, dtype=np.int64)
+    messages_per_round = []
+    while len(messages_per_round) < max_rounds:
+        ids = np.asarray(draw(positions, id_space.size_for(ring_size, len(messages_per_round) + 1)))
+        messages_per_round.append(int(round_hops(positions, ids, ring_size).sum()))
+        survivors = ids == ids.max()
+        if np.count_nonzero(survivors) == 1:
+            index = int(np.argmax(survivors))
+            return ItaiRodehSimulation(ring_size, messages_per_round, int(positions[index]), int(ids[index]))
+        positions = positions[survivors]
+    raise RuntimeError(f"no leader on a ring of {ring_size} after {max_rounds} rounds")
+
+
+def node_draws(seed, ring_size):
+    """
+    Returns a `draw` for `simulate` that replays the ids ItaiRodehNode draws
+    when the class' seed is `seed`, so the model and a threaded run agree
+    message for message.
+    """
+    generators = [node_random(seed, position) for position in range(ring_size)]
+
+    def draw(positions, size):
+        return np.array([generators[position].randint(1, size) for position in positions], dtype=np.int64)
+
+    return draw
+
+
+def run_threaded(ring_size, seed=None, id_space=None):
+    """
+    Runs ItaiRodehNode on a ring, returns the election result.
+    """
+    from ringelec.Election import threaded_election
+    from ringelec.RingElectionNode import ElectionContext
+
+    context = ElectionContext(ItaiRodehNode, ring_size=ring_size, seed=seed, id_space=id_space if id_space is not None else IdSpace())
+    _, result = threaded_election(context)
+    return result
+
+
+class Runner(Enum):
+    """
+    How `monte_carlo` runs an election
+    - "model": `simulate` with a NumPy generator, for large rings
+    - "nodes": `simulate` replaying the ids of seeded ItaiRodehNodes
+    - "threaded": a real ItaiRodehNode topology, time to leader in seconds
+    """
+
+    model = 1
+    nodes = 2
+    threaded = 3
+
+
+SAMPLE_FIELDS = ("rounds", "messages", "time_to_leader", "leader")
+
+
+def run_batch(ring_size, seeds, runner=Runner.model, id_space=None):
+    """
+    Runs one election per seed, returns a (len(seeds), 4) array of `SAMPLE_FIELDS`.
+    """
+    samples = np.zeros((len(seeds), len(SAMPLE_FIELDS)))
+    for index, seed in enumerate(seeds):
+        seed = int(seed)
+        if runner == Runner.threaded:
+            result = run_threaded(ring_size, seed, id_space)
+            total = result.statistics["total"]
+            samples[index] = total["rounds"], total["messages_sent"], result.time_to_leader, result.leader
+        else:
+            if runner == Runner.nodes:
+                simulation = simulate(ring_size, draw=node_draws(seed, ring_size), id_space=id_space)
+            else:
+                simulation = simulate(ring_size, seed, id_space=id_space)
+            samples[index] = simulation.rounds, simulation.messages, simulation.time_to_leader, simulation.leader
+    return samples
+
+
+class ItaiRodehDistribution:
+    """
+    Samples of the elections run on one ring size, one entry per election in seed order:
+    - rounds, messages, leader
+    - time_to_leader: hop delays for the model runners, seconds for threaded runs
+    """
+
+    def __init__(self, ring_size, runner, samples):
+        self.ring_size = ring_size
+        self.runner = runner
+        self.rounds = samples[:, 0].astype(np.int64)
+        self.messages = samples[:, 1].astype(np.int64)
+        self.time_to_leader = samples[:, 2]
+        self.leader = samples[:, 3].astype(np.int64)
+
+    def __len__(self):
+        return self.rounds.size
+
+    def round_histogram(self):
+        """Fraction of the elections that took each number of rounds, indexed by rounds"""
+        return np.bincount(self.rounds) / len(self)
+
+    def summary(self):
+        """
+        Returns
+        --------
+        dict
+            Mean, standard deviation, median, 95th percentile and maximum of
+            rounds, messages and time to leader.
+        """
+        summary = {}
+        for field in ("rounds", "messages", "time_to_leader"):
+            values = getattr(self, field)
+            summary[field] = {
+                "mean": float(values.mean()),
+                "std": float(values.std()),
+                "p50": float(np.percentile(values, 50)),
+                "p95": float(np.percentile(values, 95)),
+                "max": float(values.max()),
+            }
+        return summary
+
+
+def trial_seeds(ring_size, trials, seed=None):
+    """
+    Seeds of the elections run on a ring size, derived from `seed` and the ring size.
+    """
+    return np.random.SeedSequence([ring_size] if seed is None else [seed, ring_size]).generate_state(trials, dtype=np.uint64)
+
+
+def monte_carlo(ring_sizes, trials, seed=None, runner=Runner.model, processes=None, id_space=None):
+    """
+    Runs seeded Itai-Rodeh elections for every ring size across a process pool.
+
+    Parameters
+    -----------
+    ring_sizes: iterable of int
+        Ring sizes to run the elections on.
+    trials: int
+        Number of elections per ring size.
+    seed: int
+        Root seed, the same seed gives the same elections with every runner.
+    runner: Runner
+        How an election is run.
+    processes: int
+        Size of the process pool, defaults to the number of CPUs.
+    id_space: IdSpace
+        Id space of the elections, the ring size in every round by default.
+
+    Returns
+    --------
+    dict
+        ItaiRodehDistribution by ring size.
+    """
+    workers = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        pending = {}
+        for ring_size in ring_sizes:
+            seeds = trial_seeds(ring_size, trials, seed)
+            # a few chunks per worker keep the pool busy until the end
+            chunk = max(1, math.ceil(trials / (4 * workers)))
+            pending[ring_size] = [
+                pool.submit(run_batch, ring_size, seeds[start:start + chunk], runner, id_space)
+                for start in range(0, trials, chunk)
+            ]
+        return {
+            ring_size: ItaiRodehDistribution(ring_size, runner, np.concatenate([future.result() for future in futures]))
+            for ring_size, futures in pending.items()
+        }
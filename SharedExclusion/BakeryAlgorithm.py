@@ -14,6 +14,9 @@ __maintainer__ = "developer"
 __status__ = "Production"
 __version__ = "0.0.1"
 
+import heapq
+import threading
+
 from adhoccomputing.Generics import *
 from SharedExclusion.SharedExclusion import SharedExclusionComponentModel, SharedExclusionLock, \
     SharedExclusionMessagePayload, SharedExclusionMessageHeader, Direction, SharedExclusionMessageTypes
@@ -85,6 +88,138 @@ class BakeryLock(SharedExclusionLock):
                        (self.ticket[i] < self.ticket[index] or (self.ticket[i] == self.ticket[index] and i < index))):
                     self.no_op()
 
+    def first(self) -> int:
+        """
+        The process that is next in line, the one with the smallest (ticket, index) pair among those holding a ticket.
+
+        Returns
+        --------
+        int
+            Index of the first process in line. Returns -1 if no process holds a ticket.
+        """
+        retval = -1
+        for i in range(self.number_of_processes):
+            if self.ticket[i] != 0 and (retval < 0 or self.ticket[i] < self.ticket[retval]):
+                retval = i
+        return retval
+
+    def try_enter(self, pid: int) -> bool:
+        """
+        Non-blocking enter function for Bakery Algorithm
+
+        Parameters
+        -----------
+        pid: int
+            Process id of a process.
+
+        Returns
+        --------
+        bool
+            True if the process holds a ticket and is first in line, i.e. enter would return without waiting.
+        """
+        index = self.getIndex(pid)
+        return index >= 0 and self.ticket[index] != 0 and self.first() == index
+
+
+class HeapBakeryLock(BakeryLock):
+    """
+    Bakery lock that keeps the (ticket, index) pairs of the processes holding a ticket in a min-heap and the largest
+    ticket handed out in a counter. lock and enter take O(log n) instead of walking every index; processes are served
+    in the same order as by BakeryLock.
+
+    The heap and the counter are changed under `heap_lock`, so a ticket is taken in one step and the entering flags
+    are not needed; the threads of a leader with several worker threads can share the lock. Pairs of processes that
+    unlocked are left in the heap and dropped when they reach the top.
+    """
+
+    def __init__(self, number_of_processes: int, no_op_duration: float = 1.0):
+        """
+        Calls the __init__ of its parent, then initializes the heap, the running maximum and the lock guarding them.
+
+        Parameters
+        -----------
+        number_of_processes: int
+            Number of processes the lock will be responsible for.
+        no_op_duration: float
+            The duration of sleep when the no-op operation is called, in terms of seconds.
+        """
+        super().__init__(number_of_processes, no_op_duration)
+        self.queue: list[tuple[int, int]] = []
+        self.max_ticket: int = 0
+        self.waiting: int = 0
+        self.heap_lock = threading.Lock()
+
+    def lock(self, pid: int):
+        """
+        Lock function for Bakery Algorithm, the ticket is one more than the largest one handed out since the lock was
+        last free.
+
+        Parameters
+        -----------
+        pid: int
+            Process id of a process.
+        """
+        index = self.getIndex(pid)
+        if index < 0:
+            return
+        with self.heap_lock:
+            if self.ticket[index] == 0:
+                self.waiting += 1
+            self.max_ticket += 1
+            self.ticket[index] = self.max_ticket
+            heapq.heappush(self.queue, (self.max_ticket, index))
+
+    def unlock(self, pid: int):
+        """
+        Unlock function for Bakery Algorithm
+
+        Parameters
+        -----------
+        pid: int
+            Process id of a process.
+        """
+        index = self.getIndex(pid)
+        if index < 0:
+            return
+        with self.heap_lock:
+            if self.ticket[index] == 0:
+                return
+            self.ticket[index] = 0
+            self.waiting -= 1
+            if self.waiting == 0:
+                self.queue.clear()
+                self.max_ticket = 0
+
+    def first(self) -> int:
+        """
+        The process that is next in line, see BakeryLock.first.
+
+        Returns
+        --------
+        int
+            Index of the first process in line. Returns -1 if no process holds a ticket.
+        """
+        with self.heap_lock:
+            queue = self.queue
+            while queue and self.ticket[queue[0][1]] != queue[0][0]:
+                heapq.heappop(queue)
+            return queue[0][1] if queue else -1
+
+    def enter(self, pid: int):
+        """
+        Enter function for Bakery Algorithm, waits until the process is first in line.
+
+        Parameters
+        -----------
+        pid: int
+            Process id of a process.
+        """
+        index = self.getIndex(pid)
+        if index < 0 or self.ticket[index] == 0:
+            return
+        while self.first() != index:
+            self.no_op()
+
 
 class BakeryAlgorithmMessageHeader(SharedExclusionMessageHeader):
     def __init__(self, messageType, messageFrom, messageTo, nextHop=float('inf'), interfaceID=float('inf'),
@@ -101,7 +236,19 @@ class BakeryAlgorithmMessagePayload(SharedExclusionMessagePayload):
 class BakeryAlgorithmComponentModel(SharedExclusionComponentModel):
     """
     Component for managing the Shared Memory Mutual Exclusion via Bakery Algorithm
+
+    With grant_queue set, the leader never waits: a request takes a ticket and the permission is sent as soon as the
+    process is first in line, at once or when the process ahead of it leaves. Otherwise the leader waits in
+    BakeryLock.enter, on its event-handling thread, until the process may enter; the leave notification it waits for
+    is handled by another worker thread, so the leader then needs num_worker_threads > 1 whatever its lock_type, or a
+    contended request blocks it for good.
+
+    lock_type is the lock the leader keeps, HeapBakeryLock for groups of thousands of processes. Both can be shared by
+    the worker threads of the leader.
     """
+    grant_queue = True
+    lock_type = BakeryLock
+
     def __init__(self,
                  componentname,
                  componentinstancenumber,
@@ -115,12 +262,12 @@ class BakeryAlgorithmComponentModel(SharedExclusionComponentModel):
 
     def on_init(self, eventobj: Event):
         """
-        After calling the parent on_init, initializes the self.lock: BakeryLock and adds the members of the topology
-        to it if the component is the leader of the topology.
+        After calling the parent on_init, initializes the self.lock: BakeryLock of lock_type and adds the members of
+        the topology to it if the component is the leader of the topology.
         """
         super().on_init(eventobj)
         if self.componentinstancenumber == self.leaderId:
-            self.lock = BakeryLock(len(self.otherNodeIDs) + 1, self.no_op_duration)
+            self.lock = self.lock_type(len(self.otherNodeIDs) + 1, self.no_op_duration)
             network_list = sorted(list(self.otherNodeIDs) + [self.componentinstancenumber])
             for net_member in network_list:
                 self.lock.addProcess(net_member)
@@ -142,10 +289,31 @@ class BakeryAlgorithmComponentModel(SharedExclusionComponentModel):
         into the critical section.
         """
         if self.componentinstancenumber == self.leaderId:
+            if self.grant_queue:
+                self.queue_request(header.messagefrom)
+                return
             self.lock.lock(header.messagefrom)
             self.lock.enter(header.messagefrom)
             self.send_message_to(header.messagefrom, SharedExclusionMessageTypes.ENTER_PERMISSION, None, direction)
 
+    def queue_request(self, pid: int):
+        """
+        Takes a ticket for the process and grants it the critical section if it is first in line, without waiting.
+        Requests of unknown processes and of processes that already hold a ticket change nothing.
+        """
+        index = self.lock.getIndex(pid)
+        if index < 0 or self.lock.ticket[index] != 0:
+            return
+        self.lock.lock(pid)
+        if self.lock.try_enter(pid):
+            self.grant(pid)
+
+    def grant(self, pid: int):
+        """
+        Sends the permission to enter the critical section to the process.
+        """
+        self.send_message_to(pid, SharedExclusionMessageTypes.ENTER_PERMISSION, None, Direction.DOWN)
+
     def permission_message(self, direction: Direction, header, message):
         """
         Calls the callback function (the function that will use the critical section). If callback function is not set,
@@ -163,4 +331,10 @@ class BakeryAlgorithmComponentModel(SharedExclusionComponentModel):
         from the critical section.
         """
         if self.componentinstancenumber == self.leaderId:
+            first = self.lock.try_enter(header.messagefrom)
             self.lock.unlock(header.messagefrom)
+            if self.grant_queue and first:
+                # The leaving process was in the critical section, the next one in line may enter
+                index = self.lock.first()
+                if index >= 0:
+                    self.grant(self.lock.getPID(index))
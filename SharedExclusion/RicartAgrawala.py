@@ -0,0 +1,151 @@
+"""
+    Implementation of the Ricart-Agrawala Algorithm for mutual exclusion, permission based and without a leader.
+"""
+
+import threading
+
+from adhoccomputing.Generics import *
+from SharedExclusion.SharedExclusion import SharedExclusionComponentModel, SharedExclusionMessagePayload, \
+    SharedExclusionMessageHeader, SharedExclusionRequest, Direction, SharedExclusionMessageTypes
+
+
+class RicartAgrawalaMessageHeader(SharedExclusionMessageHeader):
+    def __init__(self, messageType, messageFrom, messageTo, nextHop=float('inf'), interfaceID=float('inf'),
+                 sequenceID=-1):
+        super().__init__(messageType, messageFrom, messageTo, nextHop, interfaceID, sequenceID)
+
+
+class RicartAgrawalaMessagePayload(SharedExclusionMessagePayload):
+    """
+    The Lamport clock of the sender when it sent the message, the timestamp of the request for ENTER_REQUEST messages.
+    """
+    def __init__(self,
+                 messagepayload=None):
+        super().__init__(messagepayload)
+
+
+class RicartAgrawalaComponentModel(SharedExclusionComponentModel):
+    """
+    Component for managing the Mutual Exclusion via Ricart-Agrawala Algorithm
+
+    A process that wants to enter the critical section sends a request stamped with its Lamport clock to every other
+    member and enters once all of them gave their permission. A member answers at once unless it is in the critical
+    section or has an earlier request of its own, (clock, id) pairs breaking ties; then it defers the permission until
+    it exits. No member is the leader, set_leader has no effect, and a request takes 2 * (n - 1) messages.
+    """
+    def __init__(self,
+                 componentname,
+                 componentinstancenumber,
+                 context=None,
+                 configurationparameters=None,
+                 num_worker_threads=1,
+                 topology=None):
+        super().__init__(componentname, componentinstancenumber, context, configurationparameters, num_worker_threads,
+                         topology)
+        # The pending request of the process, None if it does not want to enter the critical section
+        self.request: SharedExclusionRequest | None = None
+        self.in_critical_section = False
+
+        # Members whose requests wait for the process to exit the critical section
+        self.deferred: list[int] = []
+
+        # The process state is changed by the worker thread and by the callers of enter and exit; the callback runs
+        # after the lock is released, so that it can block without stalling them
+        self.state_lock = threading.Lock()
+        self.entering = False
+
+    def message_received(self, direction: Direction, header, message):
+        """
+        If the message is for the component, advances the Lamport clock past the timestamp of the message and calls the
+        parent function for redirecting it to the correct function. If the message is not for the component, calls
+        the function for relaying the message.
+        """
+        if header.messageto != self.componentinstancenumber:
+            if header.nexthop == self.componentinstancenumber:
+                self.relay_message(direction, header, message)
+        elif header.messagetype in SharedExclusionMessageTypes:
+            with self.state_lock:
+                self.clock = max(self.clock, message.payload.messagepayload) + 1
+                super().message_received(direction, header, message)
+                entering, self.entering = self.entering, False
+            if entering:
+                self.critical_section()
+
+    def request_message(self, direction: Direction, header, message):
+        """
+        Gives the requesting process the permission, or defers it while the process is in the critical section or has
+        an earlier request.
+        """
+        request = (message.payload.messagepayload, header.messagefrom)
+        if self.in_critical_section or (
+                self.request is not None and (self.request.request_clock, self.componentinstancenumber) < request):
+            self.deferred.append(header.messagefrom)
+        else:
+            self.send_permission(header.messagefrom)
+
+    def permission_message(self, direction: Direction, header, message):
+        """
+        Counts the permission for the pending request, the last one lets the process enter the critical section.
+        """
+        if self.request is not None:
+            self.request.add_to_current()
+
+    def request_complete(self, request: SharedExclusionRequest):
+        """
+        Enters the critical section once every member gave its permission, the callback runs when state_lock is
+        released.
+        """
+        self.in_critical_section = True
+        self.entering = True
+
+    def critical_section(self):
+        """
+        Calls the callback function (the function that will use the critical section). If callback function is not set,
+        automatically exits the critical section. Otherwise, after the function is done with the critical section, it
+        should call the exit_critical_section function.
+        """
+        if self.callback is not None:
+            self.callback()
+        else:
+            self.exit_critical_section()
+
+    def enter_critical_section(self):
+        """
+        Sends a request stamped with the Lamport clock to every other member. Has no effect if the process already
+        requested or is in the critical section.
+        """
+        with self.state_lock:
+            if self.request is not None or self.in_critical_section:
+                return
+            self.clock += 1
+            self.request = SharedExclusionRequest(self.clock, SharedExclusionMessageTypes.ENTER_REQUEST,
+                                                  len(self.otherNodeIDs), self.request_complete)
+            for nodeID in sorted(self.otherNodeIDs):
+                self.send_message_to(nodeID, SharedExclusionMessageTypes.ENTER_REQUEST,
+                                     RicartAgrawalaMessagePayload(self.request.request_clock), Direction.DOWN)
+            if not self.otherNodeIDs:
+                self.request_complete(self.request)
+            entering, self.entering = self.entering, False
+        if entering:
+            self.critical_section()
+
+    def exit_critical_section(self):
+        """
+        Leaves the critical section and sends the deferred permissions.
+        """
+        with self.state_lock:
+            if not self.in_critical_section:
+                return
+            self.in_critical_section = False
+            self.request = None
+            deferred, self.deferred = self.deferred, []
+            for nodeID in deferred:
+                self.send_permission(nodeID)
+
+    def send_permission(self, nodeID: int):
+        """
+        Sends the permission to enter the critical section to the member.
+        """
+        self.clock += 1
+        self.send_message_to(nodeID, SharedExclusionMessageTypes.ENTER_PERMISSION,
+                             RicartAgrawalaMessagePayload(self.clock), Direction.DOWN)
@@ -27,7 +27,7 @@ class SharedExclusionMessageTypes(Enum):
     """
     NONE = "SHARED_MESSAGE_NONE"
     ENTER_REQUEST = "SHARED_MESSAGE_ENTER_REQUEST"
-    ENTER_PERMISSION = "SHARED_MESSAGE_ENTER_REQUEST"
+    ENTER_PERMISSION = "SHARED_MESSAGE_ENTER_PERMISSION"
     LEAVE_NOTIFICATION = "SHARED_LEAVE_NOTIFICATION"
 
 
@@ -59,6 +59,9 @@ class Direction(Enum):
 class SharedExclusionLock:
     """
     A generic lock implementation for mutual exclusion with support for processes with arbitrary positive pids.
+
+    Registration and lookups take constant time: free indices are kept in a pool, and the pid to index map has its
+    reverse in `process_ids`.
     """
 
     def __init__(self, number_of_processes: int, no_op_duration: float):
@@ -78,9 +81,15 @@ class SharedExclusionLock:
         # A list of bools that marks which process indices are unused
         self.free_processes: list[bool] = [True] * number_of_processes
 
+        # The unused process indices, the next one to hand out last, so fresh locks hand out 0, 1, 2, ...
+        self.free_indices: list[int] = list(range(number_of_processes - 1, -1, -1))
+
         # A dictionary of process id to process index
         self.process_dictionary: dict[int, int] = {}
 
+        # The process id of every process index, -1 for unused ones
+        self.process_ids: list[int] = [-1] * number_of_processes
+
     def addProcess(self, pid: int) -> int:
         """
         Adds a new process for arbitrary positive pid handling.
@@ -93,17 +102,19 @@ class SharedExclusionLock:
         Returns
         --------
         int
-            Returns the index of the process. Returns -1 if all possible indices are taken.
-        """
-        retval = 0
-        while retval < self.number_of_processes and (not self.free_processes[retval]):
-            retval += 1
-        if retval < self.number_of_processes:
-            self.process_dictionary[pid] = retval
-            self.free_processes[retval] = False
-            return retval
-        else:
+            Returns the index of the process, the current one if it is already handled by the lock. Returns -1 if all
+            possible indices are taken.
+        """
+        index = self.process_dictionary.get(pid)
+        if index is not None:
+            return index
+        if not self.free_indices:
             return -1
+        index = self.free_indices.pop()
+        self.process_dictionary[pid] = index
+        self.process_ids[index] = pid
+        self.free_processes[index] = False
+        return index
 
     def removeProcess(self, pid: int) -> int:
         """
@@ -119,13 +130,12 @@ class SharedExclusionLock:
         int
             Returns the freed index. Returns -1 if the process was not handled by the lock.
         """
-        if pid not in self.process_dictionary.keys():
-            return -1
-        else:
-            index = self.process_dictionary[pid]
-            self.process_dictionary.pop(pid)
+        index = self.process_dictionary.pop(pid, -1)
+        if index >= 0:
+            self.process_ids[index] = -1
             self.free_processes[index] = True
-            return index
+            self.free_indices.append(index)
+        return index
 
     def getIndex(self, pid: int) -> int:
         """
@@ -141,10 +151,7 @@ class SharedExclusionLock:
         int
             Current index of the process. Returns -1 if the process was not handled by the lock.
         """
-        if pid not in self.process_dictionary.keys():
-            return -1
-        else:
-            return self.process_dictionary[pid]
+        return self.process_dictionary.get(pid, -1)
 
     def getPID(self, index: int) -> int:
         """
@@ -160,13 +167,7 @@ class SharedExclusionLock:
         int
             Process id of the process with the given index. Returns -1 if the index is free.
         """
-        if self.free_processes[index]:
-            return -1
-        else:
-            for key in self.process_dictionary.keys():
-                if self.process_dictionary[key] == index:
-                    return key
-            return -1
+        return self.process_ids[index]
 
     def lock(self, pid: int):
         """
@@ -358,7 +359,10 @@ class SharedExclusionComponentModel(GenericModel):
         interfaceID = f"{self.componentinstancenumber}-{nextHop}"
         header = SharedExclusionMessageHeader(messageType, self.componentinstancenumber, targetId, nextHop, interfaceID)
         message = GenericMessage(header, payload)
-        if direction != Direction.NONE:
+        if targetId == self.componentinstancenumber:
+            # Messages to itself, e.g. the requests of the leader, are handled by the component's own event queue
+            self.send_self(Event(self, EventTypes.MFRB, message))
+        elif direction != Direction.NONE:
             self.send_message(direction, message)
 
     def relay_message(self, direction: Direction, header, message):
@@ -1,10 +1,12 @@
 from enum import Enum
-from random import randint
 
 from adhoccomputing.Experimentation.Topology import Topology
-from adhoccomputing.GenericModel import GenericModel, GenericMessageHeader, GenericMessagePayload, GenericMessage
 from adhoccomputing.Generics import *
 
+from ringelec.ElectionTrace import TraceEventKind, trace
+from ringelec.RingElectionNode import RingElectionNode
+from ringelec.RingMessages import RingMessageHeader, RingMessagePayload
+
 class State(Enum):
     """
     State of the nodes, one from {active, passive, leader}
@@ -19,7 +21,9 @@ class State(Enum):
     passive = 2
     leader = 3
 
-class ChangRobertsMessageHeader(GenericMessageHeader):
+class ChangRobertsMessageHeader(RingMessageHeader):
+    __slots__ = ()
+
     def __init__(
             self,
             messagefrom,
@@ -33,128 +37,76 @@ class ChangRobertsMessageHeader(GenericMessageHeader):
             messagetype, messagefrom, messageto, nexthop, interfaceid, sequencenumber
         )
 
-class ChangRobertsPayload(GenericMessagePayload):
+class ChangRobertsPayload(RingMessagePayload):
     """
     Chang-Roberts Algorithm uses messages with one field:
     - id: The sending process id
     """
+    __slots__ = ("id",)
+
     def __init__(self, id, messagepayload=None):
         super().__init__(messagepayload)
         self.id = id
 
 
-class ChangRobertsNode(GenericModel):
+class ChangRobertsNode(RingElectionNode):
     """
     Node in a system that uses Chang Roberts algorithm
     Each process has three parameters:
-    - id: 1 <= i <= N where N is the ring size
+    - id: 1 <= i <= N where N is the ring size, handed out by the run's
+    id_assigner (the component instance number when no assigner is set)
     - state: from State enum, active nodes participate in the election,
     passive nodes pass messages around, leader is selected when the message
     with the id of the node is arrived to the node itself
     """
-    # componentname = "ChangRoberts Node Comp Name"
-    # componentinstancenumber = 0
-    ring_size = 0
-    callback = None
-    draw_delay = None
-    global_round = 0
-    id_counter = 0
-    list_used_ids = []
-    initiated = False
+    header_type = ChangRobertsMessageHeader
 
     def __init__(self, componentname, componentinstancenumber, context=None, configurationparameters=None, num_worker_threads=1, topology=None, child_conn=None, node_queues=None, channel_queues=None):
         super().__init__(componentname, componentinstancenumber, context, configurationparameters, num_worker_threads, topology, child_conn, node_queues, channel_queues)
 
-
-        """The component instance number will be used as a candidate leader process id"""
-        self.id = componentinstancenumber
-
         """Initially all processes are active"""
         self.state = State.active
 
-    def send_election_packet(self):
-        header = ChangRobertsMessageHeader(
-            messagefrom=self.componentinstancenumber,
-            messageto=self.next_hop,
-            messagetype="Chang Roberts Message",
-            nexthop=self.next_hop,
-            interfaceid=self.next_hop_interface_id
-
-        )
-
-        payload = ChangRobertsPayload(
-            self.id
-        )
-
-        message = GenericMessage(header, payload)
-        self.send_down(Event(self, EventTypes.MFRT, message))
-        ChangRobertsNode.global_round += 1
+        """Set once the node has sent its own election message"""
+        self.initiated = False
 
+    def send_election_packet(self):
+        self.send_cw(ChangRobertsPayload(self.id))
 
-    # def on_init(self):
     def on_init(self, eventobj: Event):
-        # Select an id for round 1
-        id_not_selected = True
-        while(id_not_selected):
-            id_candidate = randint(1, self.ring_size)
-            if(id_candidate not in self.list_used_ids):
-                self.id_p = id_candidate
-                self.list_used_ids.append(id_candidate)
-                id_not_selected = False
-        # self.id_p = self.id_counter
-
-        # self.id_counter += 1
-        print(
-            f"🤖 {self.componentinstancenumber} selected {self.id} as their ID."
-        )
+        self.assign_id()
 
-        # Calculate the neighbour, we're on a directed ring
-        self.neighbour_id = (int(self.componentinstancenumber) + 1) % self.ring_size
+        # we're on a directed ring, messages only travel clockwise
+        self.setup_ring()
 
-        self.next_hop = self.topology.get_next_hop(
-            self.componentinstancenumber, self.neighbour_id
-        )
-
-        self.next_hop_interface_id = f"{self.componentinstancenumber}-{self.next_hop}"
-
-        # if(self.id_p == 0):
         if(self.initiated == False):
             self.send_election_packet()
             self.initiated = True
 
-    
-    def pass_packet_along(self, message):
-        """For passive processes
-
-        :message: the whole Event, with eventcontent which includes header and
-        payload
-
-        """
-        pass
-
 
     def on_message_from_bottom(self, eventobj: Event):
         """New message from """
         payload: ChangRobertsPayload = eventobj.eventcontent.payload
         header: ChangRobertsMessageHeader = eventobj.eventcontent.header
 
+        if not self.accept(eventobj):
+            return
+
         message_assumed_id = payload.id
 
         # For active node, we are going to follow if/else chain
 
-        if self.state == State.passive:
+        if self.state == State.passive and message_assumed_id < self.id:
+            # passive node, but the message can not win against this node's id
+            # either, purging it keeps the message count independent of timing
+            self.statistics.messages_dismissed += 1
+
+        elif self.state == State.passive:
             # passive node, pass the message on to the next hop
-            # header will be updated
+            # header will be updated in place
             # payload will remain unchanged
 
-            header.messageto = self.next_hop
-            header.nexthop = self.next_hop
-            header.interfaceid = self.next_hop_interface_id
-
-            message = GenericMessage(header, payload)
-            self.send_down(Event(self, EventTypes.MFRT, message))
-            ChangRobertsNode.global_round += 1
-
+            self.forward_cw(eventobj)
 
         elif self.state == State.active:
 
@@ -162,51 +114,30 @@ class ChangRobertsNode(GenericModel):
                 # Another node has a higher id than this node
                 # going passive
 
-                print(
-                    f"🤖 {self.componentinstancenumber} is PASSIVE: {message_assumed_id} is encountered, this node is at {self.id}"
-                )
+                trace(self, TraceEventKind.passive, self.id, message_assumed_id)
 
+                self.statistics.transition(self.state, State.passive)
                 self.state = State.passive
-                
-                header.messageto = self.next_hop
-                header.nexthop = self.next_hop
-                header.interfaceid = self.next_hop_interface_id
 
-                message = GenericMessage(header, payload)
-                self.send_down(Event(self, EventTypes.MFRT, message))
-                ChangRobertsNode.global_round += 1
+                self.forward_cw(eventobj)
 
 
             elif message_assumed_id < self.id:
                 # This node has received a message with a lower assumed id
                 # So, this node can dismiss the election attempt of the sender node
-                # the message will be updated with this node's id
-
-                print(
-                    f"🤖 {self.componentinstancenumber} is dismissing {message_assumed_id} that is encountered. This node is at {self.id}"
-                )
-
-                payload.id = self.componentinstancenumber
-                header.messageto = self.next_hop
-                header.nexthop = self.next_hop
-                header.interfaceid = self.next_hop_interface_id
-
-                message = GenericMessage(header, payload)
-                self.send_down(Event(self, EventTypes.MFRT, message))
-                ChangRobertsNode.global_round += 1
-
+                # the message is purged, this node's own message is already on the ring
 
+                trace(self, TraceEventKind.dismissed, self.id, message_assumed_id)
 
+                self.statistics.messages_dismissed += 1
 
             elif(
                 message_assumed_id == self.id
             ):
                 # This node is selected as leader
+                self.statistics.transition(self.state, State.leader)
                 self.state = State.leader
-                print(
-                    f"🤖 {self.componentinstancenumber}: I'M THE ELECTED LEADER"
-                )            
+                trace(self, TraceEventKind.leader, self.id)
+                self.election_context.observer.on_leader(self)
 
-        self.callback.set()
-        self.draw_delay.wait()
-        self.draw_delay.clear()
\ No newline at end of file
+        self.election_context.observer.on_message_handled(self)
\ No newline at end of file
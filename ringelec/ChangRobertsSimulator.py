@@ -0,0 +1,129 @@
+"""
+Vectorized reference model of the Chang-Roberts extinction process.
+
+Every process starts a message with its id, the message travels along the
+directed ring and is purged by the first process with a larger id. The id that
+makes it all the way around belongs to the leader. Since no message ever
+interacts with another one, the whole run reduces to a "next greater element"
+search on the circular id array, which NumPy solves with binary lifting over a
+sparse max-table in O(log n) vectorized passes.
+"""
+
+import numpy as np
+
+
+class ChangRobertsSimulation:
+    """
+    Outcome of a simulated election on a ring, positions are ring positions
+    (component instance numbers):
+    - ids: the id array the election was run with
+    - hops: number of hops the message started by each position travelled
+    - forwards: number of messages each position relayed
+    - dismissed: number of messages each position purged
+    - leader: the position of the elected leader
+    - total_messages: messages sent in the whole run, initial ones included
+    """
+
+    def __init__(self, ids, hops, forwards, dismissed, leader):
+        self.ids = ids
+        self.hops = hops
+        self.forwards = forwards
+        self.dismissed = dismissed
+        self.leader = leader
+        self.total_messages = int(hops.sum())
+
+    @property
+    def leader_id(self):
+        return self.ids[self.leader]
+
+    def node_statistics(self, position):
+        """Counters of a single position, in the shape of ElectionStatistics.as_dict()"""
+        return {
+            "messages_sent": int(self.forwards[position]) + 1,
+            "messages_forwarded": int(self.forwards[position]),
+            "messages_dismissed": int(self.dismissed[position]),
+        }
+
+
+def next_greater_distance(ids):
+    """
+    Clockwise distance from every position to the first position holding a
+    strictly larger id, position i + 1 being the clockwise neighbour of i.
+    The position holding the largest id gets the ring size.
+
+    Parameters
+    -----------
+    ids: array-like
+        Distinct ids, indexed by ring position.
+
+    Returns
+    --------
+    numpy.ndarray
+        Distances as int64, each in 1..len(ids).
+    """
+    ids = np.asarray(ids)
+    n = ids.size
+    hops = np.full(n, n, dtype=np.int64)
+    if n < 2:
+        return hops
+
+    # Rotate the ring so that the largest id is the last element, then every
+    # other message is purged before it would wrap around
+    top = int(np.argmax(ids))
+    shift = n - 1 - top
+    values = np.roll(ids, shift)
+
+    # table[k][j] is the largest id in values[j:j + 2**k]
+    table = [values]
+    width = 1
+    while 2 * width <= n:
+        previous = table[-1]
+        table.append(np.maximum(previous[:-width], previous[width:]))
+        width *= 2
+
+    # Binary lifting: skip every block that holds no larger id
+    own = values[:-1]
+    position = np.arange(1, n, dtype=np.int64)
+    for level in range(len(table) - 1, -1, -1):
+        width = 1 << level
+        block = table[level]
+        fits = position + width <= n
+        skip = fits & (block[np.minimum(position, block.size - 1)] <= own)
+        position[skip] += width
+
+    hops[(np.arange(n - 1) - shift) % n] = position - np.arange(n - 1)
+    return hops
+
+
+def simulate(ids):
+    """
+    Runs the Chang-Roberts election on a directed ring with the given ids.
+
+    Parameters
+    -----------
+    ids: array-like
+        Distinct ids, indexed by ring position.
+
+    Returns
+    --------
+    ChangRobertsSimulation
+        Message counts per position and the elected leader.
+    """
+    ids = np.asarray(ids)
+    n = ids.size
+    hops = next_greater_distance(ids)
+    starts = np.arange(n, dtype=np.int64)
+    ends = starts + hops
+
+    # A message started at i is relayed by i + 1 .. ends - 1 on the unrolled
+    # ring, fold the two copies of the ring back together afterwards
+    coverage = np.cumsum(
+        np.bincount(starts + 1, minlength=2 * n + 1) - np.bincount(ends, minlength=2 * n + 1)
+    )
+    forwards = coverage[:n] + coverage[n:2 * n]
+
+    purged = hops < n
+    dismissed = np.bincount(ends[purged] % n, minlength=n)
+
+    leader = int(np.argmax(ids))
+    return ChangRobertsSimulation(ids, hops, forwards, dismissed, leader)
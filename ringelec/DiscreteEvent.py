@@ -0,0 +1,336 @@
+"""
+Single-threaded discrete-event runtime for AHC components.
+
+The threaded runtime gives every component worker threads and its messages
+real queues, so a run is bound by the thread count and its interleaving
+depends on the operating system's scheduler. `DiscreteEventTopology` builds
+the same components without worker threads and routes every event they
+trigger through one `EventScheduler`: a priority queue of pending deliveries
+ordered by virtual time. Events a component hands to itself or its
+subcomponents are delivered at the current time; a `SimulatedChannel` delivers
+a message after its latency (plus a seeded jitter), in FIFO order per link.
+The handlers (on_init, on_message_from_bottom, ...) are the unchanged ones of
+the component classes, so the election nodes and the mutual exclusion
+components run as they are, reproducibly, and rings of 10^5 nodes elect a
+leader in seconds.
+
+Handlers run to completion before the next event is handled. A handler that
+waits for another component (e.g. the leader of `BakeryAlgorithmComponentModel`
+without `grant_queue`, spinning in `BakeryLock.enter` while another process
+holds a ticket) would wait forever, so workloads must not make a handler block.
+"""
+
+import heapq
+import itertools
+from functools import partial
+from random import Random
+
+from adhoccomputing.GenericModel import GenericModel
+from adhoccomputing.Generics import *
+
+from ringelec.Election import ElectionResult, winning_id
+from ringelec.ElectionObserver import ElectionObserver
+from ringelec.ElectionStatistics import topology_statistics
+from ringelec.RingElectionNode import ElectionContext, RingTopology
+
+
+class EventScheduler:
+    """
+    Priority queue of the pending events of a simulation, ordered by virtual
+    time. Events due at the same time are handled in the order they were
+    scheduled, so a run only depends on its seed.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.pending = []
+        self.sequence = itertools.count()
+        self.events_handled = 0
+
+    def clock(self) -> float:
+        """Virtual time, e.g. the clock of a TraceRecorder"""
+        return self.now
+
+    def schedule(self, time: float, component, eventobj: Event):
+        """
+        Delivers the event to the component at the virtual time.
+        """
+        heapq.heappush(self.pending, (time, next(self.sequence), component, eventobj))
+
+    def call_at(self, time: float, function, *args):
+        """
+        Calls the function with the arguments at the virtual time, e.g. to make a
+        component enter its critical section.
+        """
+        heapq.heappush(self.pending, (time, next(self.sequence), None, partial(function, *args)))
+
+    def trigger(self, component, eventobj: Event):
+        """
+        Replaces `trigger_event` of the attached components: the event is handled
+        at the current time, after the events already due.
+        """
+        heapq.heappush(self.pending, (self.now, next(self.sequence), component, eventobj))
+
+    def attach(self, component):
+        """
+        Routes the events triggered on the component and its subcomponents
+        through this scheduler. The component must have no worker threads.
+        """
+        component.trigger_event = partial(self.trigger, component)
+        for subcomponent in component.components:
+            self.attach(subcomponent)
+
+    def run(self, until: float = None, max_events: int = None, before: float = None) -> int:
+        """
+        Handles the pending events in time order until none is left.
+
+        Parameters
+        -----------
+        until: float
+            Stops before the first event due after this virtual time.
+        before: float
+            Stops before the first event due at or after this virtual time.
+        max_events: int
+            Stops after handling this many events.
+
+        Returns
+        --------
+        int
+            Number of events handled.
+        """
+        pending = self.pending
+        handled = 0
+        while pending:
+            if until is not None and pending[0][0] > until:
+                break
+            if before is not None and pending[0][0] >= before:
+                break
+            if max_events is not None and handled >= max_events:
+                break
+            time, _, component, item = heapq.heappop(pending)
+            self.now = time
+            handled += 1
+            if component is None:
+                item()
+                continue
+            handler = component.eventhandlers.get(item.event)
+            if handler is None:
+                logger.error(f"{component.componentname}.{component.componentinstancenumber} Event Handler: {item.event} is not implemented")
+                continue
+            component.on_pre_event(item)
+            handler(eventobj=item)
+        self.events_handled += handled
+        return handled
+
+
+class SimulatedChannel(GenericModel):
+    """
+    Link between two components in virtual time, the counterpart of GenericChannel.
+
+    A message sent down to the channel reaches every UP connector but its
+    sender `latency` later, plus up to `jitter` drawn from the topology's
+    seeded generator, as the MFRB event GenericChannel would deliver. A
+    message never overtakes an earlier one on the same link.
+    """
+
+    latency = 1.0
+    jitter = 0.0
+
+    def __init__(self, componentname, componentinstancenumber, context=None, configurationparameters=None, num_worker_threads=0, topology=None):
+        super().__init__(componentname, componentinstancenumber, context, configurationparameters, num_worker_threads, topology)
+        self.scheduler: EventScheduler | None = None
+        self.random: Random | None = None
+
+        """Delivery time of the last message to each receiver, keeps the link FIFO"""
+        self.last_delivery = {}
+
+    def delay(self) -> float:
+        if self.jitter:
+            return self.latency + self.jitter * self.random.random()
+        return self.latency
+
+    def trigger_event(self, eventobj: Event):
+        if eventobj.event != EventTypes.MFRT:
+            self.scheduler.trigger(self, eventobj)
+            return
+        source = eventobj.eventsource_componentinstancenumber
+        delivery = self.scheduler.now + self.delay()
+        message = Event(None, EventTypes.MFRB, eventobj.eventcontent, fromchannel=self.componentinstancenumber, eventid=eventobj.eventid,
+                        eventsource_componentname=eventobj.eventsource_componentname, eventsource_componentinstancenumber=source)
+        for receiver in self.connectors[ConnectorTypes.UP]:
+            if receiver.componentinstancenumber == source:
+                continue
+            time = max(delivery, self.last_delivery.get(receiver.componentinstancenumber, delivery))
+            self.last_delivery[receiver.componentinstancenumber] = time
+            self.deliver(time, receiver, message)
+
+    def deliver(self, time: float, receiver, message: Event):
+        """Hands the message to the receiver at the virtual time"""
+        self.scheduler.schedule(time, receiver, message)
+
+
+class DiscreteEventTopology(RingTopology):
+    """
+    Topology whose components are driven by an EventScheduler instead of worker threads.
+
+    Construct it with `construct_from_graph`, then `start()` queues the INIT events and
+    `run()` handles events until the network is quiet.
+    """
+
+    def __init__(self, latency=1.0, jitter=0.0, seed=None, election_context: ElectionContext = None):
+        """
+        Parameters
+        -----------
+        latency: float
+            Virtual time a message takes over a channel.
+        jitter: float
+            Upper bound of the uniform random delay added to the latency.
+        seed:
+            Seed of the jitter, runs with the same seed are identical.
+        election_context: ElectionContext
+            Settings of an election run on the topology, see RingTopology.
+        """
+        super().__init__(election_context=election_context)
+        self.scheduler = EventScheduler()
+        self.latency = latency
+        self.jitter = jitter
+        self.random = Random(seed)
+
+    def construct_from_graph(self, G, nodetype, channeltype=SimulatedChannel, context=None):
+        """
+        Builds a node of `nodetype` per graph node and a `channeltype` channel
+        per edge, wired like Topology.construct_from_graph, without worker threads.
+        """
+        self.G = G
+        self.compute_forwarding_table()
+        for i in G.nodes:
+            node = nodetype(nodetype.__name__, i, num_worker_threads=0, topology=self)
+            self.scheduler.attach(node)
+            self.nodes[i] = node
+
+        for k in G.edges:
+            self.add_channel(k, channeltype)
+
+    def add_channel(self, k, channeltype=SimulatedChannel):
+        """
+        Connects the nodes of the edge k with a new `channeltype` channel,
+        e.g. a link that bypasses a crashed node (see `ringelec.Failover`).
+        The edge is added to the graph if it is not there yet.
+        """
+        self.G.add_edge(*k)
+        ch = channeltype(channeltype.__name__ + "-" + str(k[0]) + "-" + str(k[1]), str(k[0]) + "-" + str(k[1]), num_worker_threads=0, topology=self)
+        ch.scheduler = self.scheduler
+        ch.random = self.random
+        ch.latency = self.latency
+        ch.jitter = self.jitter
+        self.channels[k] = ch
+        self.nodes[k[0]].connect_me_to_component(ConnectorTypes.DOWN, ch)
+        ch.connect_me_to_component(ConnectorTypes.UP, self.nodes[k[1]])
+        if not self.G.is_directed():
+            self.nodes[k[1]].connect_me_to_component(ConnectorTypes.DOWN, ch)
+            ch.connect_me_to_component(ConnectorTypes.UP, self.nodes[k[0]])
+        return ch
+
+    def start(self):
+        """
+        Queues the INIT event of every node at the current virtual time.
+        """
+        for node in self.nodes.values():
+            if node.initeventgenerated == False:
+                node.initiate_process()
+
+    def run(self, until: float = None, max_events: int = None, before: float = None) -> int:
+        """
+        Handles events until none is pending, see `EventScheduler.run`.
+        """
+        return self.scheduler.run(until, max_events, before)
+
+
+class DiscreteEventElection(ElectionObserver):
+    """
+    Runs an election on a DiscreteEventTopology, the counterpart of `Election`.
+
+    No thread waits for the ring to quiesce: the election is over when the
+    scheduler has no event left. Durations are in virtual time, the latency
+    of a channel being one hop delay by default.
+    """
+
+    def __init__(self, node_type, observer: ElectionObserver = None):
+        """
+        Parameters
+        -----------
+        node_type: type
+            Node class of the run.
+        observer: ElectionObserver
+            Observer to pass the hooks on to, defaults to the no-op observer.
+        """
+        self.node_type = node_type
+        self.observer = observer if observer is not None else ElectionObserver()
+        self.topology = None
+        self.leader = None
+        self.elected = None
+
+    def on_message_handled(self, node):
+        self.observer.on_message_handled(node)
+
+    def on_leader(self, node):
+        self.observer.on_leader(node)
+        if self.leader is None:
+            self.leader = node
+            self.elected = self.topology.scheduler.now
+
+    def attach(self, topology: DiscreteEventTopology):
+        """
+        Observes the nodes of the topology, which must have been constructed with the node class of the election.
+        """
+        self.topology = topology
+        topology.election_context.observer = self
+
+    def run(self, topology: DiscreteEventTopology, max_events: int = None) -> ElectionResult:
+        """
+        Starts the topology and handles its events until the ring is quiet.
+
+        Returns
+        --------
+        ElectionResult
+            duration and time_to_leader are in virtual time.
+        """
+        self.attach(topology)
+        started = topology.scheduler.now
+        topology.start()
+        topology.run(max_events=max_events)
+        if self.leader is None:
+            raise RuntimeError(f"no leader after {topology.scheduler.events_handled} events")
+        return ElectionResult(self.leader.componentinstancenumber, winning_id(self.leader), topology_statistics(topology),
+                              topology.scheduler.now - started, self.elected - started)
+
+
+def simulate_election(node_type, graph, latency=1.0, jitter=0.0, seed=None, observer: ElectionObserver = None, election_context: ElectionContext = None):
+    """
+    Builds a DiscreteEventTopology of node_type on the graph and runs an election on it.
+
+    The settings of the run (ring_size, id_assigner, seed, ...) come from
+    `election_context`, or from the class attributes of the node type.
+
+    Parameters
+    -----------
+    node_type: type
+        A RingElectionNode subclass.
+    graph: networkx.Graph
+        The network, e.g. networkx.cycle_graph(ring_size).
+    latency, jitter, seed:
+        Channel delays, see `DiscreteEventTopology`.
+    observer: ElectionObserver
+        Observer to pass the hooks on to.
+    election_context: ElectionContext
+        Settings of the run.
+
+    Returns
+    --------
+    tuple
+        The topology and its ElectionResult.
+    """
+    election = DiscreteEventElection(node_type, observer)
+    topology = DiscreteEventTopology(latency, jitter, seed, election_context)
+    topology.construct_from_graph(graph, node_type)
+    return topology, election.run(topology)
@@ -0,0 +1,220 @@
+"""
+Completion of an election run.
+
+An `Election` is attached as the observer of a run. When a node reports
+that it became the leader, the election waits for the ring to quiesce, resolves
+its future with an `ElectionResult` and shuts the topology down, so a harness
+no longer sleeps for a fixed time before reading the outcome. A ring that keeps
+exchanging messages after the election, like the flooding FranklinsNode the
+repository used to ship, is stopped after a settle timeout instead.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+
+import networkx as nx
+from adhoccomputing.Networking.LogicalChannels.GenericChannel import GenericChannel
+
+from ringelec.ElectionObserver import ElectionObserver
+from ringelec.ElectionStatistics import topology_statistics
+from ringelec.RingElectionNode import ElectionContext, RingTopology
+
+
+class ElectionResult:
+    """
+    Outcome of an election run
+    - leader: component instance number of the elected node
+    - leader_id: id the leader won with (`id_p` for anonymous rings)
+    - statistics: the run totals and per-node breakdown, see `topology_statistics`
+    - duration: seconds from the start of the topology to quiescence
+    - time_to_leader: seconds from the start of the topology to the election of the leader
+    - physical_hops: messages_sent plus the relays of multi-hop ring links
+    - quiesced: False if the ring was still busy when the settle timeout stopped it
+    """
+
+    def __init__(self, leader, leader_id, statistics, duration, time_to_leader=None, quiesced=True):
+        self.leader = leader
+        self.leader_id = leader_id
+        self.statistics = statistics
+        self.duration = duration
+        self.time_to_leader = time_to_leader
+        self.quiesced = quiesced
+
+    @property
+    def physical_hops(self):
+        """Transmissions on the physical links: the ring messages and their relays on multi-hop ring links"""
+        total = self.statistics["total"]
+        return total["messages_sent"] + total["messages_relayed"]
+
+    def __str__(self) -> str:
+        return f"ElectionResult: LEADER: {self.leader} ID: {self.leader_id} MESSAGES: {self.statistics['total']['messages_sent']} DURATION: {self.duration:.3f}s"
+
+
+def winning_id(node):
+    """
+    Returns the id a leader won with; anonymous nodes (Itai-Rodeh) win with the id they picked for the round.
+    """
+    return node.id_p if hasattr(node, "id_p") else node.id
+
+
+def components(topology):
+    """
+    Yields every component of the topology: nodes, channels and their subcomponents (channel pipes).
+    """
+    stack = list(topology.nodes.values()) + list(topology.channels.values())
+    while stack:
+        component = stack.pop()
+        yield component
+        stack.extend(component.components)
+
+
+def is_idle(topology) -> bool:
+    """
+    True if no component has an event queued or in its handler.
+
+    A handler triggers the next component before its own queue marks the
+    event done, so a message in flight always keeps one queue unfinished.
+    """
+    return all(component.inputqueue.unfinished_tasks == 0 for component in components(topology))
+
+
+class Election(ElectionObserver):
+    """
+    Resolves `future` once a leader is elected and the ring has quiesced, or
+    the settle timeout ran out.
+
+    The election replaces the observer in the election context of the
+    topology and passes every hook on to the observer it wraps, so a
+    visualizer keeps working.
+    """
+
+    def __init__(self, node_type, observer: ElectionObserver = None, exit_on_completion: bool = True, poll_interval: float = 0.001,
+                 settle_timeout: float = None):
+        """
+        Parameters
+        -----------
+        node_type: type
+            Node class of the run.
+        observer: ElectionObserver
+            Observer to pass the hooks on to, defaults to the no-op observer.
+        exit_on_completion: bool
+            Call `topology.exit()` as soon as the future is resolved.
+        poll_interval: float
+            Seconds between two quiescence checks once a leader exists.
+        settle_timeout: float
+            Seconds to wait for the ring to quiesce once a leader exists. By
+            default as long as the leader took to be elected, and at least one
+            second; the stragglers of an election that terminates need less.
+        """
+        self.node_type = node_type
+        self.observer = observer if observer is not None else ElectionObserver()
+        self.exit_on_completion = exit_on_completion
+        self.poll_interval = poll_interval
+        self.settle_timeout = settle_timeout
+        self.future: Future = Future()
+        self.topology = None
+        self.leader = None
+        self.started = None
+        self.elected = None
+        self._lock = threading.Lock()
+
+    def start(self, topology):
+        """
+        Starts the topology, which must have been constructed with the node class of the election.
+        """
+        self.topology = topology
+        topology.election_context.observer = self
+        self.started = time.perf_counter()
+        topology.start()
+        return self.future
+
+    def on_message_handled(self, node):
+        self.observer.on_message_handled(node)
+
+    def on_leader(self, node):
+        self.observer.on_leader(node)
+        with self._lock:
+            if self.leader is not None:
+                return
+            self.leader = node
+            self.elected = time.perf_counter()
+        # wait for the stragglers off the node's worker thread
+        threading.Thread(target=self._complete, daemon=True).start()
+
+    def _complete(self):
+        try:
+            settle_timeout = self.settle_timeout
+            if settle_timeout is None:
+                settle_timeout = max(1.0, self.elected - self.started)
+            deadline = self.elected + settle_timeout
+            previous = None
+            quiesced = True
+            while True:
+                # an idle scan may miss a message moving between two queues,
+                # the counters only stop changing once nothing is in flight
+                if is_idle(self.topology):
+                    current = topology_statistics(self.topology)["total"]
+                    if current == previous:
+                        break
+                    previous = current
+                else:
+                    previous = None
+                if time.perf_counter() > deadline:
+                    # the nodes never stop sending, report the run as it is now
+                    quiesced = False
+                    break
+                time.sleep(self.poll_interval)
+
+            duration = time.perf_counter() - self.started
+            result = ElectionResult(self.leader.componentinstancenumber, winning_id(self.leader), topology_statistics(self.topology), duration, self.elected - self.started, quiesced)
+            if self.exit_on_completion:
+                self.topology.exit()
+            self.future.set_result(result)
+        except Exception as ex:
+            self.future.set_exception(ex)
+
+    def result(self, timeout=None) -> ElectionResult:
+        """
+        Blocks until the election completes, raises TimeoutError after `timeout` seconds.
+        """
+        return self.future.result(timeout)
+
+    def __await__(self):
+        return asyncio.wrap_future(self.future).__await__()
+
+
+def threaded_election(election_context: ElectionContext, graph=None, observer: ElectionObserver = None, prepare=None, timeout=300):
+    """
+    Builds a RingTopology of the context's node class, with worker threads and
+    GenericChannels, and runs an election on it; the threaded counterpart of
+    `ringelec.DiscreteEvent.simulate_election`.
+
+    Parameters
+    -----------
+    election_context: ElectionContext
+        Settings of the run.
+    graph: networkx.Graph
+        The network, the ring of `election_context.ring_size` by default.
+    observer: ElectionObserver
+        Observer to pass the hooks on to.
+    prepare: callable
+        Called with the topology before it starts, e.g. `ringelec.RingEmbedding.embed_ring`.
+    timeout: float
+        Seconds to wait for the election to complete.
+
+    Returns
+    --------
+    tuple
+        The topology and its ElectionResult.
+    """
+    node_type = election_context.node_type
+    if graph is None:
+        graph = nx.cycle_graph(election_context.ring_size)
+    election = Election(node_type, observer)
+    topology = RingTopology(election_context=election_context)
+    topology.construct_from_graph(graph, node_type, GenericChannel)
+    if prepare is not None:
+        prepare(topology)
+    return topology, election.start(topology).result(timeout)
@@ -0,0 +1,63 @@
+"""
+Observers that ring election nodes notify after handling a message.
+
+Nodes never talk to a visualizer directly; they call the observer of their
+election context. The default observer does nothing, so an election runs headless
+and message handling never blocks.
+"""
+
+import threading
+
+
+class ElectionObserver:
+    """
+    No-op observer, used when nothing is watching the election.
+
+    Subclass it and override the hooks you need. Hooks are called from the
+    node's worker thread, so they should return quickly.
+    """
+
+    def on_message_handled(self, node):
+        """Called by a node after it has handled a message from the ring"""
+        pass
+
+    def on_leader(self, node):
+        """Called by a node when it enters the leader state"""
+        pass
+
+    def on_leader_suspected(self, node, leader):
+        """Called by a node that stopped hearing from the leader at position `leader`, see `ringelec.Failover`"""
+        pass
+
+
+class SamplingObserver(ElectionObserver):
+    """
+    Flags that the ring has changed without waiting for anybody.
+
+    A renderer waits on `update`, samples the node states at its own pace and
+    clears the flag; nodes keep running at full speed in the meantime.
+    """
+
+    def __init__(self):
+        self.update = threading.Event()
+
+    def on_message_handled(self, node):
+        self.update.set()
+
+
+class LockstepObserver(ElectionObserver):
+    """
+    Keeps every node in lockstep with a renderer, one message per frame.
+
+    This is the behaviour the visual scripts used to hard-code: the node sets
+    `callback`, then waits until the renderer sets `draw_delay`.
+    """
+
+    def __init__(self, callback=None, draw_delay=None):
+        self.callback = callback if callback is not None else threading.Event()
+        self.draw_delay = draw_delay if draw_delay is not None else threading.Event()
+
+    def on_message_handled(self, node):
+        self.callback.set()
+        self.draw_delay.wait()
+        self.draw_delay.clear()
@@ -0,0 +1,85 @@
+"""
+Per-node message and round accounting for the ring election algorithms.
+
+Every node owns an ElectionStatistics instance and only its own worker thread
+updates it, so the counters are plain integers and need no locking. Read them
+with `topology_statistics` once the run is over.
+"""
+
+
+class ElectionStatistics:
+    """
+    Counters kept by a single node:
+    - messages_sent: every message the node put on the ring, forwarded ones included
+    - messages_forwarded: messages of other nodes relayed by this node
+    - messages_relayed: messages passed on along a multi-hop ring link, each
+    one physical hop that is not counted in messages_sent
+    - messages_dismissed: incoming messages the node purged or overrode
+    - heartbeats_sent: heartbeats the node sent as a leader, see
+    `ringelec.Failover`, not counted in messages_sent
+    - rounds: the highest election round the node has reached
+    - state_transitions: number of times each "old->new" state change happened
+    """
+
+    __slots__ = ("messages_sent", "messages_forwarded", "messages_relayed", "messages_dismissed", "heartbeats_sent", "rounds", "state_transitions")
+
+    def __init__(self):
+        self.messages_sent = 0
+        self.messages_forwarded = 0
+        self.messages_relayed = 0
+        self.messages_dismissed = 0
+        self.heartbeats_sent = 0
+        self.rounds = 1
+        self.state_transitions = {}
+
+    def transition(self, old_state, new_state):
+        """Records a state change of the node"""
+        key = f"{old_state.name}->{new_state.name}"
+        self.state_transitions[key] = self.state_transitions.get(key, 0) + 1
+
+    def merge(self, other):
+        """Adds the counters of another node to this one, rounds keep the maximum"""
+        self.messages_sent += other.messages_sent
+        self.messages_forwarded += other.messages_forwarded
+        self.messages_relayed += other.messages_relayed
+        self.messages_dismissed += other.messages_dismissed
+        self.heartbeats_sent += other.heartbeats_sent
+        self.rounds = max(self.rounds, other.rounds)
+        for key, count in other.state_transitions.items():
+            self.state_transitions[key] = self.state_transitions.get(key, 0) + count
+
+    def as_dict(self):
+        return {
+            "messages_sent": self.messages_sent,
+            "messages_forwarded": self.messages_forwarded,
+            "messages_relayed": self.messages_relayed,
+            "messages_dismissed": self.messages_dismissed,
+            "heartbeats_sent": self.heartbeats_sent,
+            "rounds": self.rounds,
+            "state_transitions": dict(self.state_transitions),
+        }
+
+
+def topology_statistics(topology):
+    """
+    Aggregates the statistics of every election node in the topology.
+
+    Returns a dictionary with the run totals under "total" and the breakdown of
+    each node, keyed by component instance number, under "nodes".
+    """
+    return summarize(
+        (nodeID, node.statistics) for nodeID, node in topology.nodes.items() if getattr(node, "statistics", None) is not None
+    )
+
+
+def summarize(node_statistics):
+    """
+    Aggregates (node, ElectionStatistics) pairs, e.g. collected from several
+    processes, into the dictionary returned by `topology_statistics`.
+    """
+    total = ElectionStatistics()
+    nodes = {}
+    for nodeID, statistics in node_statistics:
+        total.merge(statistics)
+        nodes[nodeID] = statistics.as_dict()
+    return {"total": total.as_dict(), "nodes": nodes}
@@ -0,0 +1,192 @@
+"""
+Compact binary traces of election runs.
+
+Nodes append fixed-width records (timestamp, node, event kind, id, message id,
+round) to a preallocated NumPy buffer instead of printing a line per event.
+The recorder saves the records as a .npy file, which TraceReader maps back
+into memory to rebuild the run statistics or the legacy text output of the
+croutputN/foutputN files.
+"""
+
+import itertools
+import threading
+import time
+from enum import IntEnum
+
+import numpy as np
+
+
+class TraceEventKind(IntEnum):
+    """
+    Events recorded by the election nodes
+    - selected_id: the node took its id, `id` is that id
+    - passive: the node went passive, `message_id` is the larger id it met
+    - dismissed: the node purged a message carrying `message_id`
+    - leader: the node was elected
+    - new_round: the node started round `round` with id `id` (Itai-Rodeh)
+    - dirtied: the node set the dirty bit of `message_id` (Itai-Rodeh)
+    """
+
+    selected_id = 1
+    passive = 2
+    dismissed = 3
+    leader = 4
+    new_round = 5
+    dirtied = 6
+
+
+TRACE_RECORD = np.dtype([
+    ("timestamp", "<f8"),
+    ("node", "<i4"),
+    ("kind", "u1"),
+    ("id", "<i8"),
+    ("message_id", "<i8"),
+    ("round", "<i4"),
+])
+
+
+class TraceRecorder:
+    """
+    Collects trace records from every node of a run.
+
+    Writers claim a slot with an atomic counter and fill it in place, so
+    recording takes no lock; a new chunk of `capacity` records is allocated
+    only when the current one is full. Flush after the run has quiesced.
+    """
+
+    def __init__(self, capacity: int = 1 << 16, clock=time.perf_counter):
+        """
+        Parameters
+        -----------
+        capacity: int
+            Number of records in each preallocated chunk.
+        clock: callable
+            Returns the timestamp of a record, in seconds.
+        """
+        self.capacity = capacity
+        self.clock = clock
+        self._chunks = [np.zeros(capacity, dtype=TRACE_RECORD)]
+        self._slots = itertools.count()
+        self._lock = threading.Lock()
+
+    def record(self, node, kind: TraceEventKind, id=0, message_id=0, round=1):
+        """
+        Appends a record, safe to call from any node thread.
+        """
+        slot = next(self._slots)
+        chunk, offset = divmod(slot, self.capacity)
+        if chunk >= len(self._chunks):
+            with self._lock:
+                while chunk >= len(self._chunks):
+                    self._chunks.append(np.zeros(self.capacity, dtype=TRACE_RECORD))
+        self._chunks[chunk][offset] = (self.clock(), node, kind, id, message_id, round)
+
+    def __len__(self):
+        """
+        Number of records written so far. Slots are handed out in order, so
+        every chunk but the last is full; only the last one is counted.
+        """
+        return (len(self._chunks) - 1) * self.capacity + int(np.count_nonzero(self._chunks[-1]["kind"]))
+
+    def records(self) -> np.ndarray:
+        """
+        Returns a copy of the records written so far, in timestamp order.
+        """
+        records = np.concatenate(self._chunks)
+        # every kind is non-zero, unused slots are still zeroed
+        records = records[records["kind"] != 0]
+        return records[np.argsort(records["timestamp"], kind="stable")]
+
+    def flush(self, path, mmap: bool = False):
+        """
+        Saves the records to a .npy file.
+
+        Parameters
+        -----------
+        path: str
+            Destination file.
+        mmap: bool
+            Write through a memory-mapped .npy file instead of np.save, which
+            keeps only one copy of a large trace in memory.
+        """
+        records = self.records()
+        if mmap:
+            target = np.lib.format.open_memmap(path, mode="w+", dtype=TRACE_RECORD, shape=records.shape)
+            target[:] = records
+            target.flush()
+            del target
+        else:
+            np.save(path, records)
+
+
+class TraceReader:
+    """
+    Reads a trace saved by TraceRecorder.flush, or wraps the records of a live recorder.
+    """
+
+    def __init__(self, records: np.ndarray):
+        self.records = records
+
+    @classmethod
+    def load(cls, path, mmap: bool = True):
+        """
+        Loads a .npy trace, memory-mapped by default.
+        """
+        return cls(np.load(path, mmap_mode="r" if mmap else None))
+
+    def statistics(self):
+        """
+        Rebuilds the statistics of the run from the trace.
+
+        Returns
+        --------
+        dict
+            Event counts per kind, the leader(s), the highest round, the
+            duration of the run in seconds and the events of each node.
+        """
+        kinds = self.records["kind"]
+        nodes = self.records["node"]
+        counts = {kind.name: int(np.count_nonzero(kinds == kind)) for kind in TraceEventKind}
+        per_node = {}
+        for node in np.unique(nodes):
+            node_kinds = kinds[nodes == node]
+            per_node[int(node)] = {kind.name: int(np.count_nonzero(node_kinds == kind)) for kind in TraceEventKind}
+        timestamps = self.records["timestamp"]
+        return {
+            "events": counts,
+            "leaders": [int(node) for node in nodes[kinds == TraceEventKind.leader]],
+            "rounds": int(self.records["round"].max()) if self.records.size else 0,
+            "duration": float(timestamps.max() - timestamps.min()) if self.records.size else 0.0,
+            "nodes": per_node,
+        }
+
+    def legacy_text(self):
+        """
+        Yields the trace as the lines the election modules used to print.
+        """
+        for record in self.records:
+            node = int(record["node"])
+            id = int(record["id"])
+            message_id = int(record["message_id"])
+            kind = TraceEventKind(int(record["kind"]))
+            if kind == TraceEventKind.selected_id:
+                yield f"🤖 {node} selected {id} as their ID."
+            elif kind == TraceEventKind.passive:
+                yield f"🤖 {node} is PASSIVE: {message_id} is encountered, this node is at {id}"
+            elif kind == TraceEventKind.dismissed:
+                yield f"🤖 {node} is dismissing {message_id} that is encountered. This node is at {id}"
+            elif kind == TraceEventKind.leader:
+                yield f"🤖 {node}: I'M THE ELECTED LEADER"
+            elif kind == TraceEventKind.new_round:
+                yield f"🤖 {node} selected {id} as their ID for round {int(record['round'])}"
+            elif kind == TraceEventKind.dirtied:
+                yield f"🤖 {node} dirtied the bit for {message_id}, passing it along"
+
+
+def trace(node, kind: TraceEventKind, id=0, message_id=0, round=1):
+    """
+    Records an event of the node if its run has a trace recorder attached.
+    """
+    recorder = node.election_context.trace_recorder
+    if recorder is not None:
+        recorder.record(node.componentinstancenumber, kind, id, message_id, round)
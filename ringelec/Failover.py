@@ -0,0 +1,465 @@
+"""
+Leader failure detection and re-election for the ring election nodes.
+
+Once a ring has elected its leader nothing watches it, so a leader that stops
+leaves the ring without one until every node is restarted. `with_failover`
+mixes `FailoverNode` into a node class:
+
+- the leader sends a heartbeat to its clockwise ring neighbour every
+  `heartbeat_interval`; that neighbour suspects a crash when it has heard
+  nothing for `failure_timeout`
+- the two ring neighbours of the crashed leader link up directly, bypassing it
+  (`repair_ring`), the other nodes keep their ids, routes and state
+- with `Reelection.largest_id`, the neighbour that detected the crash starts
+  a single re-election message around the repaired ring. A node with a larger
+  id replaces it with its own, so the message that comes back to its sender
+  carries the largest surviving id: at most 2N messages where a full restart
+  costs a whole election, but up to 2N hop delays. Anonymous nodes (Itai-Rodeh)
+  have no id to compare, the detecting node wins.
+- with `Reelection.takeover`, the neighbour that detected the crash is the
+  leader at once and announces it around the ring, so the ring is only
+  without a leader until the crash is detected.
+
+Heartbeats and timeouts run in virtual time, on a `DiscreteEventTopology`:
+failover is a simulation, and its latencies are in hop delays. The threaded
+topologies have no timers and cannot add the repair channel to a running ring,
+so a failover node refuses to be built on one. `FailoverElection` crashes the
+leaders of a run and records the detection and failover latencies of every
+crash.
+"""
+
+from enum import Enum
+
+import networkx as nx
+from adhoccomputing.GenericModel import GenericMessage
+from adhoccomputing.Generics import *
+
+from ringelec.DiscreteEvent import DiscreteEventElection, DiscreteEventTopology
+from ringelec.ElectionObserver import ElectionObserver
+from ringelec.ElectionStatistics import topology_statistics
+from ringelec.RingElectionNode import Direction, ElectionContext
+from ringelec.RingMessages import RingMessagePayload, send
+
+
+class Reelection(Enum):
+    """
+    How the ring replaces a crashed leader
+    - "largest_id": a message around the repaired ring elects the node with the largest id
+    - "takeover": the node that detected the crash takes over and announces it
+    """
+
+    largest_id = "largest_id"
+    takeover = "takeover"
+
+
+class HeartbeatPayload(RingMessagePayload):
+    """
+    Sent by the leader to its clockwise ring neighbour:
+    - epoch: the number of re-elections before the leader's, 0 for the first election
+    - leader: position of the leader
+    - predecessor: counterclockwise ring neighbour of the leader, the node to link up with if it crashes
+    """
+
+    __slots__ = ("epoch", "leader", "predecessor")
+
+    def __init__(self, epoch, leader, predecessor, messagepayload=None):
+        super().__init__(messagepayload)
+        self.epoch = epoch
+        self.leader = leader
+        self.predecessor = predecessor
+
+
+class ReelectionPayload(RingMessagePayload):
+    """
+    Travels clockwise around the repaired ring:
+    - epoch: the re-election it belongs to, older ones are dismissed
+    - key: the failover key of its sender, None for anonymous nodes
+    - origin: position of its sender, which becomes the leader when the message comes back
+    - elected: set when the sender has taken over, the message only announces it
+    """
+
+    __slots__ = ("epoch", "key", "origin", "elected")
+
+    def __init__(self, epoch, key, origin, elected=False, messagepayload=None):
+        super().__init__(messagepayload)
+        self.epoch = epoch
+        self.key = key
+        self.origin = origin
+        self.elected = elected
+
+
+class RepairedRing:
+    """
+    Ring order of the positions that have not crashed, used by RingRoutes in
+    place of a RingEmbedding; paths between ring neighbours avoid the crashed
+    positions.
+    """
+
+    def __init__(self, graph, order, crashed):
+        self.graph = graph
+        self.order = list(order)
+        self.crashed = set(crashed)
+
+    def path(self, source, destination):
+        return nx.shortest_path(nx.restricted_view(self.graph, self.crashed, []), source, destination)
+
+
+def repair_ring(topology: DiscreteEventTopology, crashed, predecessor, successor) -> RepairedRing:
+    """
+    Takes the crashed position out of the ring: its ring neighbours get a
+    direct channel, if they have none, and look up their new next hops.
+
+    Returns
+    --------
+    RepairedRing
+        The order of the remaining positions, also set as the ring embedding of the topology.
+    """
+    embedding = getattr(topology, "ring_embedding", None)
+    order = embedding.order if embedding is not None else range(topology.election_context.ring_size)
+    repaired = RepairedRing(topology.G, [position for position in order if position != crashed],
+                            getattr(embedding, "crashed", set()) | {crashed})
+    if predecessor != successor and successor not in topology.G._adj[predecessor]:
+        topology.add_channel((predecessor, successor))
+    topology.ring_embedding = repaired
+    topology.ring_routes = None
+    if len(repaired.order) > 1:
+        for position in {predecessor, successor}:
+            topology.nodes[position].setup_ring()
+    return repaired
+
+
+class FailoverNode:
+    """
+    Leader monitoring and re-election, mixed into a RingElectionNode subclass by `with_failover`.
+
+    The settings are context attributes: `heartbeat_interval` and
+    `failure_timeout`, in virtual time, and `reelection`. The timeout must be
+    longer than the interval plus the largest channel delay, or a slow leader
+    is taken for a crashed one.
+
+    The timers and the ring repair need the EventScheduler of a
+    DiscreteEventTopology, the node raises a TypeError on any other topology.
+    """
+
+    heartbeat_interval = 2.0
+    failure_timeout = 5.0
+    reelection = Reelection.largest_id
+    failover_attributes = ("heartbeat_interval", "failure_timeout", "reelection")
+
+    def __init__(self, componentname, componentinstancenumber, context=None, configurationparameters=None, num_worker_threads=1, topology=None, child_conn=None, node_queues=None, channel_queues=None):
+        if not isinstance(topology, DiscreteEventTopology):
+            raise TypeError(f"{type(self).__name__} runs on a DiscreteEventTopology, heartbeats and timeouts need its "
+                            f"scheduler; got {type(topology).__name__}")
+        super().__init__(componentname, componentinstancenumber, context, configurationparameters, num_worker_threads, topology, child_conn, node_queues, channel_queues)
+
+        """Set by crash(), the node handles nothing afterwards"""
+        self.crashed = False
+
+        """Number of re-elections the node has taken part in"""
+        self.epoch = 0
+
+        """True while the node is the leader and sends heartbeats"""
+        self.leading = False
+
+        """Last heartbeat from the leader, and the virtual time it arrived"""
+        self.heartbeat: HeartbeatPayload | None = None
+        self.heartbeat_time = None
+
+        """True while a check of the leader is scheduled"""
+        self.watching = False
+
+        """Key the node competes with in a re-election, the largest one wins"""
+        self.failover_key = None
+
+    def assign_id(self):
+        # Peterson nodes take over the ids of others, keep the one assigned;
+        # anonymous nodes take no id and never compete
+        super().assign_id()
+        self.failover_key = self.id
+
+    def crash(self):
+        """Stops the node: it handles no message and no timer from now on"""
+        self.crashed = True
+        self.leading = False
+
+    def after(self, delay, function):
+        """Calls the function `delay` later in virtual time"""
+        scheduler = self.topology.scheduler
+        scheduler.call_at(scheduler.now + delay, function)
+
+    def on_init(self, eventobj: Event):
+        if not self.crashed:
+            super().on_init(eventobj)
+
+    def on_message_from_bottom(self, eventobj: Event):
+        if self.crashed:
+            return
+        payload = eventobj.eventcontent.payload
+        if isinstance(payload, HeartbeatPayload):
+            if self.accept(eventobj):
+                self.on_heartbeat(payload)
+        elif isinstance(payload, ReelectionPayload):
+            if self.accept(eventobj):
+                self.on_reelection(eventobj)
+                self.election_context.observer.on_message_handled(self)
+        else:
+            super().on_message_from_bottom(eventobj)
+            # the algorithm elected this node
+            if not self.leading and self.state.name == "leader":
+                self.lead()
+
+    def lead(self):
+        """Starts sending heartbeats"""
+        self.leading = True
+        self.send_heartbeat()
+
+    def send_heartbeat(self):
+        if not self.leading:
+            return
+        direction = Direction.clockwise
+        header = self.header_type(
+            messagefrom=self.componentinstancenumber,
+            messageto=self.neighbours[direction],
+            nexthop=self.next_hops[direction],
+            interfaceid=self.next_hop_interface_ids[direction]
+        )
+        payload = HeartbeatPayload(self.epoch, self.componentinstancenumber, self.neighbours[Direction.counterclockwise])
+        send(self, Event(self, EventTypes.MFRT, GenericMessage(header, payload)), self.next_hop_channels[direction])
+        self.statistics.heartbeats_sent += 1
+        self.after(self.election_context.heartbeat_interval, self.send_heartbeat)
+
+    def on_heartbeat(self, payload: HeartbeatPayload):
+        if payload.epoch < self.epoch:
+            # a leader this node has already replaced
+            self.statistics.messages_dismissed += 1
+            return
+        self.epoch = payload.epoch
+        self.heartbeat = payload
+        self.heartbeat_time = self.topology.scheduler.now
+        if not self.watching:
+            self.watching = True
+            self.after(self.election_context.failure_timeout, self.check_leader)
+
+    def check_leader(self):
+        """Suspects a crash of the leader if it has not been heard from for the timeout"""
+        if self.crashed:
+            return
+        silence = self.topology.scheduler.now - self.heartbeat_time
+        timeout = self.election_context.failure_timeout
+        if silence < timeout:
+            self.after(timeout - silence, self.check_leader)
+            return
+        self.watching = False
+        leader = self.heartbeat.leader
+        self.election_context.observer.on_leader_suspected(self, leader)
+        repaired = repair_ring(self.topology, leader, self.heartbeat.predecessor, self.componentinstancenumber)
+        self.epoch += 1
+        takeover = Reelection(self.election_context.reelection) == Reelection.takeover
+        if takeover or len(repaired.order) == 1:
+            self.elect()
+        if len(repaired.order) > 1:
+            self.send_cw(ReelectionPayload(self.epoch, self.failover_key, self.componentinstancenumber, takeover))
+
+    def on_reelection(self, eventobj: Event):
+        payload: ReelectionPayload = eventobj.eventcontent.payload
+        if payload.epoch < self.epoch:
+            # left over from an earlier re-election
+            self.statistics.messages_dismissed += 1
+            return
+        self.epoch = payload.epoch
+        key = self.failover_key
+        if payload.origin == self.componentinstancenumber:
+            # the message went all the way around, no node has a larger key
+            if not payload.elected:
+                self.elect()
+        elif key is not None and not payload.elected and (payload.key is None or key > payload.key):
+            # only one re-election message is on the ring, this node's replaces it
+            self.statistics.messages_dismissed += 1
+            self.send_cw(ReelectionPayload(payload.epoch, key, self.componentinstancenumber))
+        else:
+            self.forward_cw(eventobj)
+
+    def elect(self):
+        """Becomes the leader of the repaired ring"""
+        leader = type(self.state).leader
+        self.statistics.transition(self.state, leader)
+        self.state = leader
+        self.election_context.observer.on_leader(self)
+        self.lead()
+
+
+_failover_types = {}
+
+
+def with_failover(node_type):
+    """
+    Returns the subclass of a RingElectionNode class with FailoverNode mixed
+    in, e.g. FailoverChangRobertsNode, the same class on every call.
+    """
+    if issubclass(node_type, FailoverNode):
+        return node_type
+    failover_type = _failover_types.get(node_type)
+    if failover_type is None:
+        failover_type = type(f"Failover{node_type.__name__}", (FailoverNode, node_type), {
+            "context_attributes": node_type.context_attributes + FailoverNode.failover_attributes,
+            "__module__": __name__,
+        })
+        _failover_types[node_type] = failover_type
+    return failover_type
+
+
+class Failover:
+    """
+    A crash of the leader and the re-election after it, in virtual time
+    - leader: position of the crashed leader
+    - crashed: time of the crash
+    - suspected: time its clockwise neighbour suspected the crash
+    - new_leader: position of the re-elected leader
+    - reelected: time of the re-election
+    - messages: messages sent from the crash to the next crash or the end of
+    the run, those of the re-election and of its announcement; heartbeats
+    are not counted
+    """
+
+    def __init__(self, leader, crashed, messages_before):
+        self.leader = leader
+        self.crashed = crashed
+        self.suspected = None
+        self.new_leader = None
+        self.reelected = None
+        self.messages_before = messages_before
+        self.messages = None
+
+    @property
+    def detection_latency(self):
+        """From the crash to the suspicion"""
+        return self.suspected - self.crashed
+
+    @property
+    def failover_latency(self):
+        """From the crash to the re-election, the time the ring has no leader"""
+        return self.reelected - self.crashed
+
+    def __str__(self) -> str:
+        return (f"Failover: LEADER: {self.leader} NEW LEADER: {self.new_leader} DETECTION: {self.detection_latency:.1f} "
+                f"FAILOVER: {self.failover_latency:.1f} MESSAGES: {self.messages}")
+
+
+class FailoverElection(DiscreteEventElection):
+    """
+    Runs an election with failover nodes and crashes its leaders, the
+    counterpart of DiscreteEventElection: every leader crashes `crash_after`
+    its election, until `crashes` leaders have crashed and been replaced.
+    """
+
+    def __init__(self, node_type, crashes=1, crash_after=10.0, observer: ElectionObserver = None):
+        """
+        Parameters
+        -----------
+        node_type: type
+            Failover node class of the run, see `with_failover`.
+        crashes: int
+            Number of leaders to crash, one after the other.
+        crash_after: float
+            Virtual time from the election of a leader to its crash.
+        observer: ElectionObserver
+            Observer to pass the hooks on to, defaults to the no-op observer.
+        """
+        super().__init__(node_type, observer)
+        self.crashes = crashes
+        self.crash_after = crash_after
+
+        """Every leader and the time it was elected, in order"""
+        self.leaders = []
+
+        """One record per crash"""
+        self.failovers: list[Failover] = []
+
+    def messages_sent(self):
+        return topology_statistics(self.topology)["total"]["messages_sent"]
+
+    def on_leader(self, node):
+        super().on_leader(node)
+        now = self.topology.scheduler.now
+        self.leaders.append((now, node))
+        if self.failovers:
+            failover = self.failovers[-1]
+            failover.new_leader = node.componentinstancenumber
+            failover.reelected = now
+        if len(self.failovers) < self.crashes:
+            self.topology.scheduler.call_at(now + self.crash_after, self.crash, node)
+
+    def on_leader_suspected(self, node, leader):
+        self.observer.on_leader_suspected(node, leader)
+        self.failovers[-1].suspected = self.topology.scheduler.now
+
+    def crash(self, node):
+        node.crash()
+        messages_sent = self.messages_sent()
+        if self.failovers:
+            self.failovers[-1].messages = messages_sent - self.failovers[-1].messages_before
+        self.failovers.append(Failover(node.componentinstancenumber, self.topology.scheduler.now, messages_sent))
+
+    def reelecting(self) -> bool:
+        """True while a re-election message is on its way"""
+        return any(
+            isinstance(getattr(getattr(item, "eventcontent", None), "payload", None), ReelectionPayload)
+            for _, _, component, item in self.topology.scheduler.pending
+            if component is not None
+        )
+
+    def run(self, topology: DiscreteEventTopology, max_events: int = None, batch: int = 1000) -> list:
+        """
+        Starts the topology and handles its events until the last crash has
+        been recovered from and the re-election message is back at its
+        sender. Heartbeats never stop, so the events are handled in batches
+        and the run ends with the batch that completes the re-election.
+
+        Returns
+        --------
+        list
+            The Failover records.
+        """
+        self.attach(topology)
+        topology.start()
+        handled = 0
+        while len(self.failovers) < self.crashes or self.failovers[-1].reelected is None or self.reelecting():
+            if not topology.scheduler.pending or (max_events is not None and handled >= max_events):
+                raise RuntimeError(f"{len(self.failovers)} crashes, {len(self.leaders)} leaders after {topology.scheduler.events_handled} events")
+            handled += topology.run(max_events=batch)
+        self.failovers[-1].messages = self.messages_sent() - self.failovers[-1].messages_before
+        return self.failovers
+
+
+def simulate_failover(node_type, graph, crashes=1, crash_after=10.0, latency=1.0, jitter=0.0, seed=None,
+                      observer: ElectionObserver = None, election_context: ElectionContext = None):
+    """
+    Builds a DiscreteEventTopology of failover nodes on the graph, elects a
+    leader and crashes `crashes` leaders in turn, see `FailoverElection`.
+
+    Parameters
+    -----------
+    node_type: type
+        A RingElectionNode subclass, or its failover class.
+    graph: networkx.Graph
+        The network, e.g. networkx.cycle_graph(ring_size).
+    crashes, crash_after:
+        See `FailoverElection`.
+    latency, jitter, seed:
+        Channel delays, see `DiscreteEventTopology`.
+    observer: ElectionObserver
+        Observer to pass the hooks on to.
+    election_context: ElectionContext
+        Settings of the run, for the failover class.
+
+    Returns
+    --------
+    tuple
+        The topology and the FailoverElection, whose `failovers` hold the records.
+    """
+    node_type = with_failover(node_type)
+    election = FailoverElection(node_type, crashes, crash_after, observer)
+    topology = DiscreteEventTopology(latency, jitter, seed, election_context)
+    topology.construct_from_graph(graph, node_type)
+    election.run(topology)
+    return topology, election
@@ -1,10 +1,12 @@
 from enum import Enum
-from random import randint
 
 from adhoccomputing.Experimentation.Topology import Topology
-from adhoccomputing.GenericModel import GenericModel, GenericMessageHeader, GenericMessagePayload, GenericMessage
 from adhoccomputing.Generics import *
 
+from ringelec.ElectionTrace import TraceEventKind, trace
+from ringelec.RingElectionNode import Direction, RingElectionNode
+from ringelec.RingMessages import RingMessageHeader, RingMessagePayload
+
 class State(Enum):
     """
     State of the nodes, one from {active, passive, leader}
@@ -19,7 +21,9 @@ class State(Enum):
     passive = 2
     leader = 3
 
-class FranklinsMessageHeader(GenericMessageHeader):
+class FranklinsMessageHeader(RingMessageHeader):
+    __slots__ = ()
+
     def __init__(
             self,
             messagefrom,
@@ -33,208 +37,134 @@ class FranklinsMessageHeader(GenericMessageHeader):
             messagetype, messagefrom, messageto, nexthop, interfaceid, sequencenumber
         )
 
-class FranklinsPayload(GenericMessagePayload):
+class FranklinsPayload(RingMessagePayload):
     """
-    Franklins Algorithm uses messages with one field:
-    - id: The sending process id
+    Franklins Algorithm uses messages with three fields:
+    - id: The id of the active process that started the message
+    - election_round: The round the message belongs to
+    - direction: The Direction the message travels in
     """
-    def __init__(self, id, messagepayload=None):
+    __slots__ = ("id", "election_round", "direction")
+
+    def __init__(self, id, election_round=1, direction=Direction.clockwise, messagepayload=None):
         super().__init__(messagepayload)
         self.id = id
+        self.election_round = election_round
+        self.direction = direction
 
 
-class FranklinsNode(GenericModel):
+class FranklinsNode(RingElectionNode):
     """
     Node in a system that uses Franklins algorithm
-    Each process has three parameters:
-    - id: 1 <= i <= N where N is the ring size
-    - state: from State enum, active nodes participate in the election,
-    passive nodes pass messages around, leader is selected when the message
-    with the id of the node is arrived to the node itself
+    Each process has four parameters:
+    - id: 1 <= i <= N where N is the ring size, handed out by the run's
+    id_assigner (the component instance number when no assigner is set)
+    - state: from State enum, active nodes compare their id with the ids of
+    the nearest active nodes on both sides in every round, passive nodes pass
+    messages on in the direction they travel, leader is selected when both
+    messages of a node come back to itself
+    - election_round: current round of an active node, starts at 1
+    - received: messages an active node has received, by round and direction
     """
-
-    ring_size = 0
-    callback = None
-    draw_delay = None
-    global_round = 1
-    id_counter = 0
-
+    header_type = FranklinsMessageHeader
 
     def __init__(self, componentname, componentinstancenumber, context=None, configurationparameters=None, num_worker_threads=1, topology=None, child_conn=None, node_queues=None, channel_queues=None):
         super().__init__(componentname, componentinstancenumber, context, configurationparameters, num_worker_threads, topology, child_conn, node_queues, channel_queues)
 
-
-        """The component instance number will be used as a candidate leader process id"""
-        self.id = componentinstancenumber
-
         """Initially all processes are active"""
         self.state = State.active
 
-    def send_election_packet(self):
-        header_1 = FranklinsMessageHeader(
-            messagefrom=self.componentinstancenumber,
-            messageto=self.next_hop_1,
-            messagetype="Franklins Message",
-            nexthop=self.next_hop_1,
-            interfaceid=self.next_hop_interface_id
-
-        )
+        """Rounds start from 1"""
+        self.election_round = 1
 
-        payload_1 = FranklinsPayload(
-            self.id
-        )
-
-        header_2 = FranklinsMessageHeader(
-            messagefrom=self.componentinstancenumber,
-            messageto=self.next_hop_2,
-            messagetype="Franklins Message",
-            nexthop=self.next_hop_2,
-            interfaceid=self.next_hop_interface_id
-
-        )
-
-        payload_2 = FranklinsPayload(
-            self.id
-        )
+        """Events of the current and the next round, keyed by round, then by direction"""
+        self.received = {}
 
-        message = GenericMessage(header_1, payload_1)
-        self.send_down(Event(self, EventTypes.MFRT, message))
-        FranklinsNode.global_round += 1
-        message = GenericMessage(header_2, payload_2)
-        self.send_down(Event(self, EventTypes.MFRT, message))
-        FranklinsNode.global_round += 1
+    def send_election_packet(self):
+        for direction in Direction:
+            self.send_towards(direction, FranklinsPayload(self.id, self.election_round, direction))
 
     def on_init(self, eventobj: Event):
-        # Select an id for round 1
-        # self.id_p = randint(1, self.ring_size)
-        self.id_p = self.id_counter
-        self.id_counter += 1
-        print(
-            f"🤖 {self.componentinstancenumber} selected {self.id} as their ID."
-        )
+        self.assign_id()
 
-        # Calculate the neighbours, we're on a directed ring
-        self.neighbour_id_1 = (int(self.componentinstancenumber) + 1) % self.ring_size
-        self.neighbour_id_2 = (int(self.componentinstancenumber) - 1) % self.ring_size
+        # messages travel in both directions of the ring
+        self.setup_ring()
 
-        self.next_hop_1 = self.topology.get_next_hop(
-            self.componentinstancenumber, self.neighbour_id_1
-        )
-
-        self.next_hop_2 = self.topology.get_next_hop(
-            self.componentinstancenumber, self.neighbour_id_2
-        )
+        self.send_election_packet()
 
-        self.next_hop_interface_id = f"{self.componentinstancenumber}-{self.next_hop_1}-{self.next_hop_2}"
+    def pass_packet_along(self, eventobj: Event):
+        """For passive processes, relays the message in the direction it travels
 
-        if(self.id_p == 0):
-            self.send_election_packet()
-
-    
-    def pass_packet_along(self, message):
-        """For passive processes
-
-        :message: the whole Event, with eventcontent which includes header and
+        :eventobj: the whole Event, with eventcontent which includes header and
         payload
 
         """
-        pass
-
+        self.forward_towards(eventobj.eventcontent.payload.direction, eventobj)
 
     def on_message_from_bottom(self, eventobj: Event):
         """New message from """
         payload: FranklinsPayload = eventobj.eventcontent.payload
         header: FranklinsMessageHeader = eventobj.eventcontent.header
 
-        message_assumed_id = payload.id
-
-        # For active node, we are going to follow if/else chain
+        if not self.accept(eventobj):
+            return
 
         if self.state == State.passive:
-            # passive node, pass the message on to the next hop
-            # header will be updated
-            # payload will remain unchanged
-
-            header.messageto = self.next_hop_1
-            header.nexthop = self.next_hop_1
-            header.interfaceid = self.next_hop_interface_id
-
-            message_1 = GenericMessage(header, payload)
-            self.send_down(Event(self, EventTypes.MFRT, message_1))
-            FranklinsNode.global_round += 1
-
-            header.messageto = self.next_hop_2
-            header.nexthop = self.next_hop_2
-            header.interfaceid = self.next_hop_interface_id
-
-            message_2 = GenericMessage(header, payload)
-            self.send_down(Event(self, EventTypes.MFRT, message_2))
-            FranklinsNode.global_round += 1
-
-        elif self.state == State.active:
-
-            if message_assumed_id > self.id:
-                # Another node has a higher id than this node
-                # going passive
-
-                print(
-                    f"🤖 {self.componentinstancenumber} is PASSIVE: {message_assumed_id} is encountered, this node is at {self.id}"
-                )
-
-                self.state = State.passive
-                
-                header.messageto = self.next_hop_1
-                header.nexthop = self.next_hop_1
-                header.interfaceid = self.next_hop_interface_id
-
-                message_1 = GenericMessage(header, payload)
-                self.send_down(Event(self, EventTypes.MFRT, message_1))
-                FranklinsNode.global_round += 1
-
-                header.messageto = self.next_hop_2
-                header.nexthop = self.next_hop_2
-                header.interfaceid = self.next_hop_interface_id
-
-                message_2 = GenericMessage(header, payload)
-                self.send_down(Event(self, EventTypes.MFRT, message_2))
-                FranklinsNode.global_round += 1
-
-            elif message_assumed_id < self.id:
-                # This node has received a message with a lower assumed id
-                # So, this node can dismiss the election attempt of the sender node
-                # the message will be updated with this node's id
-
-                print(
-                    f"🤖 {self.componentinstancenumber} is dismissing {message_assumed_id} that is encountered. This node is at {self.id}"
-                )
-
-                payload.id = self.componentinstancenumber
-
-                header.messageto = self.next_hop_1
-                header.nexthop = self.next_hop_1
-                header.interfaceid = self.next_hop_interface_id
-
-                message_1 = GenericMessage(header, payload)
-                self.send_down(Event(self, EventTypes.MFRT, message_1))
-                FranklinsNode.global_round += 1
-
-                header.messageto = self.next_hop_2
-                header.nexthop = self.next_hop_2
-                header.interfaceid = self.next_hop_interface_id
-
-                message_2 = GenericMessage(header, payload)
-                self.send_down(Event(self, EventTypes.MFRT, message_2))
-                FranklinsNode.global_round += 1
-
-            elif(
-                message_assumed_id == self.id
-            ):
-                # This node is selected as leader
-                self.state = State.leader
-                print(
-                    f"🤖 {self.componentinstancenumber}: I'M THE ELECTED LEADER"
-                )
-
-        self.callback.set()
-        self.draw_delay.wait()
-        self.draw_delay.clear()
\ No newline at end of file
+            # passive node, pass the message on in the direction it travels
+            self.pass_packet_along(eventobj)
+
+        elif self.state == State.leader or payload.election_round < self.election_round:
+            # a stale round, the node has already decided on it
+            trace(self, TraceEventKind.dismissed, self.id, payload.id, self.election_round)
+            self.statistics.messages_dismissed += 1
+
+        else:
+            # channels are FIFO, so a message is at most one round ahead: the
+            # neighbour finished this round and the message waits for it
+            self.received.setdefault(payload.election_round, {})[payload.direction] = eventobj
+            current = self.received.get(self.election_round, {})
+            if len(current) == len(Direction):
+                self.end_round(current)
+
+        self.election_context.observer.on_message_handled(self)
+
+    def end_round(self, current):
+        """
+        Compares the id of this node with the ids of the nearest active nodes
+        on both sides, both messages of the current round have arrived
+        """
+        del self.received[self.election_round]
+        neighbour_ids = [eventobj.eventcontent.payload.id for eventobj in current.values()]
+        largest = max(neighbour_ids)
+
+        if largest > self.id:
+            # An active neighbour has a higher id than this node
+            # going passive
+            trace(self, TraceEventKind.passive, self.id, largest, self.election_round)
+            self.statistics.transition(self.state, State.passive)
+            self.state = State.passive
+
+            # messages of the next round were only held back for this node
+            for next_round in self.received.values():
+                for eventobj in next_round.values():
+                    self.pass_packet_along(eventobj)
+            self.received.clear()
+
+        elif largest == self.id:
+            # Both messages went all the way around, no other node is active
+            self.statistics.transition(self.state, State.leader)
+            self.state = State.leader
+            trace(self, TraceEventKind.leader, self.id, round=self.election_round)
+            self.election_context.observer.on_leader(self)
+
+        else:
+            # Both active neighbours have smaller ids, next round
+            self.election_round += 1
+            self.statistics.rounds = self.election_round
+            trace(self, TraceEventKind.new_round, self.id, round=self.election_round)
+            self.send_election_packet()
+
+            # the messages of the new round may have arrived already
+            current = self.received.get(self.election_round, {})
+            if len(current) == len(Direction):
+                self.end_round(current)
@@ -0,0 +1,208 @@
+from enum import Enum
+
+from adhoccomputing.Generics import *
+
+from ringelec.ElectionTrace import TraceEventKind, trace
+from ringelec.RingElectionNode import Direction, RingElectionNode, opposite
+from ringelec.RingMessages import RingMessageHeader, RingMessagePayload
+
+class State(Enum):
+    """
+    State of the nodes, one from {active, passive, leader}
+    - "active" nodes are candidates, probing twice as far every phase
+    - "passive" nodes have relayed a probe with a larger id and stop probing
+    - "leader" node has received its own probe, only one such node should be
+    present in the network
+    """
+
+    active = 1
+    passive = 2
+    leader = 3
+
+class MessageKind(Enum):
+    """
+    - "probe" travels away from its candidate, up to 2^phase hops
+    - "reply" travels back to the candidate from the last node of the probe
+    """
+
+    probe = 1
+    reply = 2
+
+class HirschbergSinclairMessageHeader(RingMessageHeader):
+    __slots__ = ()
+
+    def __init__(
+            self,
+            messagefrom,
+            messageto,
+            messagetype="Hirschberg Sinclair Message",
+            nexthop=float("inf"),
+            interfaceid=float("inf"),
+            sequencenumber=-1,
+    ):
+        super().__init__(
+            messagetype, messagefrom, messageto, nexthop, interfaceid, sequencenumber
+        )
+
+class HirschbergSinclairPayload(RingMessagePayload):
+    """
+    Hirschberg-Sinclair Algorithm uses messages with five fields:
+    - id: The id of the candidate that started the probe
+    - kind: probe or reply, see MessageKind
+    - phase: The phase of the candidate, a probe goes at most 2^phase hops
+    - hop_count: The number of hops the probe has made
+    - direction: The Direction the message travels in
+    """
+    __slots__ = ("id", "kind", "phase", "hop_count", "direction")
+
+    def __init__(self, id, kind=MessageKind.probe, phase=0, hop_count=1, direction=Direction.clockwise, messagepayload=None):
+        super().__init__(messagepayload)
+        self.id = id
+        self.kind = kind
+        self.phase = phase
+        self.hop_count = hop_count
+        self.direction = direction
+
+
+class HirschbergSinclairNode(RingElectionNode):
+    """
+    Node in a system that uses the Hirschberg-Sinclair algorithm on an
+    undirected ring
+    Each process has four parameters:
+    - id: 1 <= i <= N where N is the ring size, handed out by the run's
+    id_assigner (the component instance number when no assigner is set)
+    - state: from State enum, active nodes probe both sides with doubling
+    distances, passive nodes relay, leader is selected when a probe comes
+    back to its candidate
+    - phase: current phase of an active node, starts at 0
+    - replies: directions the replies of the current phase came back from
+    """
+    header_type = HirschbergSinclairMessageHeader
+
+    def __init__(self, componentname, componentinstancenumber, context=None, configurationparameters=None, num_worker_threads=1, topology=None, child_conn=None, node_queues=None, channel_queues=None):
+        super().__init__(componentname, componentinstancenumber, context, configurationparameters, num_worker_threads, topology, child_conn, node_queues, channel_queues)
+
+        """Initially all processes are active"""
+        self.state = State.active
+
+        """Phases start from 0"""
+        self.phase = 0
+
+        """Replies of the current phase, by the direction they came back from"""
+        self.replies = set()
+
+        """Messages this node sent for the probes of each phase"""
+        self.messages_per_phase = {}
+
+    def count_message(self, phase):
+        self.messages_per_phase[phase] = self.messages_per_phase.get(phase, 0) + 1
+
+    def send_probes(self):
+        for direction in Direction:
+            self.send_towards(direction, HirschbergSinclairPayload(self.id, MessageKind.probe, self.phase, 1, direction))
+            self.count_message(self.phase)
+
+    def pass_packet_along(self, eventobj: Event, direction: Direction):
+        """Relays the message to the next hop in the given direction"""
+        eventobj.eventcontent.payload.direction = direction
+        self.forward_towards(direction, eventobj)
+
+    def on_init(self, eventobj: Event):
+        self.assign_id()
+
+        # messages travel in both directions of the ring
+        self.setup_ring()
+
+        self.send_probes()
+
+    def on_message_from_bottom(self, eventobj: Event):
+        """New message from """
+        payload: HirschbergSinclairPayload = eventobj.eventcontent.payload
+        header: HirschbergSinclairMessageHeader = eventobj.eventcontent.header
+
+        if not self.accept(eventobj):
+            return
+
+        if payload.kind == MessageKind.reply:
+            self.on_reply(eventobj)
+        else:
+            self.on_probe(eventobj)
+
+        self.election_context.observer.on_message_handled(self)
+
+    def on_probe(self, eventobj: Event):
+        payload: HirschbergSinclairPayload = eventobj.eventcontent.payload
+
+        if payload.id == self.id:
+            if self.state == State.active:
+                # The probe went all the way around the ring
+                self.statistics.transition(self.state, State.leader)
+                self.state = State.leader
+                trace(self, TraceEventKind.leader, self.id, round=self.phase + 1)
+                self.election_context.observer.on_leader(self)
+            else:
+                # the probe of the other direction, the node is already elected
+                self.statistics.messages_dismissed += 1
+
+        elif payload.id < self.id:
+            # The candidate can not win against this node, swallow its probe
+            trace(self, TraceEventKind.dismissed, self.id, payload.id, payload.phase + 1)
+            self.statistics.messages_dismissed += 1
+
+        else:
+            if self.state == State.active:
+                # A candidate with a larger id reached this node
+                # going passive
+                trace(self, TraceEventKind.passive, self.id, payload.id, self.phase + 1)
+                self.statistics.transition(self.state, State.passive)
+                self.state = State.passive
+
+            if payload.hop_count < 1 << payload.phase:
+                # the probe has hops left, pass it on
+                payload.hop_count += 1
+                self.pass_packet_along(eventobj, payload.direction)
+                self.count_message(payload.phase)
+            else:
+                # last node of the probe, send it back as the reply
+                payload.kind = MessageKind.reply
+                self.pass_packet_along(eventobj, opposite(payload.direction))
+                self.count_message(payload.phase)
+
+    def on_reply(self, eventobj: Event):
+        payload: HirschbergSinclairPayload = eventobj.eventcontent.payload
+
+        if payload.id != self.id:
+            # passing the reply back to its candidate
+            self.pass_packet_along(eventobj, payload.direction)
+            self.count_message(payload.phase)
+
+        elif self.state == State.active:
+            # a reply travels opposite to the direction its probe went in
+            self.replies.add(payload.direction)
+            if len(self.replies) == len(Direction):
+                # No larger id within 2^phase hops on either side, next phase
+                self.replies.clear()
+                self.phase += 1
+                self.statistics.rounds = self.phase + 1
+                trace(self, TraceEventKind.new_round, self.id, round=self.phase + 1)
+                self.send_probes()
+
+        else:
+            # a larger candidate has already reached this node
+            self.statistics.messages_dismissed += 1
+
+
+def phase_statistics(topology):
+    """
+    Sums the messages sent for each phase over the HirschbergSinclairNodes of a topology.
+
+    Returns
+    --------
+    dict
+        Number of messages, by phase, in phase order.
+    """
+    phases = {}
+    for node in topology.nodes.values():
+        for phase, messages in node.messages_per_phase.items():
+            phases[phase] = phases.get(phase, 0) + messages
+    return dict(sorted(phases.items()))
@@ -0,0 +1,92 @@
+"""
+Reproducible id assignment for ring election runs.
+
+The ids of a ring are a permutation of 1..N computed once, up front, from a
+named layout and a seed. Nodes look their id up by ring position in O(1).
+"""
+
+from enum import Enum
+
+import numpy as np
+
+
+class IdLayout(Enum):
+    """
+    Arrangement of the ids along the ring, position i + 1 follows position i
+    - "ascending": ids grow along the ring, the best case for Chang-Roberts
+    - "descending": ids shrink along the ring, the worst case for Chang-Roberts
+    - "random": a seeded random permutation
+    - "adversarial": bit-reversal order, every round of a round-based election
+      (Franklin, Peterson) only knocks out half of the active nodes
+    """
+
+    ascending = "ascending"
+    descending = "descending"
+    random = "random"
+    adversarial = "adversarial"
+
+
+def ring_ids(ring_size: int, layout: IdLayout = IdLayout.random, seed=None) -> np.ndarray:
+    """
+    Computes the ids of a ring.
+
+    Parameters
+    -----------
+    ring_size: int
+        Number of nodes on the ring.
+    layout: IdLayout
+        Arrangement of the ids along the ring.
+    seed: int
+        Seed of the random layout, ignored by the others.
+
+    Returns
+    --------
+    numpy.ndarray
+        The id of every ring position, a permutation of 1..ring_size.
+    """
+    layout = IdLayout(layout)
+    if layout == IdLayout.ascending:
+        return np.arange(1, ring_size + 1)
+    if layout == IdLayout.descending:
+        return np.arange(ring_size, 0, -1)
+    if layout == IdLayout.random:
+        return np.random.default_rng(seed).permutation(ring_size) + 1
+
+    # Bit-reversal order of the next power of two, keeping the ranks that fit
+    bits = max(1, int(ring_size - 1).bit_length())
+    ranks = np.arange(1 << bits)
+    reversed_ranks = np.zeros_like(ranks)
+    for bit in range(bits):
+        reversed_ranks |= ((ranks >> bit) & 1) << (bits - 1 - bit)
+    return reversed_ranks[reversed_ranks < ring_size] + 1
+
+
+class IdAssigner:
+    """
+    Hands out the precomputed ids of a ring by position.
+
+    One assigner is shared by every node of a run; it is never written to after
+    construction, so nodes may read it from their own threads.
+    """
+
+    def __init__(self, ring_size: int, layout: IdLayout = IdLayout.random, seed=None):
+        """
+        Parameters
+        -----------
+        ring_size: int
+            Number of nodes on the ring.
+        layout: IdLayout
+            Arrangement of the ids along the ring.
+        seed: int
+            Seed of the random layout, ignored by the others.
+        """
+        self.ring_size = ring_size
+        self.layout = IdLayout(layout)
+        self.seed = seed
+        self.ids: list[int] = ring_ids(ring_size, self.layout, seed).tolist()
+
+    def id_for(self, position: int) -> int:
+        """
+        Returns the id of the node at the given ring position (component instance number).
+        """
+        return self.ids[int(position)]
@@ -0,0 +1,149 @@
+from enum import Enum
+
+from adhoccomputing.Generics import *
+
+from ringelec.ElectionTrace import TraceEventKind, trace
+from ringelec.RingElectionNode import RingElectionNode
+from ringelec.RingMessages import RingMessageHeader, RingMessagePayload
+
+class State(Enum):
+    """
+    State of the nodes, one from {active, passive, leader}
+    - "active" nodes are initiators, attempting to become a leader
+    - "passive" nodes have met a larger id on their active predecessor and
+    only relay messages from then on
+    - "leader" node has received its own id, only one such node should be
+    present in the network
+    """
+
+    active = 1
+    passive = 2
+    leader = 3
+
+class Parity(Enum):
+    """
+    Every round an active node sends two messages
+    - "one" carries the id of the node itself
+    - "two" carries the id the node received from its active predecessor
+    """
+
+    one = 1
+    two = 2
+
+class PetersonMessageHeader(RingMessageHeader):
+    __slots__ = ()
+
+    def __init__(
+            self,
+            messagefrom,
+            messageto,
+            messagetype="Peterson Message",
+            nexthop=float("inf"),
+            interfaceid=float("inf"),
+            sequencenumber=-1,
+    ):
+        super().__init__(
+            messagetype, messagefrom, messageto, nexthop, interfaceid, sequencenumber
+        )
+
+class PetersonPayload(RingMessagePayload):
+    """
+    Peterson's Algorithm uses messages with three fields:
+    - id: The id carried by the message
+    - election_round: The round of the sending active node
+    - parity: The Parity of the message within the round
+    """
+    __slots__ = ("id", "election_round", "parity")
+
+    def __init__(self, id, election_round=1, parity=Parity.one, messagepayload=None):
+        super().__init__(messagepayload)
+        self.id = id
+        self.election_round = election_round
+        self.parity = parity
+
+
+class PetersonNode(RingElectionNode):
+    """
+    Node in a system that uses Peterson's (Dolev-Klawe-Rodeh) algorithm on a
+    directed ring
+    Each process has four parameters:
+    - id: 1 <= i <= N where N is the ring size, handed out by the run's
+    id_assigner (the component instance number when no assigner is set). An
+    active node takes over the id of its active predecessor when that id is
+    a local maximum, so the leader ends up with the largest id
+    - state: from State enum, active nodes compare the ids of their two
+    nearest active predecessors with their own every round, passive nodes pass
+    messages on, leader is selected when a node receives its own id
+    - election_round: current round of an active node, starts at 1
+    - neighbour_id: the id received in the "one" message of the current round
+    """
+    header_type = PetersonMessageHeader
+
+    def __init__(self, componentname, componentinstancenumber, context=None, configurationparameters=None, num_worker_threads=1, topology=None, child_conn=None, node_queues=None, channel_queues=None):
+        super().__init__(componentname, componentinstancenumber, context, configurationparameters, num_worker_threads, topology, child_conn, node_queues, channel_queues)
+
+        """Initially all processes are active"""
+        self.state = State.active
+
+        """Rounds start from 1"""
+        self.election_round = 1
+
+        """Id of the nearest active predecessor, set by the "one" message of a round"""
+        self.neighbour_id = None
+
+    def send_election_packet(self, id, parity: Parity):
+        self.send_cw(PetersonPayload(id, self.election_round, parity))
+
+    def on_init(self, eventobj: Event):
+        self.assign_id()
+
+        # we're on a directed ring, messages only travel clockwise
+        self.setup_ring()
+
+        self.send_election_packet(self.id, Parity.one)
+
+    def on_message_from_bottom(self, eventobj: Event):
+        """New message from """
+        payload: PetersonPayload = eventobj.eventcontent.payload
+        header: PetersonMessageHeader = eventobj.eventcontent.header
+
+        if not self.accept(eventobj):
+            return
+
+        if self.state == State.passive:
+            # passive node, pass the message on to the next hop
+            self.forward_cw(eventobj)
+
+        elif self.state == State.active:
+            # channels are FIFO and there is one incoming link, so an active
+            # node receives the "one" and "two" messages of its round in order
+
+            if payload.parity == Parity.one and payload.id == self.id:
+                # The id went all the way around, no other node is active
+                self.statistics.transition(self.state, State.leader)
+                self.state = State.leader
+                trace(self, TraceEventKind.leader, self.id, round=self.election_round)
+                self.election_context.observer.on_leader(self)
+
+            elif payload.parity == Parity.one:
+                # Id of the active predecessor, pass it on to the active successor
+                self.neighbour_id = payload.id
+                self.send_election_packet(payload.id, Parity.two)
+
+            elif self.neighbour_id > max(self.id, payload.id):
+                # The active predecessor holds a local maximum, this node
+                # carries it into the next round
+                self.id = self.neighbour_id
+                self.election_round += 1
+                self.statistics.rounds = self.election_round
+                trace(self, TraceEventKind.new_round, self.id, round=self.election_round)
+                self.send_election_packet(self.id, Parity.one)
+
+            else:
+                # The id of the active predecessor is not a local maximum
+                # going passive
+                trace(self, TraceEventKind.passive, self.id, self.neighbour_id, self.election_round)
+                self.statistics.transition(self.state, State.passive)
+                self.state = State.passive
+
+        self.election_context.observer.on_message_handled(self)
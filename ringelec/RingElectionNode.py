@@ -0,0 +1,337 @@
+"""
+Shared ring setup and forwarding of the ring election nodes.
+
+The routes of a ring (the next hop towards both neighbours of every position)
+are computed once per topology, in a single O(N) pass over the ring, and
+shared by every node. `RingElectionNode` looks its own routes up in on_init
+and provides the flat per-message primitives `send_cw`/`send_ccw` and
+`forward_cw`/`forward_ccw`. A ring link between positions that are not
+neighbours in the graph is routed over several physical hops; the nodes in
+between relay the message without handing it to the election, see
+`RingElectionNode.accept`.
+"""
+
+import sys
+import threading
+from enum import Enum
+
+import networkx as nx
+import numpy as np
+from adhoccomputing.Experimentation.Topology import Topology
+from adhoccomputing.GenericModel import GenericModel, GenericMessage
+from adhoccomputing.Generics import *
+
+from ringelec.ElectionObserver import ElectionObserver
+from ringelec.ElectionStatistics import ElectionStatistics
+from ringelec.ElectionTrace import TraceEventKind, TraceRecorder, trace
+from ringelec.IdAssignment import IdAssigner
+from ringelec.RingMessages import channel_to, forward, send
+
+
+class Direction(Enum):
+    """
+    Direction a message travels along the ring
+    - "clockwise" messages go from position i to i + 1, the only direction of
+    a directed ring
+    - "counterclockwise" messages go from position i to i - 1
+    """
+
+    clockwise = 1
+    counterclockwise = 2
+
+
+def opposite(direction: Direction) -> Direction:
+    """
+    Returns the other direction along the ring.
+    """
+    if direction == Direction.clockwise:
+        return Direction.counterclockwise
+    return Direction.clockwise
+
+
+class RingRoutes:
+    """
+    Ring neighbours and next hops of every ring position, in both directions.
+
+    Positions are the component instance numbers 0..N-1. Position i + 1 is the
+    clockwise neighbour of i, unless the topology has a `ring_embedding` (see
+    `ringelec.RingEmbedding`), whose order is used instead. Positions left out
+    of that order, e.g. crashed nodes (see `ringelec.Failover`), have no
+    neighbours and are marked -1. Where the graph has
+    the edge to a neighbour the neighbour is the next hop; other links follow a
+    shortest path, and `relays` holds the next hop of every node on the way.
+    """
+
+    def __init__(self, topology, ring_size: int):
+        self.ring_size = ring_size
+        embedding = getattr(topology, "ring_embedding", None)
+        order = np.asarray(embedding.order) if embedding is not None else np.arange(ring_size)
+
+        # ring neighbours of every position
+        self.neighbours = {}
+        for direction, shift in ((Direction.clockwise, -1), (Direction.counterclockwise, 1)):
+            neighbours = np.full(ring_size, -1, dtype=np.int64)
+            neighbours[order] = np.roll(order, shift)
+            self.neighbours[direction] = neighbours.tolist()
+
+        # successors of every node, for directed and undirected graphs alike
+        adjacency = topology.G._adj
+        self.next_hops = {}
+        self.relays = {}
+        for direction, neighbours in self.neighbours.items():
+            next_hops = list(neighbours)
+            for position, neighbour in enumerate(neighbours):
+                if neighbour >= 0 and neighbour not in adjacency[position]:
+                    if embedding is not None:
+                        path = embedding.path(position, neighbour)
+                    else:
+                        path = nx.shortest_path(topology.G, position, neighbour)
+                    next_hops[position] = path[1]
+                    # every path is a shortest one, so any relay entry
+                    # towards a destination leads there
+                    for relay, next_hop in zip(path[1:-1], path[2:]):
+                        self.relays.setdefault(relay, {})[neighbour] = next_hop
+            self.next_hops[direction] = next_hops
+
+    def interface_id(self, direction: Direction, position: int) -> str:
+        """
+        Returns the interned interface id of the link from the position to its next hop in the direction.
+        """
+        return sys.intern(f"{position}-{self.next_hops[direction][position]}")
+
+
+_routes_lock = threading.Lock()
+
+
+def ring_routes(topology, ring_size: int) -> RingRoutes:
+    """
+    Returns the routes of the ring, computing them on the first call for the topology.
+    """
+    routes = getattr(topology, "ring_routes", None)
+    if routes is None or routes.ring_size != ring_size:
+        with _routes_lock:
+            routes = getattr(topology, "ring_routes", None)
+            if routes is None or routes.ring_size != ring_size:
+                routes = RingRoutes(topology, ring_size)
+                topology.ring_routes = routes
+    return routes
+
+
+class ElectionContext:
+    """
+    Settings and shared objects of one election run.
+
+    The nodes of a topology read them from the context of their topology
+    instead of their class, so elections with different settings run side by
+    side in one process. A context holds the `context_attributes` of a node
+    class (`ring_size`, `observer`, `id_assigner` and `trace_recorder`, plus
+    `seed` and `id_space` for the Itai-Rodeh nodes); those not given are
+    copied from the class attributes, which remain the defaults.
+    """
+
+    def __init__(self, node_type, **attributes):
+        """
+        Parameters
+        -----------
+        node_type: type
+            The RingElectionNode subclass of the run.
+        attributes:
+            Values of the node class' context attributes for this run.
+        """
+        self.node_type = node_type
+        for name in node_type.context_attributes:
+            setattr(self, name, attributes.pop(name, getattr(node_type, name)))
+        if attributes:
+            raise TypeError(f"{node_type.__name__} has no context attribute {', '.join(attributes)}")
+
+
+def election_context(topology, node_type) -> ElectionContext:
+    """
+    Returns the election context of the topology. A topology without one gets
+    a context of the node class' current attributes, the way runs were
+    configured before contexts existed.
+    """
+    context = getattr(topology, "election_context", None)
+    if context is None:
+        context = ElectionContext(node_type)
+        if topology is not None:
+            topology.election_context = context
+    return context
+
+
+class RingTopology(Topology):
+    """
+    Topology for ring elections.
+
+    construct_from_graph computes the all-pairs shortest paths of the graph,
+    O(N^2) time and memory for a ring. The ring nodes route with RingRoutes,
+    so this topology skips the table and answers get_next_hop from a single
+    shortest path when a route needs it.
+
+    Unlike Topology, it keeps its nodes and channels per instance, and the
+    nodes take their settings from its `election_context`.
+    """
+
+    def __init__(self, name=None, election_context: ElectionContext = None):
+        """
+        Parameters
+        -----------
+        election_context: ElectionContext
+            Settings of the election, from the node class attributes by default.
+        """
+        super().__init__(name)
+        self.nodes = {}
+        self.channels = {}
+        self.election_context = election_context
+
+    def compute_forwarding_table(self):
+        self.ForwardingTable = None
+
+    def get_next_hop(self, fromId, toId):
+        if self.ForwardingTable is not None:
+            return super().get_next_hop(fromId, toId)
+        try:
+            path = nx.shortest_path(self.G, fromId, toId)
+        except (nx.NetworkXNoPath, nx.NodeNotFound):
+            return float("inf")
+        return path[1] if len(path) > 1 else fromId
+
+
+class RingElectionNode(GenericModel):
+    """
+    Base class of the ring election nodes
+
+    Subclasses set `header_type` to their message header class, call
+    `setup_ring` from on_init, then send with `send_cw`/`send_ccw` and relay
+    with `forward_cw`/`forward_ccw`. After setup_ring a node has
+    - neighbours: the ring neighbours, keyed by Direction
+    - next_hops, next_hop_interface_ids, next_hop_channels: keyed by Direction
+    - next_hop, next_hop_interface_id, next_hop_channel: the clockwise ones,
+    for the directed ring algorithms
+    On a ring embedded in another graph the next hop may be a relay, the
+    message is addressed to the ring neighbour.
+
+    The settings of a run are in `election_context`, see ElectionContext;
+    the class attributes listed in `context_attributes` are their defaults.
+    """
+
+    ring_size = 0
+    observer = ElectionObserver()
+    id_assigner: IdAssigner | None = None
+    trace_recorder: TraceRecorder | None = None
+    context_attributes = ("ring_size", "observer", "id_assigner", "trace_recorder")
+    header_type = None
+
+    def __init__(self, componentname, componentinstancenumber, context=None, configurationparameters=None, num_worker_threads=1, topology=None, child_conn=None, node_queues=None, channel_queues=None):
+        super().__init__(componentname, componentinstancenumber, context, configurationparameters, num_worker_threads, topology, child_conn, node_queues, channel_queues)
+
+        """The component instance number will be used as a candidate leader process id"""
+        self.id = componentinstancenumber
+
+        """Message and state accounting of this node, only its worker thread updates it"""
+        self.statistics = ElectionStatistics()
+
+        """Channels towards the next hops of the messages this node relays"""
+        self.relay_channels = {}
+
+        """Settings of the run, shared by the nodes of the topology"""
+        self.election_context = election_context(topology, type(self))
+
+    def assign_id(self):
+        """
+        Takes the id of this ring position from the run's id_assigner, if there is one.
+        """
+        id_assigner = self.election_context.id_assigner
+        if id_assigner is not None:
+            self.id = id_assigner.id_for(self.componentinstancenumber)
+        trace(self, TraceEventKind.selected_id, self.id)
+
+    def setup_ring(self):
+        """
+        Looks up the next hops of this node in the routes of the ring.
+        """
+        routes = ring_routes(self.topology, self.election_context.ring_size)
+        position = int(self.componentinstancenumber)
+        self.neighbours = {}
+        self.next_hops = {}
+        self.next_hop_interface_ids = {}
+        self.next_hop_channels = {}
+        for direction in Direction:
+            self.neighbours[direction] = routes.neighbours[direction][position]
+            next_hop = routes.next_hops[direction][position]
+            self.next_hops[direction] = next_hop
+            self.next_hop_interface_ids[direction] = routes.interface_id(direction, position)
+            self.next_hop_channels[direction] = channel_to(self, next_hop)
+
+        self.next_hop = self.next_hops[Direction.clockwise]
+        self.next_hop_interface_id = self.next_hop_interface_ids[Direction.clockwise]
+        self.next_hop_channel = self.next_hop_channels[Direction.clockwise]
+
+    def is_next_hop(self, header) -> bool:
+        """
+        A broadcast by send_down reaches every neighbour of the sender, only
+        the next hop of the message handles it.
+        """
+        return header.nexthop == self.componentinstancenumber
+
+    def accept(self, eventobj: Event) -> bool:
+        """
+        True if the election should handle the message. A message this node
+        only relays on a multi-hop ring link is passed on towards its ring
+        neighbour instead.
+        """
+        header = eventobj.eventcontent.header
+        if not self.is_next_hop(header):
+            return False
+        if header.messageto == self.componentinstancenumber:
+            return True
+        self.relay(eventobj)
+        return False
+
+    def relay(self, eventobj: Event):
+        """
+        Passes a message on along the route of its ring link.
+        """
+        # a relay may arrive before on_init, look the route up from the topology
+        destination = eventobj.eventcontent.header.messageto
+        routes = ring_routes(self.topology, self.election_context.ring_size)
+        next_hop = routes.relays[self.componentinstancenumber][destination]
+        channel = self.relay_channels.get(next_hop)
+        if channel is None:
+            channel = self.relay_channels[next_hop] = channel_to(self, next_hop)
+        forward(self, eventobj, next_hop, sys.intern(f"{self.componentinstancenumber}-{next_hop}"), channel, destination)
+        self.statistics.messages_relayed += 1
+
+    def send_towards(self, direction: Direction, payload):
+        """
+        Sends a new message with the payload to the next hop in the direction.
+        """
+        next_hop = self.next_hops[direction]
+        header = self.header_type(
+            messagefrom=self.componentinstancenumber,
+            messageto=self.neighbours[direction],
+            nexthop=next_hop,
+            interfaceid=self.next_hop_interface_ids[direction]
+        )
+        send(self, Event(self, EventTypes.MFRT, GenericMessage(header, payload)), self.next_hop_channels[direction])
+        self.statistics.messages_sent += 1
+
+    def send_cw(self, payload):
+        self.send_towards(Direction.clockwise, payload)
+
+    def send_ccw(self, payload):
+        self.send_towards(Direction.counterclockwise, payload)
+
+    def forward_towards(self, direction: Direction, eventobj: Event):
+        """
+        Relays the incoming message to the next hop in the direction, reusing its event, see `forward`.
+        """
+        forward(self, eventobj, self.next_hops[direction], self.next_hop_interface_ids[direction], self.next_hop_channels[direction], self.neighbours[direction])
+        self.statistics.messages_sent += 1
+        self.statistics.messages_forwarded += 1
+
+    def forward_cw(self, eventobj: Event):
+        self.forward_towards(Direction.clockwise, eventobj)
+
+    def forward_ccw(self, eventobj: Event):
+        self.forward_towards(Direction.counterclockwise, eventobj)
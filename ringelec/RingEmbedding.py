@@ -0,0 +1,139 @@
+"""
+Embedding of the logical ring of an election into an arbitrary topology.
+
+The ring election nodes send to their ring successor, position i + 1 by
+default. On a graph other than a cycle such a link can span several physical
+hops, every one of them a relay. `RingEmbedding` orders the positions along a
+short closed walk of the graph instead: the preorder of a depth-first spanning
+tree (the classic tree-doubling approximation of a Hamiltonian cycle), shortened
+with 2-opt moves on the hop distances for graphs small enough to hold them.
+Attach it with `embed_ring` before the topology starts, RingRoutes takes the
+successors and the relay routes from it.
+"""
+
+import networkx as nx
+import numpy as np
+
+
+def tree_preorder(graph, root=0):
+    """
+    Returns the nodes of a connected graph in the preorder of a depth-first
+    spanning tree, consecutive nodes are at most their tree distance apart.
+    """
+    return list(nx.dfs_preorder_nodes(graph, root))
+
+
+def hop_distances(graph):
+    """
+    Returns the matrix of the hop distances between every pair of nodes 0..N-1.
+    """
+    n = graph.number_of_nodes()
+    distances = np.zeros((n, n), dtype=np.int32)
+    for source, lengths in nx.all_pairs_shortest_path_length(graph):
+        distances[source, list(lengths.keys())] = list(lengths.values())
+    return distances
+
+
+def two_opt(order, distances, max_passes=50):
+    """
+    Shortens the closed tour `order` with 2-opt moves: replacing the links
+    (a, b) and (c, d) with (a, c) and (b, d) and reversing the tour between them.
+
+    Parameters
+    -----------
+    order: list
+        Nodes in tour order.
+    distances: numpy.ndarray
+        Hop distances between the nodes, see `hop_distances`.
+    max_passes: int
+        Passes over the tour after which the search stops, even if a move is left.
+
+    Returns
+    --------
+    list
+        The shortened tour, starting with the same node.
+    """
+    order = np.asarray(order)
+    n = order.size
+    for _ in range(max_passes):
+        improved = False
+        for i in range(n - 2):
+            a, b = order[i], order[i + 1]
+            # the first link must not be paired with the closing link, they share a
+            j = np.arange(i + 2, n if i > 0 else n - 1)
+            c, d = order[j], order[(j + 1) % n]
+            gain = distances[a, b] + distances[c, d] - distances[a, c] - distances[b, d]
+            best = int(np.argmax(gain))
+            if gain[best] > 0:
+                order[i + 1:j[best] + 1] = order[i + 1:j[best] + 1][::-1].copy()
+                improved = True
+        if not improved:
+            break
+    return order.tolist()
+
+
+class RingEmbedding:
+    """
+    Ring order of the positions (component instance numbers 0..N-1) of a graph
+    - order: positions in ring order, order[k + 1] is the clockwise successor of order[k]
+    - link_hops: physical hops of the link from order[k] to its successor
+    - total_hops: physical hops of one message around the whole ring
+    - stretch: average physical hops of a ring link, 1 on a Hamiltonian cycle
+    """
+
+    max_improve_size = 1000
+
+    def __init__(self, graph, order=None, improve=True):
+        """
+        Parameters
+        -----------
+        graph: networkx.Graph
+            Connected undirected graph with the nodes 0..N-1.
+        order: list
+            Ring order to use as is, computed from the graph when None.
+        improve: bool
+            Run 2-opt on the computed order, only up to `max_improve_size` nodes.
+        """
+        if graph.is_directed():
+            raise ValueError("ring embedding needs an undirected graph")
+        if not nx.is_connected(graph):
+            raise ValueError("ring embedding needs a connected graph")
+        self.graph = graph
+        if order is None:
+            order = tree_preorder(graph)
+            if improve and graph.number_of_nodes() <= self.max_improve_size:
+                order = two_opt(order, hop_distances(graph))
+        self.order = [int(position) for position in order]
+        if sorted(self.order) != list(range(graph.number_of_nodes())):
+            raise ValueError("ring order must hold every node 0..N-1 once")
+
+        self._paths = {}
+        successors = self.order[1:] + self.order[:1]
+        self.link_hops = np.array([len(self.path(u, v)) - 1 for u, v in zip(self.order, successors)], dtype=np.int64)
+        self.total_hops = int(self.link_hops.sum())
+        self.stretch = self.total_hops / len(self.order)
+
+    def path(self, source, destination):
+        """
+        Returns a shortest path of the graph from source to destination, both ends included.
+        """
+        key = (source, destination)
+        path = self._paths.get(key)
+        if path is None:
+            reverse = self._paths.get((destination, source))
+            path = reverse[::-1] if reverse is not None else nx.shortest_path(self.graph, source, destination)
+            self._paths[key] = path
+        return path
+
+    def __str__(self) -> str:
+        return f"RingEmbedding: NODES: {len(self.order)} HOPS: {self.total_hops} STRETCH: {self.stretch:.2f}"
+
+
+def embed_ring(topology, order=None, improve=True) -> RingEmbedding:
+    """
+    Embeds the ring into the graph of the topology, the ring election nodes
+    route along it. Must be called before the topology starts.
+    """
+    topology.ring_embedding = RingEmbedding(topology.G, order, improve)
+    topology.ring_routes = None
+    return topology.ring_embedding
@@ -0,0 +1,105 @@
+"""
+Slotted message classes and the allocation-free forwarding path shared by the
+ring election nodes.
+
+RingMessageHeader and RingMessagePayload keep the attributes of
+GenericMessageHeader and GenericMessagePayload, but in __slots__, so a message
+costs two small fixed-size objects instead of two objects with a dictionary
+each. `forward` relays an incoming message by rewriting its header in place
+and re-sending the same Event, which saves the GenericMessage and Event a
+passive node used to allocate on every hop.
+"""
+
+from adhoccomputing.Generics import *
+
+
+class RingMessageHeader:
+    """
+    Drop-in replacement of GenericMessageHeader without a per-instance dictionary.
+    Subclasses must declare `__slots__ = ()` (or their extra fields) to stay slotted.
+    """
+
+    __slots__ = ("messagetype", "messagefrom", "messageto", "nexthop", "interfaceid", "sequencenumber")
+
+    def __init__(self, messagetype, messagefrom, messageto, nexthop=float("inf"), interfaceid=float("inf"), sequencenumber=-1):
+        self.messagetype = messagetype
+        self.messagefrom = messagefrom
+        self.messageto = messageto
+        self.nexthop = nexthop
+        self.interfaceid = interfaceid
+        self.sequencenumber = sequencenumber
+
+    def __str__(self) -> str:
+        return f"RingMessageHeader: TYPE: {self.messagetype} FROM: {self.messagefrom} TO: {self.messageto} NEXTHOP: {self.nexthop} INTERFACEID: {self.interfaceid} SEQUENCE#: {self.sequencenumber}"
+
+
+class RingMessagePayload:
+    """
+    Drop-in replacement of GenericMessagePayload without a per-instance dictionary.
+    Subclasses must declare their fields in `__slots__`.
+    """
+
+    __slots__ = ("messagepayload",)
+
+    def __init__(self, messagepayload=None):
+        self.messagepayload = messagepayload
+
+
+def channel_to(node, next_hop):
+    """
+    Returns the DOWN channel of the node that connects it to next_hop, None if
+    there is no such channel (e.g. the node talks over multiprocessing queues).
+
+    send_down hands an event to every channel of a node, and receivers rewrite
+    the header in place, so a message must only be given to the channel of its
+    next hop.
+    """
+    endpoints = {str(node.componentinstancenumber), str(next_hop)}
+    for channel in node.connectors.get(ConnectorTypes.DOWN, []):
+        if set(str(channel.componentinstancenumber).split("-")) == endpoints:
+            return channel
+    return None
+
+
+def send(node, event: Event, channel=None):
+    """
+    Sends the event on the given channel, or with send_down when there is none.
+    """
+    if channel is not None:
+        channel.trigger_event(event)
+    else:
+        node.send_down(event)
+
+
+def forward(node, eventobj: Event, next_hop, interface_id, channel=None, message_to=None):
+    """
+    Relays the message carried by eventobj to next_hop, reusing the incoming
+    Event, GenericMessage, header and payload. The caller must not touch the
+    message after forwarding it.
+
+    Parameters
+    -----------
+    node: GenericModel
+        The node relaying the message.
+    eventobj: Event
+        The event the message arrived with.
+    next_hop:
+        Component instance number of the next hop.
+    interface_id: str
+        Interface id of the link to the next hop.
+    channel: GenericModel
+        The channel to the next hop, see `channel_to`.
+    message_to:
+        Component instance number the message is addressed to, the next hop by default.
+    """
+    header = eventobj.eventcontent.header
+    header.messageto = next_hop if message_to is None else message_to
+    header.nexthop = next_hop
+    header.interfaceid = interface_id
+
+    eventobj.event = EventTypes.MFRT
+    eventobj.eventsource = node
+    eventobj.eventsource_componentname = node.componentname
+    eventobj.eventsource_componentinstancenumber = node.componentinstancenumber
+    eventobj.fromchannel = None
+    send(node, eventobj, channel)
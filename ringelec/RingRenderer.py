@@ -0,0 +1,216 @@
+"""
+Incremental matplotlib renderer of a ring election.
+
+The visual scripts used to recompute the circular layout and the label
+positions, redraw the whole graph and clear the figure for every frame.
+`RingRenderer` lays the ring out and creates its artists once; a frame only
+sets the face colours of the nodes and the counter text, and blits them over
+the saved background when the canvas supports it. Labels are part of the
+background, they rarely change (ids are fixed, Itai-Rodeh draws new ones once
+a round) and a frame in which one does is redrawn in full.
+Paired with a `SamplingObserver`, the nodes never wait for the display: all
+messages handled between two frames show up in the next one, so rings of
+hundreds of nodes can be watched in real time.
+"""
+
+import time
+
+import matplotlib.pyplot as plt
+import networkx as nx
+import numpy as np
+from matplotlib.colors import to_rgba
+
+from ringelec.ElectionStatistics import topology_statistics
+
+ACTIVE_NODE_COLOUR = "#ff0000"
+PASSIVE_NODE_COLOUR = "#e0e0e0"
+LEADER_NODE_COLOUR = "#ff00ff"
+EDGE_COLOUR = "#1a1c20"
+
+STATE_COLOURS = {
+    "active": ACTIVE_NODE_COLOUR,
+    "passive": PASSIVE_NODE_COLOUR,
+    "leader": LEADER_NODE_COLOUR,
+}
+
+
+def messages_counter(topology):
+    """Default counter text, the number of messages sent so far"""
+    return f"Number of messages passed: {topology_statistics(topology)['total']['messages_sent']}"
+
+
+def label_positions(positions, offset=0.1, angle=np.radians(75)):
+    """
+    Places every label next to its node, turned by `angle` around the centre of the ring.
+
+    Parameters
+    -----------
+    positions: numpy.ndarray
+        (N, 2) array of node positions.
+
+    Returns
+    --------
+    numpy.ndarray
+        (N, 2) array of label positions.
+    """
+    theta = np.arctan2(positions[:, 1], positions[:, 0]) + angle
+    return positions + offset * np.column_stack((np.cos(theta), np.sin(theta)))
+
+
+class RingRenderer:
+    """
+    Draws the nodes of a topology on a circle and redraws only what changes.
+
+    The colour of a node comes from the name of its `state` (active, passive
+    or leader) and its label from `label_attribute`, `id` for the nodes with
+    ids and `id_p` for the anonymous Itai-Rodeh nodes.
+    """
+
+    def __init__(self, topology, label_attribute="id", counter=messages_counter, figure=None, state_colours=None, blit=True):
+        """
+        Parameters
+        -----------
+        topology: Topology
+            The running topology, its graph is drawn once.
+        label_attribute: str
+            Node attribute shown next to each node.
+        counter: callable
+            Takes the topology and returns the text under the ring.
+        figure: matplotlib.figure.Figure
+            Figure to draw in, a new one by default.
+        state_colours: dict
+            Colour of each state name, defaults to `STATE_COLOURS`.
+        blit: bool
+            Draw the nodes and the counter over a saved background. Turn it
+            off when every frame is saved in full, e.g. to an animation file.
+        """
+        self.topology = topology
+        self.blit = blit
+        self.label_attribute = label_attribute
+        self.counter = counter
+        self.figure = figure if figure is not None else plt.figure(num=0)
+        colours = state_colours if state_colours is not None else STATE_COLOURS
+        self.state_colours = {state: np.array(to_rgba(colour)) for state, colour in colours.items()}
+
+        self.node_ids = sorted(topology.nodes)
+        graph = topology.G
+        axes = self.figure.add_subplot(1, 1, 1)
+        axes.set_axis_off()
+        self.axes = axes
+
+        layout = nx.circular_layout(graph, center=(0, 0))
+        positions = np.array([layout[nodeID] for nodeID in self.node_ids])
+
+        # the edges never change, they are part of the background
+        nx.draw_networkx_edges(graph, layout, ax=axes, edge_color=EDGE_COLOUR)
+        # networkx' default marker size, shrunk so that large rings do not overlap
+        node_size = min(300, 15000 / max(1, len(self.node_ids)))
+        self.nodes = nx.draw_networkx_nodes(graph, layout, nodelist=self.node_ids, ax=axes, node_size=node_size, node_color=[colours["active"]] * len(self.node_ids))
+        self.nodes.set_animated(blit)
+        self.labels = [
+            axes.text(x, y, "", horizontalalignment="center", verticalalignment="center")
+            for x, y in label_positions(positions)
+        ]
+        self.label_texts = [None] * len(self.labels)
+        self.counter_text = self.figure.text(0.02, 0.02, "", animated=blit)
+        axes.set_xlim(-1.3, 1.3)
+        axes.set_ylim(-1.3, 1.3)
+        axes.set_aspect("equal")
+
+        self.background = None
+        self.figure.canvas.mpl_connect("draw_event", self.on_draw)
+        self.figure.canvas.draw()
+
+    def on_draw(self, event):
+        """Saves the static background after every full redraw, e.g. when the window is resized"""
+        if not self.blit:
+            return
+        canvas = self.figure.canvas
+        if canvas.supports_blit:
+            self.background = canvas.copy_from_bbox(self.figure.bbox)
+        self.draw_artists()
+
+    def draw_artists(self):
+        self.figure.draw_artist(self.nodes)
+        self.figure.draw_artist(self.counter_text)
+
+    def update(self) -> bool:
+        """
+        Samples the nodes and updates the colours, the changed labels and the counter.
+
+        Returns
+        --------
+        bool
+            True if a label changed, the background must be redrawn.
+        """
+        nodes = self.topology.nodes
+        faces = np.array([self.state_colours[nodes[nodeID].state.name] for nodeID in self.node_ids])
+        self.nodes.set_facecolor(faces)
+        labels_changed = False
+        for index, nodeID in enumerate(self.node_ids):
+            text = str(getattr(nodes[nodeID], self.label_attribute))
+            if text != self.label_texts[index]:
+                self.label_texts[index] = text
+                self.labels[index].set_text(text)
+                labels_changed = True
+        self.counter_text.set_text(self.counter(self.topology))
+        return labels_changed
+
+    def render(self):
+        """
+        Draws one frame, blitting over the saved background when the canvas supports it.
+        """
+        labels_changed = self.update()
+        canvas = self.figure.canvas
+        if labels_changed:
+            # draws the background with the new labels, on_draw saves it
+            canvas.draw()
+            canvas.blit(self.figure.bbox)
+        elif self.background is not None:
+            canvas.restore_region(self.background)
+            self.draw_artists()
+            canvas.blit(self.figure.bbox)
+        else:
+            canvas.draw_idle()
+        canvas.flush_events()
+
+    def run(self, observer, fps=30, until=None):
+        """
+        Renders at most `fps` frames per second while the figure is open.
+
+        A frame is only drawn after the observer flags a change, and all the
+        changes since the previous frame are drawn at once, so the frame rate
+        never throttles the election.
+
+        Parameters
+        -----------
+        observer: SamplingObserver
+            Observer attached to the node class of the topology.
+        fps: float
+            Upper bound of the frame rate.
+        until: callable
+            Stops after the frame sampled once it returns True, runs until the window is closed by default.
+
+        Returns
+        --------
+        int
+            Number of frames drawn.
+        """
+        interval = 1.0 / fps
+        frames = 0
+        while plt.fignum_exists(self.figure.number):
+            started = time.perf_counter()
+            if observer.update.wait(interval):
+                observer.update.clear()
+                # checked first, so that the last frame shows the final state
+                done = until is not None and until()
+                self.render()
+                frames += 1
+                if done:
+                    break
+            # keep the display rate, whatever drawing the frame cost; unlike
+            # plt.pause this handles window events without a full redraw
+            remaining = interval - (time.perf_counter() - started)
+            if remaining > 0:
+                self.figure.canvas.start_event_loop(remaining)
+        return frames
@@ -0,0 +1,364 @@
+"""
+Ring elections sharded over worker processes.
+
+The ring is cut into contiguous arcs, one process per arc. Every process runs
+the nodes of its arc on its own `EventScheduler` (see `ringelec.DiscreteEvent`)
+and the two channels that leave the arc hand their messages to the process of
+the neighbouring arc instead of its own scheduler. There is no global step:
+neighbouring arcs synchronise with each other directly, with conservative null
+messages. No message takes less than the channel latency, so an arc whose
+earliest event is at t sends nothing that arrives before t + latency; with
+every batch of messages it promises its neighbours that bound. An arc handles
+the events before the smallest promise of its neighbours and runs ahead of the
+rest of the ring as far as they allow. The parent only collects the state of
+the arcs and ends the run once every arc is idle and every message sent was
+received.
+
+    $ export PYTHONPATH=$(pwd)
+    $ python -m ringelec.ShardedRing --algorithm Franklins --size 100000 --shards 8
+
+The mode is experimental, a speedup on several cores has not been measured
+yet. Runs are deterministic for a given number of shards: a message from another
+arc enters the scheduler once every event before its time was handled, however
+early it arrived. Without jitter they elect the same leader, with the same
+messages and time to leader, as a single `DiscreteEventTopology`.
+"""
+
+import argparse
+import bisect
+import heapq
+import math
+import multiprocessing
+import os
+import queue
+import time
+from multiprocessing.connection import wait
+
+import networkx as nx
+from adhoccomputing.Generics import *
+
+from ringelec.DiscreteEvent import DiscreteEventElection, DiscreteEventTopology, SimulatedChannel
+from ringelec.Election import ElectionResult, winning_id
+from ringelec.ElectionStatistics import summarize
+from ringelec.IdAssignment import IdLayout
+from ringelec.Sweep import ALGORITHMS, run_context
+
+
+def ring_arcs(ring_size: int, shards: int) -> list:
+    """
+    Cuts the positions 0..ring_size-1 into `shards` contiguous arcs of (almost) equal length.
+
+    Returns
+    --------
+    list
+        One range of positions per shard.
+    """
+    bounds = [ring_size * shard // shards for shard in range(shards + 1)]
+    return [range(start, stop) for start, stop in zip(bounds, bounds[1:])]
+
+
+class RemoteNode:
+    """
+    Stand-in for a node of another arc at the far end of a BoundaryChannel
+    """
+
+    def __init__(self, componentinstancenumber, shard: int):
+        self.componentname = "RemoteNode"
+        self.componentinstancenumber = componentinstancenumber
+        self.shard = shard
+
+
+class BoundaryChannel(SimulatedChannel):
+    """
+    Channel between the last node of an arc and the first node of the next
+    one. Messages to the RemoteNode wait in the topology's outbox until the
+    arc sends them to its neighbour.
+    """
+
+    def deliver(self, time: float, receiver, message: Event):
+        if not isinstance(receiver, RemoteNode):
+            super().deliver(time, receiver, message)
+            return
+        self.topology.outboxes.setdefault(receiver.shard, []).append(
+            (time, receiver.componentinstancenumber, message.eventcontent, message.fromchannel,
+             message.eventsource_componentname, message.eventsource_componentinstancenumber)
+        )
+
+
+class ArcTopology(DiscreteEventTopology):
+    """
+    The nodes of one arc of the ring, and the channels that touch them.
+    """
+
+    def __init__(self, arcs: list, shard: int, latency=1.0, jitter=0.0, seed=None, election_context=None):
+        """
+        Parameters
+        -----------
+        arcs: list
+            The arcs of every shard, see `ring_arcs`.
+        shard: int
+            Index of the arc this topology runs.
+        latency, jitter, seed, election_context:
+            See `DiscreteEventTopology`.
+        """
+        super().__init__(latency, jitter, seed, election_context)
+        self.arcs = arcs
+        self.shard = shard
+        self.starts = [arc.start for arc in arcs]
+
+        """Messages to other arcs not sent yet, keyed by shard"""
+        self.outboxes = {}
+
+    def owner(self, position) -> int:
+        """Returns the shard whose arc holds the position"""
+        return bisect.bisect_right(self.starts, position) - 1
+
+    def construct_from_graph(self, G, nodetype, channeltype=SimulatedChannel, context=None):
+        """
+        Builds the nodes of the arc and the channels of their edges; the far
+        end of an edge that leaves the arc is a RemoteNode.
+        """
+        self.G = G
+        self.compute_forwarding_table()
+        for i in self.arcs[self.shard]:
+            node = nodetype(nodetype.__name__, i, num_worker_threads=0, topology=self)
+            self.scheduler.attach(node)
+            self.nodes[i] = node
+
+        for k in G.edges(self.arcs[self.shard]):
+            boundary = any(self.owner(endpoint) != self.shard for endpoint in k)
+            channel_class = BoundaryChannel if boundary else channeltype
+            ch = channel_class(channel_class.__name__ + "-" + str(k[0]) + "-" + str(k[1]), str(k[0]) + "-" + str(k[1]), num_worker_threads=0, topology=self)
+            ch.scheduler = self.scheduler
+            ch.random = self.random
+            ch.latency = self.latency
+            ch.jitter = self.jitter
+            self.channels[k] = ch
+            for endpoint, other in (k, k[::-1]):
+                if endpoint in self.nodes:
+                    self.nodes[endpoint].connect_me_to_component(ConnectorTypes.DOWN, ch)
+                    if other in self.nodes:
+                        ch.connect_me_to_component(ConnectorTypes.UP, self.nodes[other])
+                    else:
+                        ch.connect_me_to_component(ConnectorTypes.UP, RemoteNode(other, self.owner(other)))
+
+    def neighbour_shards(self) -> list:
+        """Shards at the far end of the boundary channels"""
+        return sorted({
+            receiver.shard
+            for ch in self.channels.values()
+            for receiver in ch.connectors[ConnectorTypes.UP]
+            if isinstance(receiver, RemoteNode)
+        })
+
+    def receive(self, batch: list):
+        """Schedules the messages another arc sent to this one"""
+        for time, position, eventcontent, fromchannel, componentname, componentinstancenumber in batch:
+            message = Event(None, EventTypes.MFRB, eventcontent, fromchannel=fromchannel,
+                            eventsource_componentname=componentname, eventsource_componentinstancenumber=componentinstancenumber)
+            self.scheduler.schedule(time, self.nodes[position], message)
+
+    def next_time(self) -> float:
+        """Virtual time of the earliest pending event, infinity if there is none"""
+        pending = self.scheduler.pending
+        return pending[0][0] if pending else math.inf
+
+
+def run_shard(algorithm, ring_size, layout, seed, latency, jitter, arcs, shard, inboxes, control):
+    """
+    Runs one arc of the ring in a worker process.
+
+    Every item on the inbox of a shard is (neighbour, messages, promise): the
+    neighbour sends no later message due before `promise`. The arc handles its
+    events up to the smallest promise of its neighbours, sends each of them
+    its messages and its own promise, then waits for the next item. It reports
+    (idle, messages sent, messages received), per neighbour, to the parent over
+    `control` whenever they change, and its results once the parent put None on
+    its inbox.
+    """
+    context = run_context(algorithm, ring_size, layout, seed)
+    election = DiscreteEventElection(context.node_type)
+    topology = ArcTopology(arcs, shard, latency, jitter, f"{seed}-{shard}", context)
+    topology.construct_from_graph(nx.cycle_graph(ring_size), context.node_type)
+    election.attach(topology)
+    neighbours = topology.neighbour_shards()
+    inbox = inboxes[shard]
+
+    # the nodes start at 0, nothing from another arc arrives before one latency
+    promises = {neighbour: latency for neighbour in neighbours}
+    promised = {neighbour: 0.0 for neighbour in neighbours}
+    sent = {neighbour: 0 for neighbour in neighbours}
+    received = {neighbour: 0 for neighbour in neighbours}
+    # messages from other arcs, by (time, sender, order of sending)
+    arrived = []
+    reported = None
+
+    topology.start()
+    while True:
+        safe = min(promises.values(), default=math.inf)
+        while True:
+            due = arrived[0][0] if arrived else math.inf
+            topology.run(before=min(safe, due))
+            if due >= safe:
+                break
+            # every event before `due` was handled, the order no longer depends on when the batch arrived
+            batch = []
+            while arrived and arrived[0][0] == due:
+                batch.append(heapq.heappop(arrived)[3])
+            topology.receive(batch)
+
+        next_time = topology.next_time()
+        promise = min(next_time, due, safe) + latency
+        for neighbour in neighbours:
+            batch = topology.outboxes.pop(neighbour, [])
+            if batch or promise > promised[neighbour]:
+                inboxes[neighbour].put((shard, batch, promise))
+                sent[neighbour] += len(batch)
+                promised[neighbour] = promise
+        state = (next_time == math.inf and not arrived, dict(sent), dict(received))
+        if state != reported:
+            control.send(state)
+            reported = state
+
+        item = inbox.get()
+        while item is not None:
+            neighbour, batch, promise = item
+            for order, message in enumerate(batch):
+                heapq.heappush(arrived, (message[0], neighbour, received[neighbour] + order, message))
+            received[neighbour] += len(batch)
+            promises[neighbour] = promise
+            try:
+                item = inbox.get_nowait()
+            except queue.Empty:
+                break
+        if item is None:
+            break
+
+    leader = election.leader
+    control.send({
+        "leader": None if leader is None else (leader.componentinstancenumber, winning_id(leader), election.elected),
+        "statistics": [(nodeID, node.statistics) for nodeID, node in topology.nodes.items()],
+        "end": topology.scheduler.now,
+        "events": topology.scheduler.events_handled,
+    })
+
+
+def quiet(states: list) -> bool:
+    """
+    True if every arc reported that it is idle and every message an arc sent
+    was received. The arcs report after every change, and an idle arc only
+    wakes up on a message, so the ring stays quiet from then on.
+    """
+    if any(state is None or not state[0] for state in states):
+        return False
+    return all(
+        count == states[neighbour][2].get(shard, 0)
+        for shard, (_, sent, _) in enumerate(states)
+        for neighbour, count in sent.items()
+    )
+
+
+def receive(connection, process, shard):
+    """Waits for the next message of a shard, raises a RuntimeError if its process died"""
+    try:
+        return connection.recv()
+    except EOFError:
+        process.join()
+        raise RuntimeError(f"shard {shard} failed with exit code {process.exitcode}") from None
+
+
+def sharded_election(algorithm, ring_size, shards=None, layout=IdLayout.random.value, seed=0, latency=1.0, jitter=0.0) -> ElectionResult:
+    """
+    Runs an election on a ring split into arcs, one worker process per arc.
+
+    Parameters
+    -----------
+    algorithm: str
+        Key of `ringelec.Sweep.ALGORITHMS`.
+    ring_size: int
+        Number of nodes on the ring.
+    shards: int
+        Number of arcs and processes, defaults to the number of CPUs.
+    layout: str
+        IdLayout of the ids, ignored by the anonymous Itai-Rodeh nodes.
+    seed: int
+        Seed of the random layout, or of the Itai-Rodeh ids, and of the jitter.
+    latency: float
+        Virtual time a message takes over a channel, how far an arc can run
+        ahead of its neighbours; must be positive.
+    jitter: float
+        Upper bound of the uniform random delay added to the latency.
+
+    Returns
+    --------
+    ElectionResult
+        duration and time_to_leader are in virtual time.
+    """
+    if latency <= 0:
+        raise ValueError("sharded elections need a positive channel latency")
+    shards = max(1, min(shards or os.cpu_count(), ring_size))
+    arcs = ring_arcs(ring_size, shards)
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue() for _ in arcs]
+    connections = []
+    processes = []
+    for shard in range(shards):
+        connection, child = context.Pipe()
+        process = context.Process(
+            target=run_shard,
+            args=(algorithm, ring_size, layout, seed, latency, jitter, arcs, shard, inboxes, child),
+            daemon=True,
+        )
+        process.start()
+        # the parent keeps no handle on the child's end, so a dead shard reads as EOF
+        child.close()
+        connections.append(connection)
+        processes.append(process)
+
+    try:
+        states = [None] * shards
+        while not quiet(states):
+            for connection in wait(connections):
+                shard = connections.index(connection)
+                states[shard] = receive(connection, processes[shard], shard)
+        for inbox in inboxes:
+            inbox.put(None)
+        results = []
+        for shard, (connection, process) in enumerate(zip(connections, processes)):
+            # skip the states the parent did not read before the ring was quiet
+            result = receive(connection, process, shard)
+            while not isinstance(result, dict):
+                result = receive(connection, process, shard)
+            results.append(result)
+    finally:
+        for process in processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+
+    leaders = [result["leader"] for result in results if result["leader"] is not None]
+    if not leaders:
+        raise RuntimeError(f"no leader after {sum(result['events'] for result in results)} events")
+    leader, leader_id, elected = min(leaders, key=lambda leader: leader[2])
+    statistics = summarize(pair for result in results for pair in result["statistics"])
+    return ElectionResult(leader, leader_id, statistics, max(result["end"] for result in results), elected)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Runs a ring election split into arcs over worker processes (experimental: "
+                                                 "the results match a single process, a speedup on several cores is not measured yet)")
+    parser.add_argument("--algorithm", choices=sorted(ALGORITHMS), default="ChangRoberts")
+    parser.add_argument("--size", type=int, default=10**5, help="number of nodes on the ring")
+    parser.add_argument("--shards", type=int, default=None, help="worker processes, defaults to the number of CPUs")
+    parser.add_argument("--layout", choices=[layout.value for layout in IdLayout], default=IdLayout.random.value)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jitter", type=float, default=0.0, help="random delay added to the latency of 1")
+    arguments = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    result = sharded_election(arguments.algorithm, arguments.size, arguments.shards, arguments.layout, arguments.seed, jitter=arguments.jitter)
+    print(f"{result}, time to leader {result.time_to_leader:.0f} hop delays, {time.perf_counter() - start:.1f}s wall time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Headless parameter sweep over the ring election algorithms.
+
+    $ export PYTHONPATH=$(pwd)
+    $ python -m ringelec.Sweep --algorithms ChangRoberts Franklins --sizes 3-20 \\
+        --layouts random descending --seeds 0-4 --output results.csv
+
+Every combination of algorithm, ring size, id layout and seed is one run; the
+anonymous Itai-Rodeh nodes ignore the layout and run with the first one only.
+The runs are spread over worker processes, each running one topology at a
+time, and land in one tidy results file with a row per run: CSV, or Parquet
+when the output ends in .parquet (needs pandas with pyarrow). `--legacy DIR` also
+writes the transitions of every run in the format of the old croutputN/foutputN
+files.
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+from adhoccomputing.Networking.LogicalChannels.GenericChannel import GenericChannel
+
+from AnonymousNetworks.ItaiRodeh import ItaiRodehNode
+from ringelec.ChangRoberts import ChangRobertsNode
+from ringelec.Election import Election
+from ringelec.ElectionTrace import TraceReader, TraceRecorder
+from ringelec.Franklins import FranklinsNode
+from ringelec.HirschbergSinclair import HirschbergSinclairNode
+from ringelec.IdAssignment import IdAssigner, IdLayout
+from ringelec.Peterson import PetersonNode
+from ringelec.RingElectionNode import ElectionContext, RingTopology
+
+ALGORITHMS = {
+    "ChangRoberts": ChangRobertsNode,
+    "Franklins": FranklinsNode,
+    "Peterson": PetersonNode,
+    "HirschbergSinclair": HirschbergSinclairNode,
+    "ItaiRodeh": ItaiRodehNode,
+}
+
+"""Names of the old hand-made output files, by algorithm"""
+LEGACY_PREFIXES = {"ChangRoberts": "croutput", "Franklins": "foutput"}
+
+RESULT_FIELDS = (
+    "algorithm", "ring_size", "layout", "seed",
+    "leader", "leader_id",
+    "messages_sent", "messages_forwarded", "messages_relayed", "messages_dismissed", "rounds",
+    "setup_time", "time_to_leader", "wall_time",
+)
+
+
+def run_context(algorithm, ring_size, layout, seed, trace_recorder=None) -> ElectionContext:
+    """
+    Returns the election context of a run, see `run_election` for the parameters.
+    """
+    node_type = ALGORITHMS[algorithm]
+    if node_type is ItaiRodehNode:
+        return ElectionContext(node_type, ring_size=ring_size, seed=seed, trace_recorder=trace_recorder)
+    return ElectionContext(node_type, ring_size=ring_size, id_assigner=IdAssigner(ring_size, IdLayout(layout), seed), trace_recorder=trace_recorder)
+
+
+def run_election(algorithm, ring_size, layout, seed, legacy_path=None, timeout=300):
+    """
+    Runs one election on a ring, headless.
+
+    Parameters
+    -----------
+    algorithm: str
+        Key of `ALGORITHMS`.
+    ring_size: int
+        Number of nodes on the ring.
+    layout: str
+        IdLayout of the ids, ignored by the anonymous Itai-Rodeh nodes.
+    seed: int
+        Seed of the random layout, or of the Itai-Rodeh ids.
+    legacy_path: str
+        File to write the transitions of the run to, in the old text format.
+    timeout: float
+        Seconds to wait for the election to complete.
+
+    Returns
+    --------
+    dict
+        The row of the run, keyed by `RESULT_FIELDS`.
+    """
+    recorder = TraceRecorder() if legacy_path is not None else None
+    context = run_context(algorithm, ring_size, layout, seed, recorder)
+    election = Election(context.node_type)
+
+    start = time.perf_counter()
+    topology = RingTopology(election_context=context)
+    topology.construct_from_graph(nx.cycle_graph(ring_size), context.node_type, GenericChannel)
+    setup_time = time.perf_counter() - start
+    result = election.start(topology).result(timeout)
+
+    if recorder is not None:
+        with open(legacy_path, "w") as output:
+            output.write(f"Creating a ring with size {ring_size}\n")
+            for line in TraceReader(recorder.records()).legacy_text():
+                output.write(f"{line}\n")
+
+    total = result.statistics["total"]
+    return {
+        "algorithm": algorithm,
+        "ring_size": ring_size,
+        "layout": layout,
+        "seed": seed,
+        "leader": result.leader,
+        "leader_id": result.leader_id,
+        "messages_sent": total["messages_sent"],
+        "messages_forwarded": total["messages_forwarded"],
+        "messages_relayed": total["messages_relayed"],
+        "messages_dismissed": total["messages_dismissed"],
+        "rounds": total["rounds"],
+        "setup_time": setup_time,
+        "time_to_leader": result.time_to_leader,
+        "wall_time": result.duration,
+    }
+
+
+def sweep_runs(algorithms, ring_sizes, layouts, seeds):
+    """
+    Returns every (algorithm, ring size, layout, seed) combination, in that nesting order. The anonymous Itai-Rodeh
+    nodes ignore the layout, so they only run with the first one.
+    """
+    return [
+        (algorithm, ring_size, layout, seed)
+        for algorithm in algorithms
+        for ring_size in ring_sizes
+        for layout in (layouts[:1] if ALGORITHMS[algorithm] is ItaiRodehNode else layouts)
+        for seed in seeds
+    ]
+
+
+def legacy_path(directory, run, unique):
+    """
+    Returns the file of the transitions of a run in `directory`, named like
+    the old outputs (croutput5) when the sweep has one layout and seed.
+    """
+    algorithm, ring_size, layout, seed = run
+    name = f"{LEGACY_PREFIXES.get(algorithm, algorithm.lower() + 'output')}{ring_size}"
+    if not unique:
+        name = f"{name}-{layout}-{seed}"
+    return os.path.join(directory, name)
+
+
+def sweep(runs, processes=None, legacy_directory=None, timeout=300):
+    """
+    Runs the elections across a process pool.
+
+    Parameters
+    -----------
+    runs: list
+        (algorithm, ring size, layout, seed) tuples, see `sweep_runs`.
+    processes: int
+        Size of the process pool, defaults to the number of CPUs.
+    legacy_directory: str
+        Directory to write the transitions of every run to, see `legacy_path`.
+    timeout: float
+        Seconds to wait for each election.
+
+    Returns
+    --------
+    list
+        The rows of the runs, in the order of `runs`.
+    """
+    unique = len({(layout, seed) for _, _, layout, seed in runs}) == 1
+    with ProcessPoolExecutor(processes) as pool:
+        futures = [
+            pool.submit(
+                run_election, *run,
+                legacy_path(legacy_directory, run, unique) if legacy_directory is not None else None,
+                timeout,
+            )
+            for run in runs
+        ]
+        return [future.result() for future in futures]
+
+
+def results_writer(path):
+    """
+    Returns a function writing the rows to a CSV file, or a Parquet file when
+    the path ends in .parquet. Fails before a sweep starts if Parquet output
+    is asked for without pandas.
+    """
+    if path.endswith(".parquet"):
+        try:
+            import pandas as pd
+        except ImportError:
+            raise RuntimeError("Parquet output needs pandas with pyarrow, write a .csv file instead") from None
+
+        def write(rows):
+            pd.DataFrame(rows, columns=RESULT_FIELDS).to_parquet(path, index=False)
+
+        return write
+
+    def write(rows):
+        with open(path, "w", newline="") as output:
+            writer = csv.DictWriter(output, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    return write
+
+
+def write_results(rows, path):
+    """
+    Writes the rows to a CSV file, or a Parquet file when the path ends in .parquet.
+    """
+    results_writer(path)(rows)
+
+
+def integers(text):
+    """Parses "3-20" as 3..20 inclusive, or a single integer"""
+    first, _, last = text.partition("-")
+    if not last:
+        return [int(first)]
+    return list(range(int(first), int(last) + 1))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Runs ring elections for every combination of the parameters")
+    parser.add_argument("--algorithms", nargs="+", choices=sorted(ALGORITHMS), default=["ChangRoberts", "Franklins"])
+    parser.add_argument("--sizes", nargs="+", type=integers, default=[integers("3-20")], help="ring sizes, e.g. 8 16 or 3-20")
+    parser.add_argument("--layouts", nargs="+", choices=[layout.value for layout in IdLayout], default=[IdLayout.random.value])
+    parser.add_argument("--seeds", nargs="+", type=integers, default=[[0]], help="seeds, e.g. 0-9")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes, defaults to the number of CPUs")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds to wait for each election")
+    parser.add_argument("--legacy", metavar="DIR", default=None, help="also write the transitions of every run to DIR")
+    parser.add_argument("--output", "-o", default="results.csv", help="results file, .csv or .parquet")
+    arguments = parser.parse_args(argv)
+
+    ring_sizes = sorted(set(itertools.chain.from_iterable(arguments.sizes)))
+    seeds = sorted(set(itertools.chain.from_iterable(arguments.seeds)))
+    write = results_writer(arguments.output)
+    runs = sweep_runs(arguments.algorithms, ring_sizes, arguments.layouts, seeds)
+    if arguments.legacy is not None:
+        os.makedirs(arguments.legacy, exist_ok=True)
+
+    start = time.perf_counter()
+    rows = sweep(runs, arguments.processes, arguments.legacy, arguments.timeout)
+    write(rows)
+    print(f"{len(rows)} runs in {time.perf_counter() - start:.1f}s, results in {arguments.output}")
+
+
+if __name__ == "__main__":
+    main()
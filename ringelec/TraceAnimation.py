@@ -0,0 +1,208 @@
+"""
+Offline animation of recorded election traces.
+
+A run traced at full speed (see `ringelec.ElectionTrace`) holds every state
+transition with its timestamp, which is all a renderer needs. `TraceReplay`
+rebuilds the ring from the records up to any point in time and stands in for
+the topology of `RingRenderer`; `export_animation` renders it to a GIF, an MP4
+or a directory of PNG frames with the Agg backend, in a separate process, so
+neither a display nor the election is involved.
+
+    $ export PYTHONPATH=$(pwd)
+    $ python -m ringelec.TraceAnimation run.npy run.gif --frames 120 --fps 12
+"""
+
+import argparse
+import multiprocessing
+import os
+from enum import Enum
+
+import networkx as nx
+import numpy as np
+
+from ringelec.ElectionTrace import TraceEventKind, TraceReader
+
+
+class ReplayState(Enum):
+    """
+    State of a replayed node, named like the State enums of the election modules
+    """
+
+    active = 1
+    passive = 2
+    leader = 3
+
+
+class ReplayNode:
+    """
+    A node as far as the renderer is concerned: its state and its label
+    """
+
+    __slots__ = ("state", "label")
+
+    def __init__(self):
+        self.state = ReplayState.active
+        self.label = ""
+
+
+class TraceReplay:
+    """
+    Ring of a traced run, advanced event by event.
+
+    Has the `G` and `nodes` of a topology, so a RingRenderer draws it with
+    `label_attribute="label"`. Labels show the id a node selected last, the
+    id of the round for the Itai-Rodeh nodes.
+    """
+
+    def __init__(self, records, ring_size=None):
+        """
+        Parameters
+        -----------
+        records: numpy.ndarray
+            Trace records in timestamp order, see `TraceReader.records`.
+        ring_size: int
+            Number of nodes, the largest traced node + 1 by default.
+        """
+        if records.size == 0:
+            raise ValueError("the trace is empty")
+        self.records = records
+        n = ring_size if ring_size is not None else int(records["node"].max()) + 1
+        self.G = nx.cycle_graph(n)
+        self.nodes = {nodeID: ReplayNode() for nodeID in range(n)}
+        self.start = float(records["timestamp"][0])
+        self.end = float(records["timestamp"][-1])
+        self.time = self.start
+        self.position = 0
+        self.round = 1
+        self.dismissed = 0
+
+    def advance(self, until):
+        """
+        Applies the records with a timestamp up to `until`, in seconds on the trace clock.
+        """
+        records = self.records
+        stop = int(np.searchsorted(records["timestamp"], until, side="right"))
+        for record in records[self.position:stop]:
+            node = self.nodes[int(record["node"])]
+            kind = int(record["kind"])
+            if kind == TraceEventKind.selected_id or kind == TraceEventKind.new_round:
+                node.label = str(int(record["id"]))
+            elif kind == TraceEventKind.passive:
+                node.state = ReplayState.passive
+            elif kind == TraceEventKind.leader:
+                node.state = ReplayState.leader
+            elif kind == TraceEventKind.dismissed:
+                self.dismissed += 1
+            self.round = max(self.round, int(record["round"]))
+        self.position = max(self.position, stop)
+        self.time = until
+
+    def frame_times(self, frames):
+        """
+        Returns `frames` points in time evenly spread over the run, the last one at its last record.
+        """
+        return np.linspace(self.start, self.end, max(frames, 1))
+
+
+def replay_counter(replay):
+    """Counter text of a replayed frame: time since the first record, round and purged messages"""
+    return f"{(replay.time - replay.start) * 1000:.2f}ms  Round: {replay.round}  Dismissed: {replay.dismissed}"
+
+
+def render_animation(trace_path, output, ring_size=None, frames=100, fps=10, dpi=100):
+    """
+    Renders a trace with the Agg backend, see `export_animation` for the parameters.
+    """
+    # imported here: the process rendering the trace must select Agg
+    # before pyplot is imported
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib import animation
+
+    from ringelec.RingRenderer import RingRenderer
+
+    replay = TraceReplay(np.asarray(TraceReader.load(trace_path).records), ring_size)
+    figure = plt.figure()
+    renderer = RingRenderer(replay, label_attribute="label", counter=replay_counter, figure=figure, blit=False)
+
+    extension = os.path.splitext(output)[1].lower()
+    if extension == ".gif":
+        writer = animation.PillowWriter(fps=fps)
+    elif extension == ".mp4":
+        if not animation.writers.is_available("ffmpeg"):
+            raise RuntimeError("MP4 output needs ffmpeg, write a .gif or a directory of PNG frames instead")
+        writer = animation.FFMpegWriter(fps=fps)
+    elif extension == "":
+        writer = None
+        os.makedirs(output, exist_ok=True)
+    else:
+        raise ValueError(f"unknown animation format {extension}, use .gif, .mp4 or a directory")
+
+    times = replay.frame_times(frames)
+    if writer is None:
+        for index, time in enumerate(times):
+            replay.advance(time)
+            renderer.update()
+            figure.savefig(os.path.join(output, f"frame{index:05d}.png"), dpi=dpi)
+    else:
+        with writer.saving(figure, output, dpi):
+            for time in times:
+                replay.advance(time)
+                renderer.update()
+                writer.grab_frame()
+    plt.close(figure)
+
+
+def export_animation(trace_path, output, ring_size=None, frames=100, fps=10, dpi=100, wait=True):
+    """
+    Renders a trace saved by `TraceRecorder.flush` in a separate process.
+
+    Parameters
+    -----------
+    trace_path: str
+        The .npy trace.
+    output: str
+        A .gif or .mp4 file (MP4 needs ffmpeg), or a directory for PNG frames.
+    ring_size: int
+        Number of nodes, the largest traced node + 1 by default.
+    frames: int
+        Number of frames, evenly spread over the run.
+    fps: float
+        Frame rate of the GIF or MP4.
+    dpi: int
+        Resolution of the frames.
+    wait: bool
+        Wait for the rendering process and raise a RuntimeError if it fails.
+
+    Returns
+    --------
+    multiprocessing.Process
+        The rendering process.
+    """
+    # a fresh interpreter, whatever backend the caller has loaded
+    context = multiprocessing.get_context("spawn")
+    process = context.Process(target=render_animation, args=(trace_path, output, ring_size, frames, fps, dpi))
+    process.start()
+    if wait:
+        process.join()
+        if process.exitcode != 0:
+            raise RuntimeError(f"rendering {trace_path} to {output} failed with exit code {process.exitcode}")
+    return process
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Renders a recorded election trace to an animation")
+    parser.add_argument("trace", help=".npy trace saved by TraceRecorder.flush")
+    parser.add_argument("output", help=".gif, .mp4 or a directory for PNG frames")
+    parser.add_argument("--ring-size", type=int, default=None, help="number of nodes, taken from the trace by default")
+    parser.add_argument("--frames", type=int, default=100, help="number of frames, evenly spread over the run")
+    parser.add_argument("--fps", type=float, default=10)
+    parser.add_argument("--dpi", type=int, default=100)
+    arguments = parser.parse_args(argv)
+    export_animation(arguments.trace, arguments.output, arguments.ring_size, arguments.frames, arguments.fps, arguments.dpi)
+
+
+if __name__ == "__main__":
+    main()
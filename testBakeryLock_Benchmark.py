@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testBakeryLock_Benchmark.py [process counts...]
+
+import random
+import sys
+import threading
+import time
+
+from SharedExclusion.BakeryAlgorithm import BakeryLock, HeapBakeryLock
+
+
+def new_lock(lock_type, n):
+    lock = lock_type(n, 0.0)
+    for pid in range(1, n + 1):
+        lock.addProcess(pid)
+    return lock
+
+
+def serve(lock, n, grants, seed=532):
+    """
+    The leader of a group where every process keeps asking: all n hold a ticket,
+    the first in line enters and leaves, and asks again with probability 3/4.
+    A process that does not ask again is replaced by one that was idle.
+
+    Returns
+    --------
+    tuple
+        The pids in the order they entered, and the seconds per grant.
+    """
+    generator = random.Random(seed)
+    idle = []
+    for pid in range(1, n + 1):
+        if generator.random() < 0.9:
+            lock.lock(pid)
+        else:
+            idle.append(pid)
+    order = []
+    start = time.perf_counter()
+    for _ in range(grants):
+        pid = lock.getPID(lock.first())
+        lock.enter(pid)
+        order.append(pid)
+        lock.unlock(pid)
+        if generator.random() < 0.75:
+            lock.lock(pid)
+        else:
+            idle.append(pid)
+            lock.lock(idle.pop(generator.randrange(len(idle))))
+    return order, (time.perf_counter() - start) / grants
+
+
+def check_order():
+    """Both locks serve the same processes in the same order, first come first served"""
+    for n in (1, 2, 7, 50):
+        expected, _ = serve(new_lock(BakeryLock, n), n, 500)
+        served, _ = serve(new_lock(HeapBakeryLock, n), n, 500)
+        assert served == expected, f"{n} processes"
+
+    lock = new_lock(HeapBakeryLock, 4)
+    for pid in (3, 1, 4):
+        lock.lock(pid)
+    assert [lock.try_enter(pid) for pid in (1, 2, 3, 4)] == [False, False, True, False]
+    lock.unlock(1)
+    lock.unlock(3)
+    assert lock.getPID(lock.first()) == 4
+    lock.unlock(4)
+    assert (lock.first(), lock.max_ticket, lock.queue) == (-1, 0, [])
+    print("HeapBakeryLock: same grant order as BakeryLock")
+
+
+def check_threads(threads=8, entries=200):
+    """Threads sharing a HeapBakeryLock, e.g. the worker threads of a leader without grant_queue, enter one at a time"""
+    lock = new_lock(HeapBakeryLock, threads)
+    inside = []
+    overlaps = []
+
+    def process(pid):
+        for _ in range(entries):
+            lock.lock(pid)
+            lock.enter(pid)
+            overlaps.append(len(inside))
+            inside.append(pid)
+            time.sleep(0)
+            inside.remove(pid)
+            lock.unlock(pid)
+
+    workers = [threading.Thread(target=process, args=(pid,)) for pid in range(1, threads + 1)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert len(overlaps) == threads * entries and not any(overlaps)
+    assert (lock.first(), lock.waiting, lock.queue) == (-1, 0, [])
+    print(f"HeapBakeryLock: {threads} threads entered one at a time")
+
+
+def main():
+    check_order()
+    check_threads()
+
+    sizes = [int(size) for size in sys.argv[1:]] or [100, 1000, 10000]
+    print(f"{'processes':>9} | {'BakeryLock':>12} | {'HeapBakeryLock':>14} | {'speedup':>7}")
+    for n in sizes:
+        # lock, enter and the lookup of the first process walk all n tickets, keep the run short
+        _, linear = serve(new_lock(BakeryLock, n), n, max(100, 10**6 // n))
+        _, heap = serve(new_lock(HeapBakeryLock, n), n, 10**5)
+        print(f"{n:>9} | {linear * 1e6:>10.1f}us | {heap * 1e6:>12.2f}us | {linear / heap:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
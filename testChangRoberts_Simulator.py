@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testChangRoberts_Simulator.py
+
+import sys
+import time
+
+import numpy as np
+
+from ringelec.ChangRoberts import ChangRobertsNode, State
+from ringelec.ChangRobertsSimulator import simulate
+from ringelec.Election import threaded_election
+from ringelec.IdAssignment import IdAssigner, IdLayout, ring_ids
+from ringelec.RingElectionNode import ElectionContext
+
+
+def run_threaded(assigner):
+    """Runs ChangRobertsNode on a ring with the assigner's ids, returns the topology and the election result"""
+    return threaded_election(ElectionContext(ChangRobertsNode, ring_size=assigner.ring_size, id_assigner=assigner), timeout=60)
+
+
+def cross_check(assigner):
+    ids = np.asarray(assigner.ids)
+    reference = simulate(ids)
+    topology, result = run_threaded(assigner)
+    statistics = result.statistics
+
+    leaders = [nodeID for nodeID, node in topology.nodes.items() if node.state == State.leader]
+    assert leaders == [reference.leader], f"leader {leaders} != {reference.leader}"
+    assert statistics["total"]["messages_sent"] == reference.total_messages
+    for nodeID, node_statistics in statistics["nodes"].items():
+        expected = reference.node_statistics(nodeID)
+        for key, value in expected.items():
+            assert node_statistics[key] == value, f"node {nodeID} {key}: {node_statistics[key]} != {value}"
+    print(f"{assigner.layout.name} ring of {len(ids)}: {reference.total_messages} messages, leader {reference.leader}, threaded run agrees")
+
+
+def main():
+    for n in (3, 5, 8, 13):
+        for layout in IdLayout:
+            cross_check(IdAssigner(n, layout, seed=532))
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    for layout in IdLayout:
+        start = time.perf_counter()
+        result = simulate(ring_ids(n, layout, seed=532))
+        elapsed = time.perf_counter() - start
+        print(f"{layout.name} ring of {n}: {result.total_messages} messages, leader {result.leader} ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,9 @@
 #!/usr/bin/env python
 
 # the project root must be in PYTHONPATH for imports
-# $ export PYTHONPATH=$(pwd); python tests/AnonymousNetworks/testItaiRodeh.py
+# $ export PYTHONPATH=$(pwd); python testChangRoberts_Visual.py 10 descending
 
 import sys
-import threading
-from math import atan2, cos, radians, sin, sqrt
-from time import sleep
 
 import matplotlib.pyplot as plt
 import networkx as nx
@@ -14,88 +11,36 @@ from adhoccomputing.Experimentation.Topology import Topology
 from adhoccomputing.Networking.LogicalChannels.GenericChannel import GenericChannel
 
 # from AnonymousNetworks.ItaiRodeh import ItaiRodehNode, State
-from ringelec.ChangRoberts import ChangRobertsNode, State
+from ringelec.ChangRoberts import ChangRobertsNode
+from ringelec.ElectionObserver import SamplingObserver
+from ringelec.IdAssignment import IdAssigner, IdLayout
+from ringelec.RingRenderer import RingRenderer
 
-ACTIVE_NODE_COLOUR = "#ff0000"
-PASSIVE_NODE_COLOUR = "#e0e0e0"
-LEADER_NODE_COLOUR = "#ff00ff"
-EDGE_COLOUR = "#1a1c20"
-
-
-FPS = 1
+FPS = 30
 
 
 def main():
     n = int(sys.argv[1])
+    layout = IdLayout(sys.argv[2]) if len(sys.argv) > 2 else IdLayout.random
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else None
     print(f"Creating a ring with size {n}")
     Graph = nx.cycle_graph(n)
 
     plt.ion()
-    fig = plt.figure(num=0)
 
     topology = Topology()
-    topology.construct_from_graph(Graph, ChangRobertsNode, GenericChannel)
-    topology.start()
     ChangRobertsNode.ring_size = n
+    ChangRobertsNode.id_assigner = IdAssigner(n, layout, seed)
 
-    update = threading.Event()
-    draw_delay = threading.Event()
-    ChangRobertsNode.callback = update
-    ChangRobertsNode.draw_delay = draw_delay
-
-    while True:
-        update.wait()
-        assumed_ids = list()
-        node_colours = list()
-        font_colours = list()
-
-        Graph = topology.G
-        pos = nx.circular_layout(Graph, center=(0, 0))
-
-        for nodeID in topology.nodes:
-            node = topology.nodes[nodeID]
-            node.id_p = nodeID
-            Graph.nodes[nodeID]["id_p"] = node.id_p
-            assumed_ids.append(node.id_p)
-
-            if node.state == State.active:
-                node_colours.append(ACTIVE_NODE_COLOUR)
-                font_colours.append(ACTIVE_NODE_COLOUR)
-            elif node.state == State.passive:
-                node_colours.append(PASSIVE_NODE_COLOUR)
-                font_colours.append(PASSIVE_NODE_COLOUR)
-            elif node.state == State.leader:
-                node_colours.append(LEADER_NODE_COLOUR)
-                font_colours.append(LEADER_NODE_COLOUR)
+    # sample the ring at the display rate, the nodes never wait for us
+    observer = SamplingObserver()
+    ChangRobertsNode.observer = observer
 
-        node_id_label_pos = {}
-        for key in pos:
-            x, y = pos[key]
-            theta = atan2(y, x) + radians(75)
-            d = 0.1
-            node_id_label_pos[key] = (x + d * cos(theta), y + d * sin(theta))
-
-        node_id_labels = nx.get_node_attributes(Graph, "id_p")
-
-        nx.draw(
-            Graph,
-            pos,
-            node_color=node_colours,
-            edge_color=EDGE_COLOUR,
-            with_labels=False,
-            font_weight="bold",
-        )
-
-        nx.draw_networkx_labels(Graph, node_id_label_pos, node_id_labels)
-
-        # fig.text(0.2, 0.2, f"Number of messages passed: {ChangRobertsNode.global_round}")
-
-        fig.canvas.draw()
-        fig.canvas.flush_events()
-        fig.clear()
-        update.clear()
-        draw_delay.set()
-        sleep(1.0 / FPS)
+    topology.construct_from_graph(Graph, ChangRobertsNode, GenericChannel)
+    # the ring is laid out once, frames only update colours, labels and the counter
+    renderer = RingRenderer(topology)
+    topology.start()
+    renderer.run(observer, FPS)
 
 
 if __name__ == "__main__":
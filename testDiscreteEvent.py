@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testDiscreteEvent.py
+
+import networkx as nx
+import numpy as np
+
+from AnonymousNetworks.ItaiRodeh import ItaiRodehNode
+from SharedExclusion.BakeryAlgorithm import BakeryAlgorithmComponentModel, HeapBakeryLock
+from ringelec.ChangRoberts import ChangRobertsNode
+from ringelec.ChangRobertsSimulator import simulate
+from ringelec.DiscreteEvent import DiscreteEventTopology, simulate_election
+from ringelec.Election import threaded_election
+from ringelec.Franklins import FranklinsNode
+from ringelec.IdAssignment import IdAssigner, IdLayout
+from ringelec.RingElectionNode import ElectionContext
+
+SEED = 532
+
+
+def context(node_type, n, layout=IdLayout.random):
+    """Settings of a seeded run on a ring of n"""
+    if node_type is ItaiRodehNode:
+        return ElectionContext(node_type, ring_size=n, seed=SEED)
+    return ElectionContext(node_type, ring_size=n, id_assigner=IdAssigner(n, layout, seed=SEED))
+
+
+def check_chang_roberts():
+    """Per-node counters of the simulated runs against the reference model"""
+    for n in (3, 5, 8, 13, 100):
+        for layout in IdLayout:
+            run_context = context(ChangRobertsNode, n, layout)
+            reference = simulate(np.asarray(run_context.id_assigner.ids))
+            _, result = simulate_election(ChangRobertsNode, nx.cycle_graph(n), election_context=run_context)
+            assert result.leader == reference.leader
+            assert result.statistics["total"]["messages_sent"] == reference.total_messages
+            for nodeID, node_statistics in result.statistics["nodes"].items():
+                for key, value in reference.node_statistics(nodeID).items():
+                    assert node_statistics[key] == value, f"{layout.name} ring of {n}, node {nodeID} {key}"
+            # every message takes one hop delay, the leader's own one goes all the way round
+            assert result.time_to_leader == n
+    print("ChangRobertsNode: simulated runs agree with the reference model")
+
+
+def check_against_threaded(node_type):
+    """The simulated and threaded runs of the same seeded ring elect the same leader with the same messages"""
+    for n in (3, 5, 8, 13):
+        _, threaded = threaded_election(context(node_type, n), timeout=60)
+        _, simulated = simulate_election(node_type, nx.cycle_graph(n), election_context=context(node_type, n))
+        for field in ("messages_sent", "messages_dismissed", "rounds"):
+            assert simulated.statistics["total"][field] == threaded.statistics["total"][field], f"{node_type.__name__} ring of {n}: {field}"
+        assert (simulated.leader, simulated.leader_id) == (threaded.leader, threaded.leader_id)
+    print(f"{node_type.__name__}: simulated runs agree with threaded runs")
+
+
+def check_jitter():
+    """Random link delays reorder the messages, but a seed replays the same run"""
+    for node_type in (ChangRobertsNode, FranklinsNode, ItaiRodehNode):
+        runs = []
+        for seed in (1, 1, 2):
+            runs.append(simulate_election(node_type, nx.cycle_graph(50), jitter=0.5, seed=seed, election_context=context(node_type, 50))[1])
+        assert runs[0].duration == runs[1].duration and runs[0].statistics == runs[1].statistics
+        assert runs[0].leader == runs[2].leader
+    print("Jittered runs are reproducible")
+
+
+class HeapBakeryComponentModel(BakeryAlgorithmComponentModel):
+    lock_type = HeapBakeryLock
+
+
+def run_bakery(n, hold=5.0, spacing=10.0, node_type=BakeryAlgorithmComponentModel):
+    """
+    Every process asks for the critical section in turn, like testsharedexclusion.py,
+    in virtual time. Returns the times at which a callback ran and the events handled.
+    """
+    topology = DiscreteEventTopology()
+    topology.construct_from_graph(nx.complete_graph(n), node_type)
+    scheduler = topology.scheduler
+    entries = []
+
+    def callback(node):
+        entries.append((scheduler.now, node.componentinstancenumber))
+        scheduler.call_at(scheduler.now + hold, node.exit_critical_section)
+
+    for node in topology.nodes.values():
+        node.set_leader(0)
+        node.set_callback(lambda node=node: callback(node))
+    topology.start()
+    for index, node in enumerate(topology.nodes.values()):
+        scheduler.call_at(1.0 + index * spacing, node.enter_critical_section)
+    topology.run()
+    return entries, scheduler.events_handled
+
+
+def check_bakery():
+    entries, events = run_bakery(10)
+    assert (entries, events) == run_bakery(10), "Bakery runs differ"
+    assert [node for _, node in entries] == list(range(10))
+    assert all(later >= earlier + 5.0 for (earlier, _), (later, _) in zip(entries, entries[1:]))
+    print(f"BakeryAlgorithmComponentModel: {len(entries)} critical sections, {events} events, reproducible")
+
+    # every process asks at once, the leader grants the next one when the previous one leaves
+    entries, events = run_bakery(10, spacing=0.0)
+    assert (entries, events) == run_bakery(10, spacing=0.0, node_type=HeapBakeryComponentModel), "HeapBakeryLock serves another order"
+    assert sorted(node for _, node in entries) == list(range(10))
+    # a leave notification and a permission, one hop each
+    assert all(later <= earlier + 5.0 + 2.0 for (earlier, _), (later, _) in zip(entries, entries[1:]))
+    print(f"BakeryAlgorithmComponentModel: 10 contending processes served in {entries[-1][0] - entries[0][0]:.0f} time units")
+
+
+def main():
+    check_chang_roberts()
+    check_against_threaded(FranklinsNode)
+    check_against_threaded(ItaiRodehNode)
+    check_jitter()
+    check_bakery()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testDiscreteEvent_Benchmark.py [large ring sizes...]
+
+import sys
+import time
+
+import networkx as nx
+
+from AnonymousNetworks.ItaiRodeh import ItaiRodehNode
+from ringelec.ChangRoberts import ChangRobertsNode
+from ringelec.DiscreteEvent import simulate_election
+from ringelec.Election import threaded_election
+from ringelec.Franklins import FranklinsNode
+from ringelec.IdAssignment import IdAssigner, IdLayout
+from ringelec.RingElectionNode import ElectionContext
+
+SEED = 532
+NODE_TYPES = (ChangRobertsNode, FranklinsNode, ItaiRodehNode)
+
+
+def context(node_type, n):
+    """Settings of a seeded run on a ring of n"""
+    if node_type is ItaiRodehNode:
+        return ElectionContext(node_type, ring_size=n, seed=SEED)
+    return ElectionContext(node_type, ring_size=n, id_assigner=IdAssigner(n, IdLayout.random, seed=SEED))
+
+
+def run_threaded(node_type, n):
+    """Wall time of a threaded election, construction included"""
+    run_context = context(node_type, n)
+    start = time.perf_counter()
+    _, result = threaded_election(run_context, timeout=600)
+    return result, time.perf_counter() - start
+
+
+def run_simulated(node_type, n):
+    """Wall time of a discrete-event election, construction included"""
+    run_context = context(node_type, n)
+    start = time.perf_counter()
+    topology, result = simulate_election(node_type, nx.cycle_graph(n), election_context=run_context)
+    return result, time.perf_counter() - start, topology.scheduler.events_handled
+
+
+def main():
+    large = [int(size) for size in sys.argv[1:]] or [10**4, 10**5]
+
+    print(f"{'algorithm':>16} {'ring':>7} | {'messages':>9} | {'threaded':>9} | {'simulated':>9} | {'speedup':>7}")
+    for node_type in NODE_TYPES:
+        for n in (100, 300):
+            threaded, threaded_time = run_threaded(node_type, n)
+            simulated, simulated_time, _ = run_simulated(node_type, n)
+            messages = simulated.statistics["total"]["messages_sent"]
+            assert messages == threaded.statistics["total"]["messages_sent"]
+            print(f"{node_type.__name__:>16} {n:>7} | {messages:>9} | {threaded_time:>8.2f}s | {simulated_time:>8.2f}s | {threaded_time / simulated_time:>6.1f}x")
+
+    print()
+    print(f"{'algorithm':>16} {'ring':>7} | {'messages':>9} | {'rounds':>6} | {'time to leader':>14} | {'wall time':>9} | {'events/s':>8}")
+    for node_type in NODE_TYPES:
+        for n in large:
+            result, wall_time, events = run_simulated(node_type, n)
+            total = result.statistics["total"]
+            # virtual time, in hop delays
+            print(f"{node_type.__name__:>16} {n:>7} | {total['messages_sent']:>9} | {total['rounds']:>6} | "
+                  f"{result.time_to_leader:>14.0f} | {wall_time:>8.1f}s | {events / wall_time:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
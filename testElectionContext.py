@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testElectionContext.py [elections per algorithm]
+
+import sys
+import time
+
+import networkx as nx
+from adhoccomputing.Networking.LogicalChannels.GenericChannel import GenericChannel
+
+from ringelec.DiscreteEvent import simulate_election
+from ringelec.Election import Election
+from ringelec.RingElectionNode import RingTopology
+from ringelec.Sweep import ALGORITHMS, run_context
+
+LAYOUTS = ("random", "ascending", "descending")
+
+
+def runs(per_algorithm):
+    """(algorithm, ring size, layout, seed) of the elections, different settings for every one"""
+    return [
+        (algorithm, 3 + (7 * index) % 17, LAYOUTS[index % len(LAYOUTS)], index)
+        for algorithm in ALGORITHMS
+        for index in range(per_algorithm)
+    ]
+
+
+def check_concurrent(per_algorithm):
+    """
+    Starts every election before any completes, all in this process, then
+    compares each with a discrete-event run of the same settings.
+    """
+    class_attributes = {node_type: (node_type.ring_size, node_type.observer, node_type.id_assigner) for node_type in ALGORITHMS.values()}
+
+    start = time.perf_counter()
+    futures = []
+    for run in runs(per_algorithm):
+        context = run_context(*run)
+        topology = RingTopology(election_context=context)
+        topology.construct_from_graph(nx.cycle_graph(run[1]), context.node_type, GenericChannel)
+        futures.append((run, Election(context.node_type).start(topology)))
+    results = [(run, future.result(timeout=120)) for run, future in futures]
+    wall_time = time.perf_counter() - start
+
+    for run, threaded in results:
+        context = run_context(*run)
+        _, simulated = simulate_election(context.node_type, nx.cycle_graph(run[1]), election_context=context)
+        assert (threaded.leader, threaded.leader_id) == (simulated.leader, simulated.leader_id), f"{run}"
+        assert threaded.quiesced, f"{run}: stopped by the settle timeout"
+        # the replies a Hirschberg-Sinclair node dismisses depend on the interleaving
+        for field in ("messages_sent", "rounds"):
+            assert threaded.statistics["total"][field] == simulated.statistics["total"][field], f"{run}: {field}"
+
+    # no run wrote its settings to the node classes
+    assert class_attributes == {node_type: (node_type.ring_size, node_type.observer, node_type.id_assigner) for node_type in ALGORITHMS.values()}
+    print(f"{len(results)} concurrent elections in one process agree with their discrete-event runs ({wall_time:.1f}s)")
+
+
+def check_independent_topologies():
+    """Two ring topologies of one node class keep their own nodes"""
+    first = RingTopology(election_context=run_context("ChangRoberts", 4, "random", 0))
+    second = RingTopology(election_context=run_context("ChangRoberts", 6, "random", 0))
+    first.construct_from_graph(nx.cycle_graph(4), first.election_context.node_type, GenericChannel)
+    second.construct_from_graph(nx.cycle_graph(6), second.election_context.node_type, GenericChannel)
+    assert (len(first.nodes), len(second.nodes)) == (4, 6)
+    assert all(node.election_context is first.election_context for node in first.nodes.values())
+    first.exit()
+    second.exit()
+    print("Ring topologies keep their own nodes and contexts")
+
+
+def main():
+    per_algorithm = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    check_independent_topologies()
+    check_concurrent(per_algorithm)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testFailover.py [ring sizes...]
+
+import sys
+
+import networkx as nx
+from adhoccomputing.Networking.LogicalChannels.GenericChannel import GenericChannel
+
+from ringelec.DiscreteEvent import DiscreteEventTopology, simulate_election
+from ringelec.Failover import FailoverElection, Reelection, simulate_failover, with_failover
+from ringelec.IdAssignment import IdAssigner
+from ringelec.RingElectionNode import ElectionContext, RingTopology
+from ringelec.RingEmbedding import embed_ring
+from ringelec.Sweep import ALGORITHMS, run_context
+
+SEED = 532
+
+
+def failover_context(algorithm, n, seed=SEED, reelection=Reelection.largest_id):
+    """The settings of a sweep run, for the failover class of the algorithm"""
+    context = run_context(algorithm, n, "random", seed)
+    settings = {name: getattr(context, name) for name in context.node_type.context_attributes}
+    return ElectionContext(with_failover(context.node_type), reelection=reelection, **settings)
+
+
+def survivors(election, n):
+    """Positions that have not crashed, in ring order"""
+    crashed = {failover.leader for failover in election.failovers}
+    return [position for position in range(n) if position not in crashed]
+
+
+def check_reelection(crashes=4):
+    """Every re-election elects the largest surviving id, or the detecting neighbour on anonymous rings"""
+    for algorithm in ALGORITHMS:
+        for n in (3, 5, 8, 13, 40):
+            # the last node left elects itself
+            crashes_here = min(crashes, n - 1)
+            context = failover_context(algorithm, n)
+            topology, election = simulate_failover(context.node_type, nx.cycle_graph(n), crashes_here, election_context=context)
+            assert len(election.leaders) == crashes_here + 1
+            for (_, previous), failover in zip(election.leaders, election.failovers):
+                assert failover.leader == previous.componentinstancenumber
+                assert failover.crashed < failover.suspected <= failover.reelected, f"{algorithm} ring of {n}: {failover}"
+                assert failover.messages <= 2 * n, f"{algorithm} ring of {n}: {failover}"
+            for index, failover in enumerate(election.failovers):
+                alive = [position for position in range(n) if position not in {f.leader for f in election.failovers[:index + 1]}]
+                if algorithm == "ItaiRodeh":
+                    # the clockwise neighbour of the crashed leader takes over
+                    expected = min(alive, key=lambda position: (position - failover.leader) % n)
+                else:
+                    expected = max(alive, key=context.id_assigner.id_for)
+                assert failover.new_leader == expected, f"{algorithm} ring of {n}: {failover}, expected {expected}"
+            leaders = [node for node in topology.nodes.values() if node.leading]
+            assert [node.componentinstancenumber for node in leaders] == [election.failovers[-1].new_leader]
+        print(f"{algorithm}: {crashes} leaders in turn crash and are replaced")
+
+
+def check_takeover():
+    """The clockwise neighbour of the crashed leader takes over as soon as it suspects the crash"""
+    for algorithm in ALGORITHMS:
+        n = 30
+        context = failover_context(algorithm, n, reelection=Reelection.takeover)
+        _, election = simulate_failover(context.node_type, nx.cycle_graph(n), 4, election_context=context)
+        for index, failover in enumerate(election.failovers):
+            alive = [position for position in range(n) if position not in {f.leader for f in election.failovers[:index + 1]}]
+            assert failover.new_leader == min(alive, key=lambda position: (position - failover.leader) % n)
+            assert failover.failover_latency == failover.detection_latency
+    print("Takeover: the detecting neighbour leads from the moment it suspects the crash")
+
+
+def check_embedded():
+    """On a ring embedded in another graph the repaired ring routes around the crashed leaders"""
+    graph = nx.connected_watts_strogatz_graph(60, 4, 0.3, seed=SEED)
+    context = failover_context("ChangRoberts", 60)
+    election = FailoverElection(context.node_type, crashes=5)
+    topology = DiscreteEventTopology(election_context=context)
+    topology.construct_from_graph(graph, context.node_type)
+    embed_ring(topology)
+    election.run(topology)
+    alive = survivors(election, 60)
+    assert election.failovers[-1].new_leader == max(alive, key=context.id_assigner.id_for)
+    print(f"Embedded ring: 5 failovers, {sum(f.messages for f in election.failovers)} re-election messages")
+
+
+def check_jitter():
+    """Jittered runs replay identically for a seed"""
+    runs = []
+    for _ in range(2):
+        context = failover_context("Franklins", 50)
+        _, election = simulate_failover(context.node_type, nx.cycle_graph(50), 3, jitter=0.5, seed=1, election_context=context)
+        runs.append([(f.leader, f.new_leader, f.crashed, f.suspected, f.reelected, f.messages) for f in election.failovers])
+    assert runs[0] == runs[1]
+    print("Jittered failovers are reproducible")
+
+
+def check_threaded():
+    """Failover nodes refuse a threaded topology instead of failing on their first heartbeat"""
+    context = failover_context("ChangRoberts", 5)
+    topology = RingTopology(election_context=context)
+    try:
+        topology.construct_from_graph(nx.cycle_graph(5), context.node_type, GenericChannel)
+    except TypeError as error:
+        assert "DiscreteEventTopology" in str(error), error
+    else:
+        raise AssertionError("a failover node was built on a RingTopology")
+    print("Failover nodes are only built on a DiscreteEventTopology")
+
+
+def full_restart(algorithm, ids, seed=SEED):
+    """Election of a ring of the surviving ids from scratch, the failover without re-using any state"""
+    context = run_context(algorithm, len(ids), "random", seed)
+    if context.id_assigner is not None:
+        context.id_assigner = IdAssigner(len(ids))
+        context.id_assigner.ids = list(ids)
+    _, result = simulate_election(context.node_type, nx.cycle_graph(len(ids)), election_context=context)
+    return result
+
+
+def main():
+    check_reelection()
+    check_takeover()
+    check_embedded()
+    check_jitter()
+    check_threaded()
+
+    sizes = [int(size) for size in sys.argv[1:]] or [100, 1000]
+    print()
+    print("times in hop delays: heartbeat every 2, timeout 5")
+    print("failover: time without a leader, from the crash to the new leader")
+    print(f"{'':>25} | {'':>9} | {'largest id':>17} | {'takeover':>17} | {'full restart':>17}")
+    print(f"{'algorithm':>18} {'ring':>6} | {'detection':>9} | {'failover':>8} {'messages':>8} | {'failover':>8} {'messages':>8} | {'failover':>8} {'messages':>8}")
+    for algorithm in ALGORITHMS:
+        for n in sizes:
+            failovers = []
+            for reelection in Reelection:
+                context = failover_context(algorithm, n, reelection=reelection)
+                _, election = simulate_failover(context.node_type, nx.cycle_graph(n), election_context=context)
+                failovers.append(election.failovers[0])
+            alive = survivors(election, n)
+            ids = [context.id_assigner.id_for(position) for position in alive] if context.id_assigner is not None else alive
+            restart = full_restart(algorithm, ids)
+            # a restart waits for the same detection before it starts
+            restart_latency = failovers[0].detection_latency + restart.time_to_leader
+            columns = " | ".join(f"{failover.failover_latency:>8.1f} {failover.messages:>8}" for failover in failovers)
+            print(f"{algorithm:>18} {n:>6} | {failovers[0].detection_latency:>9.1f} | {columns} | "
+                  f"{restart_latency:>8.1f} {restart.statistics['total']['messages_sent']:>8}")
+
+
+if __name__ == "__main__":
+    main()
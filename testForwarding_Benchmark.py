@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testForwarding_Benchmark.py
+
+import sys
+import timeit
+import tracemalloc
+
+from adhoccomputing.GenericModel import GenericMessage, GenericMessageHeader, GenericMessagePayload
+from adhoccomputing.Generics import *
+
+from ringelec.ChangRoberts import ChangRobertsMessageHeader, ChangRobertsPayload
+from ringelec.RingMessages import forward
+
+
+class LegacyHeader(GenericMessageHeader):
+    """The dictionary-backed header the election modules used before"""
+    def __init__(self, messagefrom, messageto, messagetype="Chang Roberts Message", nexthop=float("inf"),
+                 interfaceid=float("inf"), sequencenumber=-1):
+        super().__init__(messagetype, messagefrom, messageto, nexthop, interfaceid, sequencenumber)
+
+
+class LegacyPayload(GenericMessagePayload):
+    def __init__(self, id, messagepayload=None):
+        super().__init__(messagepayload)
+        self.id = id
+
+
+class SinkChannel:
+    """Stands in for the channel to the next hop, keeps only the last event"""
+    def __init__(self):
+        self.last = None
+
+    def trigger_event(self, eventobj):
+        self.last = eventobj
+
+
+class RelayNode:
+    componentname = "RelayNode"
+    componentinstancenumber = 1
+    next_hop = 2
+    next_hop_interface_id = "1-2"
+
+    def __init__(self):
+        self.channel = SinkChannel()
+
+    def legacy_hop(self, eventobj):
+        # the forwarding block every election node used to repeat
+        header = eventobj.eventcontent.header
+        payload = eventobj.eventcontent.payload
+        header.messageto = self.next_hop
+        header.nexthop = self.next_hop
+        header.interfaceid = self.next_hop_interface_id
+        message = GenericMessage(header, payload)
+        self.channel.trigger_event(Event(self, EventTypes.MFRT, message))
+        return self.channel.last
+
+    def slotted_hop(self, eventobj):
+        forward(self, eventobj, self.next_hop, self.next_hop_interface_id, self.channel)
+        return self.channel.last
+
+
+def incoming(header_type, payload_type):
+    message = GenericMessage(header_type(messagefrom=0, messageto=1, nexthop=1, interfaceid="0-1"), payload_type(7))
+    return Event(None, EventTypes.MFRB, message)
+
+
+def message_size(header_type, payload_type):
+    header = header_type(messagefrom=0, messageto=1, nexthop=1, interfaceid="0-1")
+    payload = payload_type(7)
+    size = sys.getsizeof(header) + sys.getsizeof(payload)
+    for part in (header, payload):
+        if hasattr(part, "__dict__"):
+            size += sys.getsizeof(part.__dict__)
+    return size
+
+
+def main():
+    hops = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    node = RelayNode()
+
+    print(f"header + payload size: legacy {message_size(LegacyHeader, LegacyPayload)} bytes, "
+          f"slotted {message_size(ChangRobertsMessageHeader, ChangRobertsPayload)} bytes")
+
+    for name, hop, header_type, payload_type in (
+        ("legacy", node.legacy_hop, LegacyHeader, LegacyPayload),
+        ("slotted", node.slotted_hop, ChangRobertsMessageHeader, ChangRobertsPayload),
+    ):
+        eventobj = incoming(header_type, payload_type)
+        elapsed = min(timeit.repeat(lambda: hop(eventobj), number=hops, repeat=5))
+        print(f"{name}: {elapsed / hops * 1e9:.0f} ns per hop")
+
+    # Keep every event a hop hands to the channel alive, so that the traced
+    # memory growth is what the forwarding path allocates per hop
+    for name, hop, header_type, payload_type in (
+        ("legacy", node.legacy_hop, LegacyHeader, LegacyPayload),
+        ("slotted", node.slotted_hop, ChangRobertsMessageHeader, ChangRobertsPayload),
+    ):
+        eventobj = incoming(header_type, payload_type)
+        sent = [None] * 1000
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(1000):
+            eventobj = sent[i] = hop(eventobj)
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{name}: {(after - before) / 1000:.0f} bytes allocated per hop")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testFranklins_Benchmark.py
+
+import sys
+
+import networkx as nx
+from adhoccomputing.GenericModel import GenericModel, GenericMessage
+from adhoccomputing.Generics import *
+from adhoccomputing.Networking.LogicalChannels.GenericChannel import GenericChannel
+
+from ringelec.Election import Election, threaded_election
+from ringelec.ElectionObserver import ElectionObserver
+from ringelec.ElectionStatistics import ElectionStatistics
+from ringelec.Franklins import FranklinsMessageHeader, FranklinsNode, State
+from ringelec.IdAssignment import IdAssigner, IdLayout
+from ringelec.RingElectionNode import ElectionContext, RingTopology
+from ringelec.RingMessages import RingMessagePayload
+
+
+class LegacyPayload(RingMessagePayload):
+    __slots__ = ("id",)
+
+    def __init__(self, id, messagepayload=None):
+        super().__init__(messagepayload)
+        self.id = id
+
+
+class LegacyFranklinsNode(GenericModel):
+    """
+    The FranklinsNode the repository used to ship: every node floods its id to
+    both neighbours, passive and dismissing nodes re-send in both directions
+    """
+
+    ring_size = 0
+    observer = ElectionObserver()
+    id_assigner = None
+    context_attributes = ()
+
+    def __init__(self, componentname, componentinstancenumber, context=None, configurationparameters=None, num_worker_threads=1, topology=None, child_conn=None, node_queues=None, channel_queues=None):
+        super().__init__(componentname, componentinstancenumber, context, configurationparameters, num_worker_threads, topology, child_conn, node_queues, channel_queues)
+        self.id = componentinstancenumber
+        self.state = State.active
+        self.statistics = ElectionStatistics()
+
+    def on_init(self, eventobj: Event):
+        self.id = self.id_assigner.id_for(self.componentinstancenumber)
+        self.next_hop_1 = self.topology.get_next_hop(self.componentinstancenumber, (self.componentinstancenumber + 1) % self.ring_size)
+        self.next_hop_2 = self.topology.get_next_hop(self.componentinstancenumber, (self.componentinstancenumber - 1) % self.ring_size)
+        self.next_hop_interface_id = f"{self.componentinstancenumber}-{self.next_hop_1}-{self.next_hop_2}"
+        for next_hop in (self.next_hop_1, self.next_hop_2):
+            header = FranklinsMessageHeader(self.componentinstancenumber, next_hop, nexthop=next_hop, interfaceid=self.next_hop_interface_id)
+            self.send_down(Event(self, EventTypes.MFRT, GenericMessage(header, LegacyPayload(self.id))))
+        self.statistics.messages_sent += 2
+
+    def relay_both_ways(self, eventobj: Event):
+        # a fresh event per neighbour, send_down shares it between the channels
+        incoming = eventobj.eventcontent
+        for next_hop in (self.next_hop_1, self.next_hop_2):
+            header = FranklinsMessageHeader(incoming.header.messagefrom, next_hop, incoming.header.messagetype, next_hop, self.next_hop_interface_id)
+            self.send_down(Event(self, EventTypes.MFRT, GenericMessage(header, LegacyPayload(incoming.payload.id))))
+        self.statistics.messages_sent += 2
+
+    def on_message_from_bottom(self, eventobj: Event):
+        payload = eventobj.eventcontent.payload
+        if self.state == State.passive:
+            self.statistics.messages_forwarded += 2
+            self.relay_both_ways(eventobj)
+        elif self.state == State.active:
+            if payload.id > self.id:
+                self.statistics.transition(self.state, State.passive)
+                self.state = State.passive
+                self.statistics.messages_forwarded += 2
+                self.relay_both_ways(eventobj)
+            elif payload.id < self.id:
+                self.statistics.messages_dismissed += 1
+                payload.id = self.componentinstancenumber
+                self.relay_both_ways(eventobj)
+            else:
+                self.statistics.transition(self.state, State.leader)
+                self.state = State.leader
+                self.observer.on_leader(self)
+
+
+def run_legacy(assigner, window):
+    """
+    The legacy node floods the ring long after its first leader, count its
+    messages until the election stops waiting for the ring to quiesce, `window`
+    seconds after that leader. It predates election contexts and reads its
+    settings from its class.
+    """
+    election = Election(LegacyFranklinsNode, settle_timeout=window)
+    LegacyFranklinsNode.ring_size = assigner.ring_size
+    LegacyFranklinsNode.id_assigner = assigner
+    LegacyFranklinsNode.observer = election
+    topology = RingTopology(election_context=ElectionContext(LegacyFranklinsNode))
+    topology.construct_from_graph(nx.cycle_graph(assigner.ring_size), LegacyFranklinsNode, GenericChannel)
+    result = election.start(topology).result(window + 60)
+    statistics = result.statistics["total"]
+    leaders = statistics["state_transitions"].get("active->leader", 0)
+    return statistics["messages_sent"], leaders
+
+
+def run_round_based(assigner):
+    _, result = threaded_election(ElectionContext(FranklinsNode, ring_size=assigner.ring_size, id_assigner=assigner), timeout=120)
+    return result
+
+
+def main():
+    window = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    print(f"{'ring':>4} {'layout':>11} | {'legacy msgs':>11} {'leaders':>7} | {'round-based msgs':>16} {'rounds':>6} {'time':>7}")
+    for n in (8, 16, 32, 64):
+        for layout in IdLayout:
+            assigner = IdAssigner(n, layout, seed=532)
+            legacy_messages, legacy_leaders = run_legacy(assigner, window)
+            result = run_round_based(assigner)
+            total = result.statistics["total"]
+            # every round sends one message over every link in each direction
+            assert total["messages_sent"] == 2 * n * total["rounds"]
+            assert result.leader_id == n
+            print(f"{n:>4} {layout.name:>11} | {legacy_messages:>11} {legacy_leaders:>7} | "
+                  f"{total['messages_sent']:>16} {total['rounds']:>6} {result.duration:>6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
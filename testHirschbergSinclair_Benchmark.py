@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testHirschbergSinclair_Benchmark.py
+
+import sys
+
+from ringelec.ChangRoberts import ChangRobertsNode
+from ringelec.Election import threaded_election
+from ringelec.Franklins import FranklinsNode
+from ringelec.HirschbergSinclair import HirschbergSinclairNode, phase_statistics
+from ringelec.IdAssignment import IdAssigner, IdLayout
+from ringelec.Peterson import PetersonNode
+from ringelec.RingElectionNode import ElectionContext
+
+
+NODE_TYPES = {
+    "Chang-Roberts": ChangRobertsNode,
+    "Franklin": FranklinsNode,
+    "Peterson": PetersonNode,
+    "Hirschberg-Sinclair": HirschbergSinclairNode,
+}
+
+
+def run(node_type, assigner):
+    return threaded_election(ElectionContext(node_type, ring_size=assigner.ring_size, id_assigner=assigner))
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [8, 16, 32, 64]
+
+    for n in (2, 3, 5, 8, 13):
+        for layout in IdLayout:
+            topology, result = run(HirschbergSinclairNode, IdAssigner(n, layout, seed=532))
+            assert result.leader_id == n, result
+            assert sum(phase_statistics(topology).values()) == result.statistics["total"]["messages_sent"]
+
+    for layout in (IdLayout.random, IdLayout.descending):
+        print(f"{layout.name} rings, time to leader and messages")
+        print(f"{'ring':>5} | " + " | ".join(f"{name:>26}" for name in NODE_TYPES))
+        for n in sizes:
+            assigner = IdAssigner(n, layout, seed=532)
+            cells = []
+            for name, node_type in NODE_TYPES.items():
+                topology, result = run(node_type, assigner)
+                assert result.leader_id == n
+                cells.append(f"{result.time_to_leader:>9.3f}s {result.statistics['total']['messages_sent']:>8} msgs")
+                if node_type is HirschbergSinclairNode:
+                    phases = phase_statistics(topology)
+            print(f"{n:>5} | " + " | ".join(f"{cell:>26}" for cell in cells))
+            print(f"{'':>5}   Hirschberg-Sinclair messages per phase: {phases}")
+
+
+if __name__ == "__main__":
+    main()
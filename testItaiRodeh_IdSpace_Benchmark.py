@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testItaiRodeh_IdSpace_Benchmark.py [trials] [ring sizes...]
+
+import sys
+
+import numpy as np
+
+from AnonymousNetworks.ItaiRodeh import IdSpace
+from AnonymousNetworks.ItaiRodehSimulator import Runner, monte_carlo
+
+SEED = 532
+
+
+def id_spaces(n):
+    """Fixed spaces from N/4 to N^2 and spaces that grow after every dirty round"""
+    return [
+        IdSpace(max(2, n // 4)),
+        IdSpace(),
+        IdSpace(4 * n),
+        IdSpace(16 * n),
+        IdSpace(n * n),
+        IdSpace(2, growth=2),
+        IdSpace(max(2, n // 4), growth=4),
+        IdSpace(growth=2),
+    ]
+
+
+def validate():
+    """Seeded threaded runs and the model must agree run for run with a non-default id space"""
+    for id_space in (IdSpace(2, growth=2), IdSpace(64)):
+        threaded = monte_carlo([3, 5, 8], 20, SEED, Runner.threaded, id_space=id_space)
+        model = monte_carlo([3, 5, 8], 20, SEED, Runner.nodes, id_space=id_space)
+        for n in threaded:
+            for field in ("rounds", "messages", "leader"):
+                assert np.array_equal(getattr(threaded[n], field), getattr(model[n], field)), f"{id_space} ring of {n}: {field} differ"
+        print(f"id space {id_space}: threaded elections agree with the model")
+
+
+def main():
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    sizes = [int(size) for size in sys.argv[2:]] or [10, 100, 1000, 10**4]
+
+    validate()
+
+    for n in sizes:
+        print(f"\nring of {n}, {trials} elections per id space, time to leader in hop delays")
+        print(f"{'id space':>12} {'id bits':>7} | {'rounds':>6} {'p95':>4} | {'messages':>10} {'msgs/N':>6} | {'time/N':>6} {'+-':>6}")
+        rows = []
+        for id_space in id_spaces(n):
+            distribution = monte_carlo([n], trials, SEED, id_space=id_space)[n]
+            summary = distribution.summary()
+            time = summary["time_to_leader"]
+            bits = id_space.size_for(n, 1).bit_length()
+            # two standard errors of the mean
+            error = 2 * time["std"] / np.sqrt(trials)
+            rows.append((time["mean"], error, bits, id_space))
+            print(f"{str(id_space):>12} {bits:>7} | {summary['rounds']['mean']:>6.3f} {summary['rounds']['p95']:>4.0f} | "
+                  f"{summary['messages']['mean']:>10.0f} {summary['messages']['mean'] / n:>6.2f} | "
+                  f"{time['mean'] / n:>6.3f} {error / n:>6.3f}")
+
+        # the smallest ids whose latency is within the error of the lowest one
+        lowest, lowest_error, _, _ = min(rows, key=lambda row: row[0])
+        mean, _, bits, id_space = min((row for row in rows if row[0] <= lowest + lowest_error), key=lambda row: (row[2], row[0]))
+        print(f"lowest latency with the smallest ids: {id_space} ({bits} bits), {mean / n:.3f} N hop delays")
+
+
+if __name__ == "__main__":
+    main()
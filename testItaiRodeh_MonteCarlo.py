@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testItaiRodeh_MonteCarlo.py [trials] [ring sizes...]
+
+import sys
+import time
+
+import numpy as np
+
+from AnonymousNetworks.ItaiRodehSimulator import Runner, monte_carlo
+
+SEED = 532
+
+
+def validate(ring_sizes, trials):
+    """Runs the same seeded elections as threaded topologies and on the model, they must agree run for run"""
+    threaded = monte_carlo(ring_sizes, trials, SEED, Runner.threaded)
+    model = monte_carlo(ring_sizes, trials, SEED, Runner.nodes)
+    for n in ring_sizes:
+        for field in ("rounds", "messages", "leader"):
+            assert np.array_equal(getattr(threaded[n], field), getattr(model[n], field)), f"ring of {n}: {field} differ"
+        print(f"ring of {n}: {trials} threaded elections agree with the model, "
+              f"{threaded[n].rounds.mean():.2f} rounds, {threaded[n].time_to_leader.mean() * 1000:.1f}ms to leader on average")
+
+
+def main():
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    sizes = [int(size) for size in sys.argv[2:]] or [10, 100, 1000, 10**4, 10**5]
+
+    validate([2, 3, 5, 8, 13], 40)
+
+    start = time.perf_counter()
+    distributions = monte_carlo(sizes, trials, SEED)
+    print(f"{trials} elections per ring size in {time.perf_counter() - start:.1f}s")
+
+    print(f"{'ring':>7} | {'rounds':>6} {'p95':>4} {'max':>4} | {'messages':>10} {'msgs/N':>6} {'p95':>10} | {'time/N':>6} | rounds histogram")
+    for n, distribution in distributions.items():
+        summary = distribution.summary()
+        rounds, messages = summary["rounds"], summary["messages"]
+        histogram = " ".join(f"{rounds_taken}:{fraction:.3f}" for rounds_taken, fraction in enumerate(distribution.round_histogram()) if fraction)
+        # the model measures time to leader in hop delays, N per round
+        print(f"{n:>7} | {rounds['mean']:>6.3f} {rounds['p95']:>4.0f} {rounds['max']:>4.0f} | "
+              f"{messages['mean']:>10.0f} {messages['mean'] / n:>6.2f} {messages['p95']:>10.0f} | "
+              f"{summary['time_to_leader']['mean'] / n:>6.3f} | {histogram}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testPeterson_Benchmark.py
+
+import sys
+
+from ringelec.ChangRoberts import ChangRobertsNode
+from ringelec.Election import threaded_election
+from ringelec.IdAssignment import IdAssigner, IdLayout
+from ringelec.Peterson import PetersonNode
+from ringelec.RingElectionNode import ElectionContext
+
+
+def run(node_type, assigner):
+    _, result = threaded_election(ElectionContext(node_type, ring_size=assigner.ring_size, id_assigner=assigner))
+    return result
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [8, 16, 32, 64, 128]
+
+    # every layout elects the largest id, with 2N messages in each round but
+    # the last, where the id of the only active node goes around once
+    for n in (2, 3, 5, 8, 13):
+        for layout in IdLayout:
+            result = run(PetersonNode, IdAssigner(n, layout, seed=532))
+            total = result.statistics["total"]
+            assert result.leader_id == n, result
+            assert total["messages_sent"] == 2 * n * (total["rounds"] - 1) + n, total
+
+    print(f"{'ring':>5} | {'Chang-Roberts msgs':>18} {'time':>7} | {'Peterson msgs':>13} {'rounds':>6} {'time':>7}")
+    for n in sizes:
+        assigner = IdAssigner(n, IdLayout.descending)
+        chang_roberts = run(ChangRobertsNode, assigner)
+        peterson = run(PetersonNode, assigner)
+        assert chang_roberts.leader_id == peterson.leader_id == n
+        print(f"{n:>5} | {chang_roberts.statistics['total']['messages_sent']:>18} {chang_roberts.duration:>6.2f}s | "
+              f"{peterson.statistics['total']['messages_sent']:>13} {peterson.statistics['total']['rounds']:>6} {peterson.duration:>6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testRicartAgrawala_Benchmark.py [group sizes...]
+
+import sys
+import threading
+import time
+from random import Random
+
+import networkx as nx
+from adhoccomputing.Experimentation.Topology import Topology
+from adhoccomputing.Networking.LogicalChannels.GenericChannel import GenericChannel
+
+from SharedExclusion.BakeryAlgorithm import BakeryAlgorithmComponentModel
+from SharedExclusion.RicartAgrawala import RicartAgrawalaComponentModel
+from ringelec.DiscreteEvent import DiscreteEventTopology
+
+ALGORITHMS = {
+    "Bakery": BakeryAlgorithmComponentModel,
+    "RicartAgrawala": RicartAgrawalaComponentModel,
+}
+HOLD = 2.0
+
+
+def counting(node_type):
+    """Subclass of the node type that counts the messages its nodes send"""
+    class Counting(node_type):
+        sent = 0
+
+        def send_message_to(self, targetId, messageType, payload, direction=None):
+            if targetId != self.componentinstancenumber:
+                type(self).sent += 1
+            super().send_message_to(targetId, messageType, payload, direction)
+
+    Counting.__name__ = node_type.__name__
+    return Counting
+
+
+def run(node_type, n, entries_per_process, think, latency=1.0, jitter=0.0, seed=532):
+    """
+    Every member of a complete graph enters the critical section `entries_per_process` times, in virtual time: it
+    holds it for HOLD and asks again after a random think time of up to `think`.
+
+    Returns
+    --------
+    tuple
+        (member, requested, entered) of every entry, in the order of entry, and the messages sent.
+    """
+    node_type = counting(node_type)
+    topology = DiscreteEventTopology(latency, jitter, seed)
+    topology.construct_from_graph(nx.complete_graph(n), node_type)
+    scheduler = topology.scheduler
+    generator = Random(seed)
+    requested = {}
+    entries = []
+
+    def ask(node):
+        requested[node.componentinstancenumber] = scheduler.now
+        node.enter_critical_section()
+
+    def leave(node):
+        node.exit_critical_section()
+        if sum(1 for entry in entries if entry[0] == node.componentinstancenumber) < entries_per_process:
+            scheduler.call_at(scheduler.now + think * generator.random(), ask, node)
+
+    def callback(node):
+        entries.append((node.componentinstancenumber, requested[node.componentinstancenumber], scheduler.now))
+        scheduler.call_at(scheduler.now + HOLD, leave, node)
+
+    for node in topology.nodes.values():
+        node.set_leader(0)
+        node.set_callback(lambda node=node: callback(node))
+    topology.start()
+    for node in topology.nodes.values():
+        scheduler.call_at(1.0 + think * generator.random(), ask, node)
+    topology.run()
+    return entries, node_type.sent
+
+
+def check_exclusion():
+    """Every member enters as often as it asked, one at a time, also with jitter"""
+    for algorithm, node_type in ALGORITHMS.items():
+        for n in (1, 2, 5, 12):
+            for think, jitter in ((0.0, 0.0), (10.0, 0.0), (3.0, 0.7)):
+                entries, _ = run(node_type, n, 4, think, jitter=jitter)
+                assert sorted(member for member, _, _ in entries) == sorted(list(range(n)) * 4), f"{algorithm}, {n} members"
+                entered = [time for _, _, time in entries]
+                assert all(later >= earlier + HOLD for earlier, later in zip(entered, entered[1:])), f"{algorithm}, {n} members"
+        print(f"{algorithm}: one process at a time in the critical section")
+
+
+def check_threaded(n=6, hold=0.05):
+    """
+    Ricart-Agrawala on worker threads, every member asks at once. The callback
+    blocks its worker thread until another thread made the member exit.
+    """
+    topology = Topology()
+    topology.construct_from_graph(nx.complete_graph(n), RicartAgrawalaComponentModel, GenericChannel)
+    inside = []
+    overlaps = []
+    entered = []
+    stalled = []
+
+    def callback(node):
+        overlaps.append(len(inside))
+        inside.append(node)
+        entered.append(node.componentinstancenumber)
+
+        left = threading.Event()
+
+        def leave():
+            inside.remove(node)
+            node.exit_critical_section()
+            left.set()
+        threading.Timer(hold, leave).start()
+        if not left.wait(timeout=2):
+            stalled.append(node.componentinstancenumber)
+
+    for node in topology.nodes.values():
+        node.set_callback(lambda node=node: callback(node))
+    topology.start()
+    time.sleep(0.5)
+    for node in topology.nodes.values():
+        node.enter_critical_section()
+    deadline = time.time() + 10
+    while len(entered) < n and time.time() < deadline:
+        time.sleep(0.05)
+    time.sleep(2 * hold)
+    topology.exit()
+    assert sorted(entered) == list(range(n)) and not any(overlaps), f"{entered} {overlaps}"
+    assert not stalled, f"members {stalled} could not exit while their callback ran"
+    print(f"RicartAgrawalaComponentModel: {n} threaded members entered one at a time")
+
+
+def main():
+    check_exclusion()
+    check_threaded()
+
+    sizes = [int(size) for size in sys.argv[1:]] or [5, 20, 50]
+    print()
+    print(f"times in hop delays, every member enters 5 times and holds the critical section for {HOLD:.0f}")
+    print(f"{'':>25} | {'asks at once':>26} | {'asks about every 10n':>26}")
+    print(f"{'algorithm':>18} {'size':>6} | {'latency':>8} {'sections':>8} {'messages':>8} | {'latency':>8} {'sections':>8} {'messages':>8}")
+    for algorithm, node_type in ALGORITHMS.items():
+        for n in sizes:
+            columns = []
+            for think in (0.0, 10.0 * n):
+                entries, messages = run(node_type, n, 5, think)
+                latency = sum(entered - requested for _, requested, entered in entries) / len(entries)
+                # critical sections per 100 hop delays from the first entry to the last exit
+                throughput = 100 * len(entries) / (entries[-1][2] + HOLD - entries[0][2])
+                columns.append(f"{latency:>8.1f} {throughput:>8.1f} {messages / len(entries):>8.1f}")
+            print(f"{algorithm:>18} {n:>6} | " + " | ".join(columns))
+
+
+if __name__ == "__main__":
+    main()
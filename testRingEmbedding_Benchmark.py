@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testRingEmbedding_Benchmark.py
+
+import networkx as nx
+
+from ringelec.ChangRoberts import ChangRobertsNode
+from ringelec.Election import threaded_election
+from ringelec.HirschbergSinclair import HirschbergSinclairNode
+from ringelec.IdAssignment import IdAssigner, IdLayout
+from ringelec.RingElectionNode import ElectionContext
+from ringelec.RingEmbedding import RingEmbedding, embed_ring
+
+
+def graphs():
+    """Meshes the ring is embedded into, with the nodes numbered 0..N-1"""
+    yield "grid 8x8", nx.convert_node_labels_to_integers(nx.grid_2d_graph(8, 8))
+    geometric = nx.random_geometric_graph(80, 0.2, seed=532)
+    largest = max(nx.connected_components(geometric), key=len)
+    yield "geometric", nx.convert_node_labels_to_integers(geometric.subgraph(largest))
+    yield "scale-free", nx.barabasi_albert_graph(64, 2, seed=532)
+    yield "complete 10", nx.complete_graph(10)
+
+
+def run(node_type, graph, embedded):
+    n = graph.number_of_nodes()
+    context = ElectionContext(node_type, ring_size=n, id_assigner=IdAssigner(n, IdLayout.random, seed=532))
+    _, result = threaded_election(context, graph, prepare=embed_ring if embedded else None)
+    return result
+
+
+def main():
+    print(f"{'graph':>12} {'N':>3} | {'ring hops':>9} {'preorder':>8} {'2-opt':>5} | {'algorithm':>22} {'physical hops':>21} {'time':>15}")
+    for name, graph in graphs():
+        n = graph.number_of_nodes()
+        numbered = RingEmbedding(graph, order=range(n))
+        preorder = RingEmbedding(graph, improve=False)
+        improved = RingEmbedding(graph)
+        assert improved.total_hops <= preorder.total_hops
+        for node_type in (ChangRobertsNode, HirschbergSinclairNode):
+            plain = run(node_type, graph, embedded=False)
+            embedded = run(node_type, graph, embedded=True)
+            # the relays are invisible to the election, the largest id wins either way
+            assert plain.leader_id == embedded.leader_id == n
+            print(f"{name:>12} {n:>3} | {numbered.total_hops:>9} {preorder.total_hops:>8} {improved.total_hops:>5} | "
+                  f"{node_type.__name__:>22} {plain.physical_hops:>10} -> {embedded.physical_hops:>7} "
+                  f"{plain.duration:>6.2f}s -> {embedded.duration:>5.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testRingRenderer_Benchmark.py [ring sizes...]
+
+import sys
+import time
+from math import atan2, cos, radians, sin
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import networkx as nx
+import numpy as np
+from adhoccomputing.Networking.LogicalChannels.GenericChannel import GenericChannel
+
+from ringelec.ChangRoberts import ChangRobertsNode, State
+from ringelec.RingElectionNode import ElectionContext, RingTopology
+from ringelec.RingRenderer import ACTIVE_NODE_COLOUR, EDGE_COLOUR, LEADER_NODE_COLOUR, PASSIVE_NODE_COLOUR, RingRenderer
+
+FRAMES = 20
+
+
+def legacy_frame(fig, topology):
+    """One frame the way the visual scripts used to draw it"""
+    Graph = topology.G
+    pos = nx.circular_layout(Graph, center=(0, 0))
+    node_colours = []
+    for nodeID in topology.nodes:
+        node = topology.nodes[nodeID]
+        Graph.nodes[nodeID]["id_p"] = node.id
+        if node.state == State.active:
+            node_colours.append(ACTIVE_NODE_COLOUR)
+        elif node.state == State.passive:
+            node_colours.append(PASSIVE_NODE_COLOUR)
+        else:
+            node_colours.append(LEADER_NODE_COLOUR)
+
+    node_id_label_pos = {}
+    for key in pos:
+        x, y = pos[key]
+        theta = atan2(y, x) + radians(75)
+        node_id_label_pos[key] = (x + 0.1 * cos(theta), y + 0.1 * sin(theta))
+
+    nx.draw(Graph, pos, node_color=node_colours, edge_color=EDGE_COLOUR, with_labels=False, font_weight="bold")
+    nx.draw_networkx_labels(Graph, node_id_label_pos, nx.get_node_attributes(Graph, "id_p"))
+    fig.text(0.2, 0.2, "Number of messages passed: 0")
+    fig.canvas.draw()
+    fig.canvas.flush_events()
+    fig.clear()
+
+
+def knock_out(topology, rng):
+    """Turns a few random nodes passive between two frames"""
+    for nodeID in rng.choice(len(topology.nodes), max(1, len(topology.nodes) // FRAMES), replace=False):
+        topology.nodes[int(nodeID)].state = State.passive
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [50, 200, 500]
+    print(f"{'ring':>5} | {'full redraw':>11} | {'incremental':>11} | {'speedup':>7}")
+    for n in sizes:
+        topology = RingTopology(election_context=ElectionContext(ChangRobertsNode, ring_size=n))
+        # the ring is drawn, never started
+        topology.construct_from_graph(nx.cycle_graph(n), ChangRobertsNode, GenericChannel)
+
+        rng = np.random.default_rng(532)
+        fig = plt.figure(num=0)
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            knock_out(topology, rng)
+            legacy_frame(fig, topology)
+        legacy = (time.perf_counter() - start) / FRAMES
+        plt.close(fig)
+
+        for node in topology.nodes.values():
+            node.state = State.active
+        renderer = RingRenderer(topology, figure=plt.figure(num=1))
+        # the first frame sets every label and draws the background once
+        renderer.render()
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            knock_out(topology, rng)
+            renderer.render()
+        incremental = (time.perf_counter() - start) / FRAMES
+        plt.close(renderer.figure)
+
+        print(f"{n:>5} | {legacy * 1000:>9.1f}ms | {incremental * 1000:>9.1f}ms | {legacy / incremental:>6.1f}x")
+        topology.exit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testRingStartup_Benchmark.py
+
+import sys
+import time
+
+import networkx as nx
+from adhoccomputing.Experimentation.Topology import Topology
+from adhoccomputing.Networking.LogicalChannels.GenericChannel import GenericChannel
+
+from ringelec.ChangRoberts import ChangRobertsNode
+from ringelec.RingElectionNode import Direction, ElectionContext, RingRoutes, RingTopology
+
+
+def construct(topology_type, n):
+    topology = topology_type()
+    # Topology keeps its nodes in class attributes, start from a clean ring
+    topology.nodes = {}
+    topology.channels = {}
+    topology.election_context = ElectionContext(ChangRobertsNode, ring_size=n)
+    start = time.perf_counter()
+    topology.construct_from_graph(nx.cycle_graph(n), ChangRobertsNode, GenericChannel)
+    return topology, time.perf_counter() - start
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [250, 500, 1000]
+    print(f"{'ring':>6} | {'Topology':>9} | {'RingTopology':>12}")
+    for n in sizes:
+        timings = []
+        for topology_type in (RingTopology, Topology):
+            topology, elapsed = construct(topology_type, n)
+            # every component has started its worker threads, stop them
+            # before timing the next topology
+            topology.exit()
+            time.sleep(1)
+            timings.append(elapsed)
+        ring, legacy = timings
+        print(f"{n:>6} | {legacy:>8.2f}s | {ring:>11.2f}s")
+
+    # the routes of every position in one pass, no per-node get_next_hop calls
+    for n in (10**4, 10**5, 10**6):
+        topology = RingTopology()
+        topology.G = nx.cycle_graph(n)
+        topology.compute_forwarding_table()
+        start = time.perf_counter()
+        routes = RingRoutes(topology, n)
+        elapsed = time.perf_counter() - start
+        assert routes.next_hops[Direction.clockwise][n - 1] == 0
+        assert routes.next_hops[Direction.counterclockwise][0] == n - 1
+        print(f"routes of a ring of {n}: {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
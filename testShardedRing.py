@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testShardedRing.py [ring size] [shard counts...]
+
+import os
+import sys
+import time
+
+import networkx as nx
+
+from ringelec.DiscreteEvent import simulate_election
+from ringelec.ShardedRing import sharded_election
+from ringelec.Sweep import ALGORITHMS, run_context
+
+SEED = 532
+
+
+def check_equivalence(n=60):
+    """Every shard count elects the leader of a single-process run, with the same messages and times"""
+    for algorithm in ALGORITHMS:
+        context = run_context(algorithm, n, "random", SEED)
+        _, reference = simulate_election(context.node_type, nx.cycle_graph(n), election_context=context)
+        for shards in (1, 2, 3, 7):
+            result = sharded_election(algorithm, n, shards, "random", SEED)
+            assert (result.leader, result.leader_id) == (reference.leader, reference.leader_id), f"{algorithm} on {shards} shards"
+            assert result.statistics == reference.statistics, f"{algorithm} on {shards} shards"
+            assert (result.time_to_leader, result.duration) == (reference.time_to_leader, reference.duration), f"{algorithm} on {shards} shards"
+        print(f"{algorithm}: 1, 2, 3 and 7 shards agree with the single-process run")
+
+
+def check_jitter(n=60):
+    """Jittered runs differ between shard counts, but replay identically for the same one"""
+    for algorithm in ("ChangRoberts", "Franklins"):
+        first = sharded_election(algorithm, n, 3, "random", SEED, jitter=0.5)
+        second = sharded_election(algorithm, n, 3, "random", SEED, jitter=0.5)
+        assert first.statistics == second.statistics and first.duration == second.duration
+    print("Jittered sharded runs are reproducible")
+
+
+def main():
+    check_equivalence()
+    check_jitter()
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10**4
+    shard_counts = [int(shards) for shards in sys.argv[2:]] or sorted({1, 2, os.cpu_count()})
+    print(f"ring of {n}, {os.cpu_count()} CPUs")
+    print(f"{'algorithm':>12} | {'shards':>6} | {'messages':>9} | {'wall time':>9}")
+    for algorithm in ("ChangRoberts", "Franklins"):
+        for shards in shard_counts:
+            start = time.perf_counter()
+            result = sharded_election(algorithm, n, shards, "random", SEED)
+            print(f"{algorithm:>12} | {shards:>6} | {result.statistics['total']['messages_sent']:>9} | {time.perf_counter() - start:>8.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testSharedExclusionLock_Benchmark.py [process counts...]
+
+import random
+import sys
+import time
+
+from SharedExclusion.SharedExclusion import SharedExclusionLock
+
+
+class LegacyLock(SharedExclusionLock):
+    """The registration the lock used before: linear scans for a free slot and for the pid of an index"""
+
+    def addProcess(self, pid: int) -> int:
+        retval = 0
+        while retval < self.number_of_processes and (not self.free_processes[retval]):
+            retval += 1
+        if retval < self.number_of_processes:
+            self.process_dictionary[pid] = retval
+            self.free_processes[retval] = False
+            return retval
+        else:
+            return -1
+
+    def removeProcess(self, pid: int) -> int:
+        if pid not in self.process_dictionary.keys():
+            return -1
+        else:
+            index = self.process_dictionary[pid]
+            self.process_dictionary.pop(pid)
+            self.free_processes[index] = True
+            return index
+
+    def getIndex(self, pid: int) -> int:
+        if pid not in self.process_dictionary.keys():
+            return -1
+        else:
+            return self.process_dictionary[pid]
+
+    def getPID(self, index: int) -> int:
+        if self.free_processes[index]:
+            return -1
+        else:
+            for key in self.process_dictionary.keys():
+                if self.process_dictionary[key] == index:
+                    return key
+            return -1
+
+
+def check_registration():
+    lock = SharedExclusionLock(3, 0)
+    assert [lock.addProcess(pid) for pid in (10, 20, 30)] == [0, 1, 2]
+    assert lock.addProcess(40) == -1
+    assert lock.addProcess(20) == 1, "a registered process keeps its index"
+    assert lock.removeProcess(20) == 1 and lock.removeProcess(20) == -1
+    assert lock.getIndex(20) == -1 and lock.getPID(1) == -1
+    assert lock.addProcess(40) == 1
+    assert (lock.getIndex(40), lock.getPID(1)) == (1, 40)
+    assert lock.free_processes == [False, False, False]
+    print("SharedExclusionLock: indices are handed out, kept and reused")
+
+
+def churn(lock, n, operations, seed=532):
+    """
+    Registers n processes, then replaces a random one `operations` times.
+    Every replacement also looks up the new process in both directions.
+
+    Returns
+    --------
+    float
+        Seconds per replacement.
+    """
+    generator = random.Random(seed)
+    registered = list(range(1, n + 1))
+    for pid in registered:
+        lock.addProcess(pid)
+    next_pid = n + 1
+    start = time.perf_counter()
+    for _ in range(operations):
+        slot = generator.randrange(n)
+        lock.removeProcess(registered[slot])
+        index = lock.addProcess(next_pid)
+        assert lock.getPID(index) == next_pid and lock.getIndex(next_pid) == index
+        registered[slot] = next_pid
+        next_pid += 1
+    return (time.perf_counter() - start) / operations
+
+
+def main():
+    check_registration()
+
+    sizes = [int(size) for size in sys.argv[1:]] or [100, 1000, 10000]
+    print(f"{'processes':>9} | {'old lock':>10} | {'new lock':>10} | {'speedup':>7}")
+    for n in sizes:
+        # the old lock's scans are O(n), keep its run short
+        legacy = churn(LegacyLock(n, 0), n, max(100, 10**6 // n))
+        current = churn(SharedExclusionLock(n, 0), n, 10**5)
+        print(f"{n:>9} | {legacy * 1e6:>8.1f}us | {current * 1e6:>8.2f}us | {legacy / current:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
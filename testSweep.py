@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testSweep.py
+
+import csv
+import os
+import tempfile
+
+import networkx as nx
+import numpy as np
+
+from ringelec import Sweep
+from ringelec.ChangRobertsSimulator import simulate
+from ringelec.DiscreteEvent import simulate_election
+from ringelec.IdAssignment import IdAssigner, IdLayout
+from ringelec.Sweep import RESULT_FIELDS, run_context
+
+SIZES = (4, 6)
+LAYOUTS = ("random", "descending")
+
+
+def expected_messages(algorithm, ring_size, layout, seed):
+    """messages_sent of a run, from the reference model or a discrete-event run with the same context"""
+    if algorithm == "ChangRoberts":
+        return simulate(np.asarray(IdAssigner(ring_size, IdLayout(layout), seed).ids)).total_messages
+    context = run_context(algorithm, ring_size, layout, seed)
+    _, result = simulate_election(context.node_type, nx.cycle_graph(ring_size), election_context=context)
+    return result.statistics["total"]["messages_sent"]
+
+
+def read_rows(path):
+    with open(path, newline="") as results:
+        reader = csv.DictReader(results)
+        assert tuple(reader.fieldnames) == RESULT_FIELDS
+        return list(reader)
+
+
+def check_sweep(directory):
+    """Two algorithms over two sizes and two layouts, one layout only for Itai-Rodeh"""
+    output = os.path.join(directory, "results.csv")
+    legacy = os.path.join(directory, "legacy")
+    Sweep.main(["--algorithms", "ChangRoberts", "ItaiRodeh", "--sizes", *map(str, SIZES), "--layouts", *LAYOUTS,
+                "--seeds", "0", "--processes", "2", "--legacy", legacy, "--output", output])
+    rows = read_rows(output)
+
+    runs = [(row["algorithm"], int(row["ring_size"]), row["layout"], int(row["seed"])) for row in rows]
+    expected = [("ChangRoberts", size, layout, 0) for size in SIZES for layout in LAYOUTS]
+    expected += [("ItaiRodeh", size, LAYOUTS[0], 0) for size in SIZES]
+    assert runs == expected, runs
+    for run, row in zip(runs, rows):
+        assert int(row["messages_sent"]) == expected_messages(*run), f"{run}: {row['messages_sent']}"
+
+    # more than one layout, so the names carry the layout and seed
+    for algorithm, size, layout, seed in runs:
+        prefix = "croutput" if algorithm == "ChangRoberts" else "itairodehoutput"
+        with open(os.path.join(legacy, f"{prefix}{size}-{layout}-{seed}")) as transitions:
+            lines = transitions.read().splitlines()
+        assert lines[0] == f"Creating a ring with size {size}"
+        assert lines[-1].endswith("I'M THE ELECTED LEADER"), lines[-1]
+    print(f"Sweep: {len(rows)} rows, messages_sent agrees with the reference runs")
+
+
+def check_legacy_names(directory):
+    """A sweep with one layout and seed writes files named like the old outputs"""
+    legacy = os.path.join(directory, "single")
+    Sweep.main(["--algorithms", "ChangRoberts", "--sizes", "4", "--layouts", "ascending",
+                "--legacy", legacy, "--output", os.path.join(directory, "single.csv")])
+    with open(os.path.join(legacy, "croutput4")) as transitions:
+        lines = transitions.read().splitlines()
+    # every node selects its id, the largest one is dismissed by nobody and wins
+    assert lines[0] == "Creating a ring with size 4"
+    assert sum(line.endswith("as their ID.") for line in lines) == 4
+    assert lines[-1] == "🤖 3: I'M THE ELECTED LEADER", lines[-1]
+    print("Sweep: legacy files of a single layout and seed are named like croutput4")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        check_sweep(directory)
+        check_legacy_names(directory)
+
+
+if __name__ == "__main__":
+    main()
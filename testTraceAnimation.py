@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+# the project root must be in PYTHONPATH for imports
+# $ export PYTHONPATH=$(pwd); python testTraceAnimation.py [output directory]
+
+import os
+import sys
+import tempfile
+import time
+
+from AnonymousNetworks.ItaiRodeh import ItaiRodehNode
+from ringelec.ChangRoberts import ChangRobertsNode
+from ringelec.Election import threaded_election
+from ringelec.ElectionTrace import TraceReader, TraceRecorder
+from ringelec.Franklins import FranklinsNode
+from ringelec.IdAssignment import IdAssigner, IdLayout
+from ringelec.RingElectionNode import ElectionContext
+from ringelec.TraceAnimation import ReplayState, TraceReplay, export_animation
+
+RING_SIZE = 16
+
+
+def run_traced(node_type, path):
+    """Runs an election at full speed, nothing is drawn while it runs, and saves its trace"""
+    recorder = TraceRecorder()
+    if node_type is ItaiRodehNode:
+        context = ElectionContext(node_type, ring_size=RING_SIZE, seed=532, trace_recorder=recorder)
+    else:
+        context = ElectionContext(node_type, ring_size=RING_SIZE, id_assigner=IdAssigner(RING_SIZE, IdLayout.random, seed=532), trace_recorder=recorder)
+    _, result = threaded_election(context, timeout=60)
+    recorder.flush(path)
+    return result
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else tempfile.mkdtemp()
+    os.makedirs(directory, exist_ok=True)
+
+    for node_type in (ChangRobertsNode, FranklinsNode, ItaiRodehNode):
+        name = node_type.__name__
+        trace_path = os.path.join(directory, f"{name}.npy")
+        result = run_traced(node_type, trace_path)
+
+        # the last frame shows the elected leader and every other node passive
+        replay = TraceReplay(TraceReader.load(trace_path).records)
+        replay.advance(replay.end)
+        states = [node.state for node in replay.nodes.values()]
+        assert replay.nodes[result.leader].state == ReplayState.leader, name
+        assert states.count(ReplayState.leader) == 1 and states.count(ReplayState.active) == 0, name
+
+        start = time.perf_counter()
+        export_animation(trace_path, os.path.join(directory, f"{name}.gif"), frames=40, fps=8)
+        print(f"{name}: {len(replay.records)} records over {(replay.end - replay.start) * 1000:.1f}ms, "
+              f"leader {result.leader}, GIF rendered in {time.perf_counter() - start:.1f}s")
+
+    frames = os.path.join(directory, "ChangRobertsNode-frames")
+    export_animation(os.path.join(directory, "ChangRobertsNode.npy"), frames, frames=10)
+    assert len(os.listdir(frames)) == 10
+    print(f"Animations and PNG frames in {directory}")
+
+
+if __name__ == "__main__":
+    main()
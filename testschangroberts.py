@@ -1,34 +1,57 @@
-import time
-
-from adhoccomputing.Generics import *
-from adhoccomputing.Experimentation.Topology import Topology
-from adhoccomputing.Networking.LogicalChannels.GenericChannel import GenericChannel
-
-import networkx as nx
-
-from ringelec.ChangRoberts import ChangRobertsNode
-
-def main():
-    # setAHCLogLevel(DEBUG)
-    topo = Topology()
-    graph = nx.Graph()
-    graph.add_nodes_from(list(range(0, 10)))
-
-    for first_val in range(0, 10):
-        for second_val in range(first_val + 1, 10):
-            graph.add_edge(first_val, second_val)
-
-    topo.construct_from_graph(graph, ChangRobertsNode, GenericChannel)
-
-    # for i in topo.nodes:
-    #     topo.nodes[i].set_leader(0)
-    #     topo.nodes[i].set_callback(callback)
-
-    event = Event(ChangRobertsNode, EventTypes.MFRT, "A to lower layer")
-    topo.nodes[0].on_init(event)
-
-    topo.start()
-    time.sleep(1)
-
-if __name__ == "__main__":
+import sys
+
+from adhoccomputing.Generics import *
+from adhoccomputing.Experimentation.Topology import Topology
+from adhoccomputing.Networking.LogicalChannels.GenericChannel import GenericChannel
+
+import networkx as nx
+
+from ringelec.ChangRoberts import ChangRobertsNode
+from ringelec.Election import Election
+from ringelec.ElectionTrace import TraceReader, TraceRecorder
+from ringelec.RingEmbedding import embed_ring
+
+def main():
+    # setAHCLogLevel(DEBUG)
+    topo = Topology()
+    graph = nx.Graph()
+    graph.add_nodes_from(list(range(0, 10)))
+
+    for first_val in range(0, 10):
+        for second_val in range(first_val + 1, 10):
+            graph.add_edge(first_val, second_val)
+
+    # no visualizer is attached, the election runs headless and ends as soon
+    # as the leader is elected and the ring is quiet
+    ChangRobertsNode.ring_size = 10
+    recorder = TraceRecorder()
+    ChangRobertsNode.trace_recorder = recorder
+    election = Election(ChangRobertsNode)
+    topo.construct_from_graph(graph, ChangRobertsNode, GenericChannel)
+    # successors follow a short cycle of the graph, not the instance numbers
+    embedding = embed_ring(topo)
+    print(embedding)
+
+    # for i in topo.nodes:
+    #     topo.nodes[i].set_leader(0)
+    #     topo.nodes[i].set_callback(callback)
+
+    result = election.start(topo).result(timeout=60)
+    print(result)
+    print(f"Physical hops: {result.physical_hops}")
+
+    # the transitions are traced instead of printed, replay them in the old format
+    reader = TraceReader(recorder.records())
+    for line in reader.legacy_text():
+        print(line)
+    if len(sys.argv) > 1:
+        recorder.flush(sys.argv[1])
+        print(f"Trace: {len(recorder)} records saved to {sys.argv[1]}, {TraceReader.load(sys.argv[1]).statistics()['events']}")
+
+    statistics = result.statistics
+    print(f"Messages: {statistics['total']}")
+    for nodeID, node_statistics in statistics["nodes"].items():
+        print(f"Node {nodeID}: {node_statistics}")
+
+if __name__ == "__main__":
     exit(main())
\ No newline at end of file